@@ -14,7 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import cStringIO as StringIO
+import hashlib
 import random
 
 from tempest.api.image import base
@@ -52,8 +52,7 @@ class BasicOperationsImagesTest(base.BaseV2ImageTest):
         self.assertEqual('queued', body['status'])
 
         # Now try uploading an image file
-        file_content = data_utils.random_bytes()
-        image_file = StringIO.StringIO(file_content)
+        image_file = data_utils.RandomPayload(1024)
         self.client.store_image(image_id, image_file)
 
         # Now try to get image details
@@ -66,7 +65,7 @@ class BasicOperationsImagesTest(base.BaseV2ImageTest):
 
         # Now try get image file
         _, body = self.client.get_image_file(image_id)
-        self.assertEqual(file_content, body)
+        self.assertEqual(image_file.checksum, hashlib.md5(body).hexdigest())
 
     @test.attr(type='gate')
     def test_delete_image(self):
@@ -104,7 +103,7 @@ class BasicOperationsImagesTest(base.BaseV2ImageTest):
         image_id = body['id']
 
         # Now try uploading an image file
-        image_file = StringIO.StringIO(data_utils.random_bytes())
+        image_file = data_utils.RandomPayload(1024)
         self.client.store_image(image_id, image_file)
 
         # Update Image
@@ -146,7 +145,7 @@ class ListImagesTest(base.BaseV2ImageTest):
         1024 and 4096
         """
         size = random.randint(1024, 4096)
-        image_file = StringIO.StringIO(data_utils.random_bytes(size))
+        image_file = data_utils.RandomPayload(size)
         name = data_utils.rand_name('image-')
         _, body = cls.create_image(name=name,
                                    container_format=container_format,
@@ -13,7 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import cStringIO as StringIO
 import hashlib
 import random
 import re
@@ -206,11 +205,11 @@ class ObjectTest(base.BaseObjectTest):
     def test_create_object_with_transfer_encoding(self):
         # create object with transfer_encoding
         object_name = data_utils.rand_name(name='TestObject')
-        data = data_utils.arbitrary_string(1024)
+        data = data_utils.RandomPayload(1024)
         status, _, resp_headers = self.object_client.put_object_with_chunk(
             container=self.container_name,
             name=object_name,
-            contents=StringIO.StringIO(data),
+            contents=data,
             chunk_size=512)
         self.assertEqual(status, 201)
         self.assertHeaders(resp_headers, 'Object', 'PUT')
@@ -218,7 +217,7 @@ class ObjectTest(base.BaseObjectTest):
         # check uploaded content
         _, body = self.object_client.get_object(self.container_name,
                                                 object_name)
-        self.assertEqual(data, body)
+        self.assertEqual(data.checksum, hashlib.md5(body).hexdigest())
 
     @test.attr(type='gate')
     def test_create_object_with_x_fresh_metadata(self):
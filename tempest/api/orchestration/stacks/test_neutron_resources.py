@@ -76,7 +76,7 @@ class NeutronResourcesTestJSON(base.BaseOrchestrationTest):
                 server_id = body['physical_resource_id']
                 LOG.debug('Console output for %s', server_id)
                 resp, output = cls.servers_client.get_console_output(
-                    server_id, None)
+                    server_id, CONF.debug.console_tail_lines)
                 LOG.debug(output)
             raise e
 
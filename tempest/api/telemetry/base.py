@@ -99,7 +99,9 @@ class BaseTelemetryTest(tempest.test.BaseTestCase):
         timeout = CONF.compute.build_timeout
         start = timeutils.utcnow()
         while timeutils.delta_seconds(start, timeutils.utcnow()) < timeout:
-            resp, body = self.telemetry_client.list_samples(metric, query)
+            # a single sample is enough to know one was added
+            resp, body = self.telemetry_client.list_samples(metric, query,
+                                                            limit=1)
             self.assertEqual(resp.status, 200)
             if body:
                 return resp, body
@@ -14,9 +14,11 @@
 #    under the License.
 
 import functools
+from multiprocessing import pool
 import os
 import shlex
 import subprocess
+import time
 
 import testtools
 
@@ -33,27 +35,85 @@ LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
 
-def execute(cmd, action, flags='', params='', fail_ok=False,
-            merge_stderr=False):
-    """Executes specified command for the given action."""
+# Output of the cached commands, by command line and stderr merging
+_CACHE = {}
+# Duration of every command run, by client and action
+COMMAND_TIMES = {}
+
+
+def _command(cmd, action, flags='', params=''):
     cmd = ' '.join([os.path.join(CONF.cli.cli_dir, cmd),
                     flags, action, params])
-    LOG.info("running: '%s'" % cmd)
-    cmd = shlex.split(cmd.encode('utf-8'))
-    result = ''
-    result_err = ''
+    return shlex.split(cmd.encode('utf-8'))
+
+
+def _run(cmd, name, merge_stderr=False):
+    """Run a command, return its return code, stdout and stderr."""
+    LOG.info("running: '%s'" % ' '.join(cmd))
+    start = time.time()
     stdout = subprocess.PIPE
     stderr = subprocess.STDOUT if merge_stderr else subprocess.PIPE
     proc = subprocess.Popen(cmd, stdout=stdout, stderr=stderr)
     result, result_err = proc.communicate()
-    if not fail_ok and proc.returncode != 0:
-        raise exceptions.CommandFailed(proc.returncode,
+    duration = time.time() - start
+    COMMAND_TIMES.setdefault(name, []).append(duration)
+    LOG.info("'%s' took %.2fs" % (name, duration))
+    return proc.returncode, result, result_err
+
+
+def execute(cmd, action, flags='', params='', fail_ok=False,
+            merge_stderr=False, cache=False):
+    """Executes specified command for the given action.
+
+    When cache is set, the output of the command is reused if the same
+    command line was already run successfully by this process.
+    """
+    name = '%s %s' % (cmd, action)
+    cmd = _command(cmd, action, flags, params)
+    key = (tuple(cmd), merge_stderr)
+    if cache and key in _CACHE:
+        returncode, result, result_err = _CACHE[key]
+    else:
+        returncode, result, result_err = _run(cmd, name, merge_stderr)
+        # A failure may be transient, it is not replayed
+        if cache and returncode == 0:
+            _CACHE[key] = (returncode, result, result_err)
+    if not fail_ok and returncode != 0:
+        raise exceptions.CommandFailed(returncode,
                                        cmd,
                                        result,
                                        result_err)
     return result
 
 
+def execute_many(calls, concurrency):
+    """Run commands concurrently and cache their output.
+
+    :param calls: list of the (cmd, action, flags, params, merge_stderr)
+        arguments of the commands, as they would be passed to execute
+    :param concurrency: number of commands run at the same time
+    """
+    commands = {}
+    for cmd, action, flags, params, merge_stderr in calls:
+        key = (tuple(_command(cmd, action, flags, params)), merge_stderr)
+        if key not in _CACHE:
+            commands[key] = '%s %s' % (cmd, action)
+    if not commands:
+        return
+
+    def run(key):
+        output = _run(list(key[0]), commands[key], key[1])
+        if output[0] == 0:
+            _CACHE[key] = output
+
+    workers = pool.ThreadPool(max(1, min(concurrency, len(commands))))
+    try:
+        workers.map(run, commands.keys())
+    finally:
+        workers.close()
+        workers.join()
+
+
 def check_client_version(client, version):
     """Checks if the client's version is compatible with the given version
 
@@ -93,6 +153,15 @@ def min_client_version(*args, **kwargs):
 
 
 class ClientTestBase(tempest.test.BaseTestCase):
+    # Whether the commands run by the tests have no side effect, their
+    # output can then be cached when cli.cache_read_only is set.
+    read_only = False
+    # The (method, args, kwargs) of the commands the tests of the class
+    # run, they are run concurrently before the first test of the class
+    # when their output is cached.
+    prefetch = []
+    _prefetched = False
+
     @classmethod
     def setUpClass(cls):
         if not CONF.cli.enabled:
@@ -104,6 +173,41 @@ class ClientTestBase(tempest.test.BaseTestCase):
         self.parser = tempest.cli.output_parser
         super(ClientTestBase, self).__init__(*args, **kwargs)
 
+    def setUp(self):
+        super(ClientTestBase, self).setUp()
+        if self._cache_output() and not type(self)._prefetched:
+            type(self)._prefetched = True
+            self.prefetch_output(self.prefetch)
+
+    def _cache_output(self):
+        return self.read_only and CONF.cli.cache_read_only
+
+    def _execute(self, cmd, action, flags='', params='', fail_ok=False,
+                 merge_stderr=False):
+        return execute(cmd, action, flags, params, fail_ok, merge_stderr,
+                       cache=self._cache_output())
+
+    def prefetch_output(self, calls):
+        """Run commands concurrently, caching their output for the tests.
+
+        :param calls: list of (method, args, kwargs), such as
+            ('nova', ('list',), {})
+        """
+        commands = []
+
+        def collect(cmd, action, flags='', params='', fail_ok=False,
+                    merge_stderr=False):
+            commands.append((cmd, action, flags, params, merge_stderr))
+            return ''
+
+        self._execute = collect
+        try:
+            for method, args, kwargs in calls:
+                getattr(self, method)(*args, **kwargs)
+        finally:
+            del self._execute
+        execute_many(commands, CONF.cli.concurrency)
+
     def nova(self, action, flags='', params='', admin=True, fail_ok=False):
         """Executes nova command for the given action."""
         flags += ' --endpoint-type %s' % CONF.compute.endpoint_type
@@ -113,7 +217,7 @@ class ClientTestBase(tempest.test.BaseTestCase):
     def nova_manage(self, action, flags='', params='', fail_ok=False,
                     merge_stderr=False):
         """Executes nova-manage command for the given action."""
-        return execute(
+        return self._execute(
             'nova-manage', action, flags, params, fail_ok, merge_stderr)
 
     def keystone(self, action, flags='', params='', admin=True, fail_ok=False):
@@ -177,7 +281,8 @@ class ClientTestBase(tempest.test.BaseTestCase):
                   CONF.identity.admin_password,
                   CONF.identity.uri))
         flags = creds + ' ' + flags
-        return execute(cmd, action, flags, params, fail_ok, merge_stderr)
+        return self._execute(cmd, action, flags, params, fail_ok,
+                             merge_stderr)
 
     def assertTableStruct(self, items, field_names):
         """Verify that all items has keys listed in field_names."""
@@ -189,3 +294,9 @@ class ClientTestBase(tempest.test.BaseTestCase):
         self.assertTrue(lines[0].startswith(beginning),
                         msg=('Beginning of first line has invalid content: %s'
                              % lines[:3]))
+
+
+class ReadOnlyClientTestBase(ClientTestBase):
+    """Base class of the tests only running commands without side effect."""
+
+    read_only = True
@@ -15,6 +15,7 @@
 
 """Collection of utilities for parsing CLI clients output."""
 
+import operator
 import re
 
 from tempest import exceptions
@@ -39,9 +40,7 @@ def details_multiple(output_lines, with_label=False):
         if 'Property' not in table_['headers'] \
            or 'Value' not in table_['headers']:
             raise exceptions.InvalidStructure()
-        item = {}
-        for value in table_['values']:
-            item[value[0]] = value[1]
+        item = dict((value[0], value[1]) for value in table_['values'])
         if with_label:
             item['__label'] = table_['label']
         items.append(item)
@@ -58,14 +57,9 @@ def listing(output_lines):
     """Return list of dicts with basic item info parsed from cli output.
     """
 
-    items = []
     table_ = table(output_lines)
-    for row in table_['values']:
-        item = {}
-        for col_idx, col_key in enumerate(table_['headers']):
-            item[col_key] = row[col_idx]
-        items.append(item)
-    return items
+    headers = table_['headers']
+    return [dict(zip(headers, row)) for row in table_['values']]
 
 
 def tables(output_lines):
@@ -76,10 +70,14 @@ def tables(output_lines):
 
     And, if found, label key (separated line preceding the table)
     is added to each tables dict.
+
+    The rows are parsed as the lines are read, the output is only walked
+    once.
     """
     tables_ = []
 
-    table_ = []
+    table_ = None
+    split_row = None
     label = None
 
     start = False
@@ -89,32 +87,39 @@ def tables(output_lines):
         output_lines = output_lines.split('\n')
 
     for line in output_lines:
-        if delimiter_line.match(line):
+        # Checking the first characters is much cheaper than the regexp
+        # and rules out all the rows of a table
+        if line[:2] == '+-' and delimiter_line.match(line):
+            split_row = _row_splitter(line)
             if not start:
                 start = True
+                table_ = {'headers': [], 'values': []}
             elif not header:
                 # we are after head area
                 header = True
             else:
                 # table ends here
                 start = header = None
-                table_.append(line)
-
-                parsed = table(table_)
-                parsed['label'] = label
-                tables_.append(parsed)
+                table_['label'] = label
+                tables_.append(table_)
 
-                table_ = []
+                table_ = None
                 label = None
-                continue
+            continue
         if start:
-            table_.append(line)
+            if '|' not in line:
+                LOG.warn('skipping invalid table line: %s' % line)
+            elif table_['headers']:
+                table_['values'].append(
+                    [cell.strip() for cell in split_row(line)])
+            else:
+                table_['headers'] = [cell.strip() for cell in split_row(line)]
         else:
             if label is None:
                 label = line
             else:
                 LOG.warn('Invalid line between tables: %s' % line)
-    if len(table_) > 0:
+    if table_ is not None:
         LOG.warn('Missing end of table')
 
     return tables_
@@ -126,8 +131,9 @@ def table(output_lines):
     Return dict with list of column names in 'headers' key and
     rows in 'values' key.
     """
-    table_ = {'headers': [], 'values': []}
-    columns = None
+    headers = []
+    values = []
+    split_row = None
 
     if not isinstance(output_lines, list):
         output_lines = output_lines.split('\n')
@@ -137,21 +143,32 @@ def table(output_lines):
         output_lines = output_lines[:-1]
 
     for line in output_lines:
-        if delimiter_line.match(line):
-            columns = _table_columns(line)
+        if line[:2] == '+-' and delimiter_line.match(line):
+            split_row = _row_splitter(line)
             continue
         if '|' not in line:
             LOG.warn('skipping invalid table line: %s' % line)
             continue
-        row = []
-        for col in columns:
-            row.append(line[col[0]:col[1]].strip())
-        if table_['headers']:
-            table_['values'].append(row)
+        row = [cell.strip() for cell in split_row(line)]
+        if headers:
+            values.append(row)
         else:
-            table_['headers'] = row
+            headers = row
+
+    return {'headers': headers, 'values': values}
+
 
-    return table_
+def _row_splitter(delimiter):
+    """Return a function cutting a table row into its columns.
+
+    The columns are sliced at the offsets of the plus (+) characters of
+    the delimiter line, all at once.
+    """
+    columns = [slice(start, end) for start, end in _table_columns(delimiter)]
+    if len(columns) == 1:
+        column = columns[0]
+        return lambda line: (line[column],)
+    return operator.itemgetter(*columns)
 
 
 def _table_columns(first_table_row):
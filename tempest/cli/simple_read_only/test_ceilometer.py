@@ -23,7 +23,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlyCeilometerClientTest(cli.ClientTestBase):
+class SimpleReadOnlyCeilometerClientTest(cli.ReadOnlyClientTestBase):
     """Basic, read-only tests for Ceilometer CLI client.
 
     Checks return values and output of read-only commands.
@@ -24,7 +24,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlyHeatClientTest(tempest.cli.ClientTestBase):
+class SimpleReadOnlyHeatClientTest(tempest.cli.ReadOnlyClientTestBase):
     """Basic, read-only tests for Heat CLI client.
 
     Basic smoke test for the heat CLI commands which do not require
@@ -26,7 +26,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlyKeystoneClientTest(cli.ClientTestBase):
+class SimpleReadOnlyKeystoneClientTest(cli.ReadOnlyClientTestBase):
     """Basic, read-only tests for Keystone CLI client.
 
     Checks return values and output of read-only commands.
@@ -34,6 +34,15 @@ class SimpleReadOnlyKeystoneClientTest(cli.ClientTestBase):
     their own. They only verify the structure of output if present.
     """
 
+    prefetch = [('keystone', ('catalog',), {}),
+                ('keystone', ('endpoint-list',), {}),
+                ('keystone', ('service-list',), {}),
+                ('keystone', ('role-list',), {}),
+                ('keystone', ('tenant-list',), {}),
+                ('keystone', ('user-list',), {}),
+                ('keystone', ('user-role-list',), {}),
+                ('keystone', ('ec2-credentials-list',), {})]
+
     def test_admin_fake_action(self):
         self.assertRaises(exceptions.CommandFailed,
                           self.keystone,
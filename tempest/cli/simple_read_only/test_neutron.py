@@ -26,7 +26,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlyNeutronClientTest(cli.ClientTestBase):
+class SimpleReadOnlyNeutronClientTest(cli.ReadOnlyClientTestBase):
     """Basic, read-only tests for Neutron CLI client.
 
     Checks return values and output of read-only commands.
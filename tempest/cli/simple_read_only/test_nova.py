@@ -26,7 +26,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlyNovaClientTest(cli.ClientTestBase):
+class SimpleReadOnlyNovaClientTest(cli.ReadOnlyClientTestBase):
 
     """
     This is a first pass at a simple read only python-novaclient test. This
@@ -40,6 +40,20 @@ class SimpleReadOnlyNovaClientTest(cli.ClientTestBase):
 
     """
 
+    prefetch = [('nova', ('list',), {}),
+                ('nova', ('list',), {'params': '--all-tenants 1'}),
+                ('nova', ('list',), {'params': '--all-tenants 0'}),
+                ('nova', ('flavor-list',), {}),
+                ('nova', ('image-list',), {}),
+                ('nova', ('availability-zone-list',), {}),
+                ('nova', ('secgroup-list',), {}),
+                ('nova', ('keypair-list',), {}),
+                ('nova', ('service-list',), {}),
+                ('nova', ('host-list',), {}),
+                ('nova', ('hypervisor-list',), {}),
+                ('nova', ('absolute-limits',), {}),
+                ('nova', ('usage-list',), {})]
+
     @classmethod
     def setUpClass(cls):
         if not CONF.service_available.nova:
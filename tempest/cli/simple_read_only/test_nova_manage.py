@@ -23,7 +23,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlyNovaManageTest(cli.ClientTestBase):
+class SimpleReadOnlyNovaManageTest(cli.ReadOnlyClientTestBase):
 
     """
     This is a first pass at a simple read only nova-manage test. This
@@ -25,7 +25,7 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
-class SimpleReadOnlySaharaClientTest(cli.ClientTestBase):
+class SimpleReadOnlySaharaClientTest(cli.ReadOnlyClientTestBase):
     """Basic, read-only tests for Sahara CLI client.
 
     Checks return values and output of read-only commands.
@@ -22,7 +22,7 @@ from tempest import exceptions
 CONF = config.CONF
 
 
-class SimpleReadOnlySwiftClientTest(cli.ClientTestBase):
+class SimpleReadOnlySwiftClientTest(cli.ReadOnlyClientTestBase):
     """Basic, read-only tests for Swift CLI client.
 
     Checks return values and output of read-only commands.
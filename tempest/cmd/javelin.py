@@ -21,8 +21,11 @@ resources in a declarative way.
 
 import argparse
 import logging
+from multiprocessing import pool
 import os
+import Queue
 import sys
+import time
 import unittest
 
 import yaml
@@ -95,14 +98,22 @@ def create_tenants(tenants):
 
     Don't create the tenants if they already exist.
     """
+    existing = _existing_tenants()
+    for tenant in tenants:
+        _create_tenant(tenant, existing)
+
+
+def _existing_tenants():
     admin = keystone_admin()
     _, body = admin.identity.list_tenants()
-    existing = [x['name'] for x in body]
-    for tenant in tenants:
-        if tenant not in existing:
-            admin.identity.create_tenant(tenant)
-        else:
-            LOG.warn("Tenant '%s' already exists in this environment" % tenant)
+    return [x['name'] for x in body]
+
+
+def _create_tenant(tenant, existing):
+    if tenant not in existing:
+        keystone_admin().identity.create_tenant(tenant)
+    else:
+        LOG.warn("Tenant '%s' already exists in this environment" % tenant)
 
 ##############
 #
@@ -148,36 +159,42 @@ def create_users(users):
 
     Don't create the tenants if they already exist.
     """
-    global USERS
     LOG.info("Creating users")
-    admin = keystone_admin()
     for u in users:
-        try:
-            tenant = admin.identity.get_tenant_by_name(u['tenant'])
-        except exceptions.NotFound:
-            LOG.error("Tenant: %s - not found" % u['tenant'])
-            continue
-        try:
-            admin.identity.get_user_by_username(tenant['id'], u['name'])
-            LOG.warn("User '%s' already exists in this environment"
-                     % u['name'])
-        except exceptions.NotFound:
-            admin.identity.create_user(
-                u['name'], u['pass'], tenant['id'],
-                "%s@%s" % (u['name'], tenant['id']),
-                enabled=True)
+        _create_user(u)
+
+
+def _create_user(u):
+    admin = keystone_admin()
+    try:
+        tenant = admin.identity.get_tenant_by_name(u['tenant'])
+    except exceptions.NotFound:
+        LOG.error("Tenant: %s - not found" % u['tenant'])
+        return
+    try:
+        admin.identity.get_user_by_username(tenant['id'], u['name'])
+        LOG.warn("User '%s' already exists in this environment"
+                 % u['name'])
+    except exceptions.NotFound:
+        admin.identity.create_user(
+            u['name'], u['pass'], tenant['id'],
+            "%s@%s" % (u['name'], tenant['id']),
+            enabled=True)
 
 
 def collect_users(users):
-    global USERS
     LOG.info("Collecting users")
-    admin = keystone_admin()
     for u in users:
-        tenant = admin.identity.get_tenant_by_name(u['tenant'])
-        u['tenant_id'] = tenant['id']
-        USERS[u['name']] = u
-        body = admin.identity.get_user_by_username(tenant['id'], u['name'])
-        USERS[u['name']]['id'] = body['id']
+        _collect_user(u)
+
+
+def _collect_user(u):
+    admin = keystone_admin()
+    tenant = admin.identity.get_tenant_by_name(u['tenant'])
+    u['tenant_id'] = tenant['id']
+    USERS[u['name']] = u
+    body = admin.identity.get_user_by_username(tenant['id'], u['name'])
+    USERS[u['name']]['id'] = body['id']
 
 
 class JavelinCheck(unittest.TestCase):
@@ -288,13 +305,17 @@ def create_objects(objects):
         return
     LOG.info("Creating objects")
     for obj in objects:
-        LOG.debug("Object %s" % obj)
-        _assign_swift_role(obj['owner'])
-        client = client_for_user(obj['owner'])
-        client.containers.create_container(obj['container'])
-        client.objects.create_object(
-            obj['container'], obj['name'],
-            _file_contents(obj['file']))
+        _create_object(obj)
+
+
+def _create_object(obj):
+    LOG.debug("Object %s" % obj)
+    _assign_swift_role(obj['owner'])
+    client = client_for_user(obj['owner'])
+    client.containers.create_container(obj['container'])
+    client.objects.create_object(
+        obj['container'], obj['name'],
+        _file_contents(obj['file']))
 
 #######################
 #
@@ -322,33 +343,37 @@ def create_images(images):
         return
     LOG.info("Creating images")
     for image in images:
-        client = client_for_user(image['owner'])
+        _create_image(image)
 
-        # only upload a new image if the name isn't there
-        if _get_image_by_name(client, image['name']):
-            LOG.info("Image '%s' already exists" % image['name'])
-            continue
 
-        # special handling for 3 part image
-        extras = {}
-        if image['format'] == 'ami':
-            name, fname = _resolve_image(image, 'aki')
-            r, aki = client.images.create_image(
-                'javelin_' + name, 'aki', 'aki')
-            client.images.store_image(aki.get('id'), open(fname, 'r'))
-            extras['kernel_id'] = aki.get('id')
+def _create_image(image):
+    client = client_for_user(image['owner'])
+
+    # only upload a new image if the name isn't there
+    if _get_image_by_name(client, image['name']):
+        LOG.info("Image '%s' already exists" % image['name'])
+        return
+
+    # special handling for 3 part image
+    extras = {}
+    if image['format'] == 'ami':
+        name, fname = _resolve_image(image, 'aki')
+        r, aki = client.images.create_image(
+            'javelin_' + name, 'aki', 'aki')
+        client.images.store_image(aki.get('id'), open(fname, 'r'))
+        extras['kernel_id'] = aki.get('id')
 
-            name, fname = _resolve_image(image, 'ari')
-            r, ari = client.images.create_image(
-                'javelin_' + name, 'ari', 'ari')
-            client.images.store_image(ari.get('id'), open(fname, 'r'))
-            extras['ramdisk_id'] = ari.get('id')
+        name, fname = _resolve_image(image, 'ari')
+        r, ari = client.images.create_image(
+            'javelin_' + name, 'ari', 'ari')
+        client.images.store_image(ari.get('id'), open(fname, 'r'))
+        extras['ramdisk_id'] = ari.get('id')
 
-        _, fname = _resolve_image(image, 'file')
-        r, body = client.images.create_image(
-            image['name'], image['format'], image['format'], **extras)
-        image_id = body.get('id')
-        client.images.store_image(image_id, open(fname, 'r'))
+    _, fname = _resolve_image(image, 'file')
+    r, body = client.images.create_image(
+        image['name'], image['format'], image['format'], **extras)
+    image_id = body.get('id')
+    client.images.store_image(image_id, open(fname, 'r'))
 
 
 def destroy_images(images):
@@ -356,13 +381,17 @@ def destroy_images(images):
         return
     LOG.info("Destroying images")
     for image in images:
-        client = client_for_user(image['owner'])
+        _destroy_image(image)
 
-        response = _get_image_by_name(client, image['name'])
-        if not response:
-            LOG.info("Image '%s' does not exists" % image['name'])
-            continue
-        client.images.delete_image(response['id'])
+
+def _destroy_image(image):
+    client = client_for_user(image['owner'])
+
+    response = _get_image_by_name(client, image['name'])
+    if not response:
+        LOG.info("Image '%s' does not exists" % image['name'])
+        return
+    client.images.delete_image(response['id'])
 
 
 #######################
@@ -391,36 +420,95 @@ def create_servers(servers):
     if not servers:
         return
     LOG.info("Creating servers")
-    for server in servers:
-        client = client_for_user(server['owner'])
+    pending = [_create_server(server) for server in servers]
+    wait_for_servers([p for p in pending if p], 'ACTIVE')
 
-        if _get_server_by_name(client, server['name']):
-            LOG.info("Server '%s' already exists" % server['name'])
-            continue
 
-        image_id = _get_image_by_name(client, server['image'])['id']
-        flavor_id = _get_flavor_by_name(client, server['flavor'])['id']
-        resp, body = client.servers.create_server(server['name'], image_id,
-                                                  flavor_id)
-        server_id = body['id']
-        client.servers.wait_for_server_status(server_id, 'ACTIVE')
+def _create_server(server):
+    """Boot a server without waiting for it.
+
+    Return the (owner, id) of the server, None if it already exists.
+    """
+    client = client_for_user(server['owner'])
+
+    if _get_server_by_name(client, server['name']):
+        LOG.info("Server '%s' already exists" % server['name'])
+        return None
+
+    image_id = _get_image_by_name(client, server['image'])['id']
+    flavor_id = _get_flavor_by_name(client, server['flavor'])['id']
+    resp, body = client.servers.create_server(server['name'], image_id,
+                                              flavor_id)
+    return server['owner'], body['id']
 
 
 def destroy_servers(servers):
     if not servers:
         return
     LOG.info("Destroying servers")
-    for server in servers:
-        client = client_for_user(server['owner'])
+    pending = [_destroy_server(server) for server in servers]
+    wait_for_servers([p for p in pending if p], None)
 
-        response = _get_server_by_name(client, server['name'])
-        if not response:
-            LOG.info("Server '%s' does not exist" % server['name'])
-            continue
 
-        client.servers.delete_server(response['id'])
-        client.servers.wait_for_server_termination(response['id'],
-                                                   ignore_error=True)
+def _destroy_server(server):
+    """Delete a server without waiting for it.
+
+    Return the (owner, id) of the server, None if it doesn't exist.
+    """
+    client = client_for_user(server['owner'])
+
+    response = _get_server_by_name(client, server['name'])
+    if not response:
+        LOG.info("Server '%s' does not exist" % server['name'])
+        return None
+
+    client.servers.delete_server(response['id'])
+    return server['owner'], response['id']
+
+
+def wait_for_servers(servers, status):
+    """Wait for several servers at once.
+
+    Every iteration lists the servers of each owner once, instead of
+    getting every server.
+
+    :param servers: list of (owner, server id)
+    :param status: the status to wait for, None to wait for the servers
+        to be deleted
+    """
+    if not servers:
+        return
+    start = time.time()
+    clients = {}
+    pending = list(servers)
+    while True:
+        found = {}
+        for owner in set(owner for owner, _ in pending):
+            if owner not in clients:
+                clients[owner] = client_for_user(owner)
+            _, body = clients[owner].servers.list_servers_with_detail()
+            for server in body['servers']:
+                found[server['id']] = server['status']
+        still_pending = []
+        for owner, server_id in pending:
+            server_status = found.get(server_id)
+            if server_status is None and status is None:
+                continue
+            if server_status == 'ERROR' and status is not None:
+                raise exceptions.BuildErrorException(server_id=server_id)
+            if server_status != status:
+                still_pending.append((owner, server_id))
+        pending = still_pending
+        if not pending:
+            break
+        if time.time() - start >= config.CONF.compute.build_timeout:
+            raise exceptions.TimeoutException(
+                "Servers %s did not reach %s within %s seconds" %
+                (', '.join(server_id for _, server_id in pending),
+                 status or 'deletion', config.CONF.compute.build_timeout))
+        time.sleep(config.CONF.compute.build_interval)
+    LOG.info("Waited %.2fs for %d servers to reach %s" %
+             (time.time() - start, len(servers), status or 'deletion'))
 
 
 #######################
@@ -459,38 +547,165 @@ def attach_volumes(volumes):
 
 #######################
 #
-# MAIN LOGIC
+# TASK GRAPH
 #
 #######################
 
-def create_resources():
-    LOG.info("Creating Resources")
-    # first create keystone level resources, and we need to be admin
-    # for those.
-    create_tenants(RES['tenants'])
-    create_users(RES['users'])
-    collect_users(RES['users'])
-
-    # next create resources in a well known order
-    create_objects(RES['objects'])
-    create_images(RES['images'])
-    create_servers(RES['servers'])
+def run_tasks(tasks, jobs=1):
+    """Run tasks as soon as the tasks they depend on are done.
+
+    :param tasks: list of (node, callable, dependencies) where node is a
+        (kind, name) tuple and dependencies a list of nodes. Dependencies
+        which aren't part of the tasks are ignored.
+    :param jobs: number of tasks run at the same time
+    :return: dict of the value returned by every task by node
+    """
+    nodes = set(node for node, _, _ in tasks)
+    waiting = [(node, func, [d for d in deps if d in nodes])
+               for node, func, deps in tasks]
+    done = {}
+    times = {}
+    errors = []
+    finished = Queue.Queue()
+    workers = pool.ThreadPool(max(jobs, 1))
+
+    def run(node, func):
+        start = time.time()
+        try:
+            result, error = func(), None
+        except Exception as e:
+            LOG.exception("%s '%s' failed" % node)
+            result, error = None, e
+        finished.put((node, result, error, start, time.time()))
+
+    running = 0
+    try:
+        while waiting or running:
+            if not errors:
+                ready = [task for task in waiting
+                         if all(d in done for d in task[2])]
+                for task in ready:
+                    waiting.remove(task)
+                    workers.apply_async(run, task[:2])
+                    running += 1
+            if not running:
+                if errors:
+                    break
+                raise ValueError("Circular dependencies between %s" %
+                                 [task[0] for task in waiting])
+            node, result, error, start, end = finished.get()
+            running -= 1
+            times[node] = (start, end)
+            if error is not None:
+                errors.append(error)
+            else:
+                done[node] = result
+    finally:
+        workers.close()
+        workers.join()
+    log_phase_times(times)
+    if errors:
+        raise errors[0]
+    return done
+
+
+def reverse_tasks(tasks):
+    """Return the tasks with their dependencies reversed."""
+    dependents = dict((node, []) for node, _, _ in tasks)
+    for node, _, deps in tasks:
+        for dep in deps:
+            if dep in dependents:
+                dependents[dep].append(node)
+    return [(node, func, dependents[node])
+            for node, func, _ in reversed(tasks)]
+
+
+def log_phase_times(times):
+    """Log when the tasks of every kind of resource started and ended."""
+    phases = {}
+    for (kind, _), (start, end) in times.iteritems():
+        first, last, count, busy = phases.get(kind, (start, end, 0, 0.0))
+        phases[kind] = (min(first, start), max(last, end), count + 1,
+                        busy + end - start)
+    for kind, (first, last, count, busy) in sorted(phases.items(),
+                                                   key=lambda p: p[1][0]):
+        LOG.info("%s: %d done in %.2fs (%.2fs of requests)" %
+                 (kind, count, last - first, busy))
+
+
+def _task(func, *args):
+    return lambda: func(*args)
+
+
+def _creation_tasks(res, existing_tenants):
+    tasks = []
+    for tenant in res['tenants']:
+        tasks.append((('tenants', tenant),
+                      _task(_create_tenant, tenant, existing_tenants), []))
+    for u in res['users']:
+        def create_user(u=u):
+            _create_user(u)
+            _collect_user(u)
+        tasks.append((('users', u['name']), create_user,
+                      [('tenants', u['tenant'])]))
+    for obj in res.get('objects') or []:
+        tasks.append((('objects', '%s/%s' % (obj['container'], obj['name'])),
+                      _task(_create_object, obj), [('users', obj['owner'])]))
+    for image in res.get('images') or []:
+        tasks.append((('images', image['name']), _task(_create_image, image),
+                      [('users', image['owner'])]))
+    for server in res.get('servers') or []:
+        tasks.append((('servers', server['name']),
+                      _task(_create_server, server),
+                      [('users', server['owner']),
+                       ('images', server['image'])]))
     # TODO(sdague): volumes definition doesn't work yet, bring it
     # back once we're actually executing the code
-    # create_volumes(RES['volumes'])
-    # attach_volumes(RES['volumes'])
+    return tasks
+
+
+def _server_results(results):
+    return [result for (kind, _), result in results.iteritems()
+            if kind == 'servers' and result]
+
+
+#######################
+#
+# MAIN LOGIC
+#
+#######################
 
+def create_resources(jobs=1):
+    """Create the resources, independent ones at the same time.
 
-def destroy_resources():
+    Servers are booted without waiting for them, all of them are then
+    waited for together.
+    """
+    LOG.info("Creating Resources")
+    # keystone level resources need to be created as admin, the tasks
+    # depending on users only start once the user has been collected.
+    tasks = _creation_tasks(RES, _existing_tenants())
+    results = run_tasks(tasks, jobs)
+    wait_for_servers(_server_results(results), 'ACTIVE')
+
+
+def destroy_resources(jobs=1):
     LOG.info("Destroying Resources")
     # Destroy in inverse order of create
 
     # Future
     # detach_volumes
     # destroy_volumes
-
-    destroy_servers(RES['servers'])
-    destroy_images(RES['images'])
+    tasks = []
+    for image in RES.get('images') or []:
+        tasks.append((('images', image['name']), _task(_destroy_image, image),
+                      []))
+    for server in RES.get('servers') or []:
+        tasks.append((('servers', server['name']),
+                      _task(_destroy_server, server),
+                      [('images', server['image'])]))
+    results = run_tasks(reverse_tasks(tasks), jobs)
+    wait_for_servers(_server_results(results), None)
     # destroy_objects
 
     # destroy_users
@@ -521,6 +736,11 @@ def get_options():
         '-c', '--config-file',
         metavar='/etc/tempest.conf',
         help='path to javelin2(tempest) config file')
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=8,
+        help='Number of resources created or destroyed at the same time')
 
     # auth bits, letting us also just source the devstack openrc
     parser.add_argument('--os-username',
@@ -569,7 +789,7 @@ def main():
     RES = load_resources(OPTS.resources)
 
     if OPTS.mode == 'create':
-        create_resources()
+        create_resources(OPTS.jobs)
         # Make sure the resources we just created actually work
         checker = JavelinCheck(USERS, RES)
         checker.check()
@@ -579,7 +799,7 @@ def main():
         checker.check()
     elif OPTS.mode == 'destroy':
         collect_users(RES['users'])
-        destroy_resources()
+        destroy_resources(OPTS.jobs)
     else:
         LOG.error('Unknown mode %s' % OPTS.mode)
         return 1
@@ -16,8 +16,10 @@
 
 import argparse
 import json
+from multiprocessing import pool
 import os
 import sys
+import threading
 import urlparse
 
 import httplib2
@@ -28,8 +30,27 @@ from tempest import config
 
 
 CONF = config.CONF
-RAW_HTTP = httplib2.Http()
 CONF_PARSER = None
+# Services whose extensions are verified, in the order they are reported
+EXTENSION_SERVICES = ['nova', 'nova_v3', 'cinder', 'neutron', 'swift']
+
+
+class RawHttp(threading.local):
+    """Unauthenticated requests, with an httplib2.Http per thread.
+
+    httplib2.Http objects can't be shared between threads, the discovery
+    calls being run concurrently every thread gets its own.
+    """
+
+    timeout = None
+
+    def request(self, *args, **kwargs):
+        if not hasattr(self, 'http'):
+            self.http = httplib2.Http(timeout=RawHttp.timeout)
+        return self.http.request(*args, **kwargs)
+
+
+RAW_HTTP = RawHttp()
 
 
 def _get_config_file():
@@ -57,9 +78,15 @@ def print_and_or_update(option, group, value, update):
         change_option(option, group, value)
 
 
-def verify_glance_api_versions(os, update):
-    # Check glance api versions
+def _get_glance_versions(os):
     __, versions = os.image_client.get_versions()
+    return versions
+
+
+def verify_glance_api_versions(os, update, versions=None):
+    # Check glance api versions
+    if versions is None:
+        versions = _get_glance_versions(os)
     if CONF.image_feature_enabled.api_v1 != ('v1.1' in versions or 'v1.0' in
                                              versions):
         print_and_or_update('api_v1', 'image_feature_enabled',
@@ -93,9 +120,10 @@ def _get_api_versions(os, service):
     return versions
 
 
-def verify_keystone_api_versions(os, update):
+def verify_keystone_api_versions(os, update, versions=None):
     # Check keystone api versions
-    versions = _get_api_versions(os, 'keystone')
+    if versions is None:
+        versions = _get_api_versions(os, 'keystone')
     if CONF.identity_feature_enabled.api_v2 != ('v2.0' in versions):
         print_and_or_update('api_v2', 'identity_feature_enabled',
                             not CONF.identity_feature_enabled.api_v2, update)
@@ -104,16 +132,18 @@ def verify_keystone_api_versions(os, update):
                             not CONF.identity_feature_enabled.api_v3, update)
 
 
-def verify_nova_api_versions(os, update):
-    versions = _get_api_versions(os, 'nova')
+def verify_nova_api_versions(os, update, versions=None):
+    if versions is None:
+        versions = _get_api_versions(os, 'nova')
     if CONF.compute_feature_enabled.api_v3 != ('v3.0' in versions):
         print_and_or_update('api_v3', 'compute_feature_enabled',
                             not CONF.compute_feature_enabled.api_v3, update)
 
 
-def verify_cinder_api_versions(os, update):
+def verify_cinder_api_versions(os, update, versions=None):
     # Check cinder api versions
-    versions = _get_api_versions(os, 'cinder')
+    if versions is None:
+        versions = _get_api_versions(os, 'cinder')
     if CONF.volume_feature_enabled.api_v1 != ('v1.0' in versions):
         print_and_or_update('api_v1', 'volume_feature_enabled',
                             not CONF.volume_feature_enabled.api_v1, update)
@@ -150,7 +180,7 @@ def get_enabled_extensions(service):
     return extensions_options[service]
 
 
-def verify_extensions(os, service, results):
+def _list_extensions(os, service):
     extensions_client = get_extension_client(os, service)
     __, resp = extensions_client.list_extensions()
     if isinstance(resp, dict):
@@ -168,6 +198,12 @@ def verify_extensions(os, service, results):
 
     else:
         extensions = map(lambda x: x['name'], resp)
+    return extensions
+
+
+def verify_extensions(os, service, results, extensions=None):
+    if extensions is None:
+        extensions = _list_extensions(os, service)
     if not results.get(service):
         results[service] = {}
     extensions_opt = get_enabled_extensions(service)
@@ -232,8 +268,28 @@ def display_results(results, update, replace):
                               output_string)
 
 
-def check_service_availability(os, update):
-    services = []
+def _get_catalog_services(os, region=None):
+    """Return the types of the services having an endpoint in the catalog.
+
+    Every service is only looked up once, however many endpoints it has.
+    The lookups share the connection of the service client, so they are
+    made one after the other.
+    """
+    __, endpoints = os.endpoints_client.list_endpoints()
+    service_types = []
+    service_ids = set()
+    for endpoint in endpoints:
+        if region and endpoint.get('region') != region:
+            continue
+        if endpoint['service_id'] not in service_ids:
+            service_ids.add(endpoint['service_id'])
+            __, service = os.service_client.get_service(
+                endpoint['service_id'])
+            service_types.append(service['type'])
+    return service_types
+
+
+def check_service_availability(os, update, services=None):
     avail_services = []
     codename_match = {
         'volume': 'cinder',
@@ -251,10 +307,8 @@ def check_service_availability(os, update):
         'database': 'trove'
     }
     # Get catalog list for endpoints to use for validation
-    __, endpoints = os.endpoints_client.list_endpoints()
-    for endpoint in endpoints:
-        __, service = os.service_client.get_service(endpoint['service_id'])
-        services.append(service['type'])
+    if services is None:
+        services = _get_catalog_services(os)
     # Pull all catalog types from config file and compare against endpoint list
     for cfgname in dir(CONF._config):
         cfg = getattr(CONF, cfgname)
@@ -290,6 +344,96 @@ def check_service_availability(os, update):
     return avail_services
 
 
+def _run_concurrently(calls, jobs):
+    """Run (callable, args) calls in a pool of threads.
+
+    :return: the list of the value returned by every call, or of the
+        exception it raised
+    """
+    def run(call):
+        func, args = call
+        try:
+            return func(*args)
+        except Exception as e:
+            return e
+
+    if jobs <= 1 or len(calls) <= 1:
+        return map(run, calls)
+    workers = pool.ThreadPool(min(jobs, len(calls)))
+    try:
+        return workers.map(run, calls)
+    finally:
+        workers.close()
+        workers.join()
+
+
+def _raise_error(result):
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def configure_clients(os, region=None, timeout=None):
+    """Point all the clients of a manager to a region, and set the timeout
+    of their requests.
+    """
+    for client in vars(os).values():
+        if hasattr(client, 'http_obj') and hasattr(client, 'region'):
+            client.region = region
+            if timeout:
+                client.http_obj.timeout = timeout
+
+
+def discover(os, region=None, jobs=8):
+    """Run every discovery call of a region concurrently.
+
+    :return: dict of the result of every call, exceptions raised by the
+        calls are returned in place of their result
+    """
+    # Authenticate once, before the clients sharing the auth provider are
+    # used from several threads
+    os.auth_provider.get_token()
+    probes = [
+        ('services', _get_catalog_services, (os, region)),
+        ('keystone', _get_api_versions, (os, 'keystone')),
+        ('glance', _get_glance_versions, (os,)),
+        ('nova', _get_api_versions, (os, 'nova')),
+        ('cinder', _get_api_versions, (os, 'cinder')),
+    ]
+    for service in EXTENSION_SERVICES:
+        probes.append(('%s_extensions' % service, _list_extensions,
+                       (os, service)))
+    results = _run_concurrently([(func, args) for _, func, args in probes],
+                                jobs)
+    return dict((name, result)
+                for (name, _, _), result in zip(probes, results))
+
+
+def verify(os, discovered, update, replace):
+    """Report the differences between the config and what was discovered.
+
+    Extensions of services which aren't available are not reported, a
+    failure to discover them is ignored.
+    """
+    services = check_service_availability(
+        os, update, _raise_error(discovered['services']))
+    results = {}
+    for service in EXTENSION_SERVICES:
+        if service == 'nova_v3' and 'nova' not in services:
+            continue
+        elif service not in services:
+            continue
+        results = verify_extensions(
+            os, service, results,
+            _raise_error(discovered['%s_extensions' % service]))
+    verify_keystone_api_versions(os, update,
+                                 _raise_error(discovered['keystone']))
+    verify_glance_api_versions(os, update, _raise_error(discovered['glance']))
+    verify_nova_api_versions(os, update, _raise_error(discovered['nova']))
+    verify_cinder_api_versions(os, update, _raise_error(discovered['cinder']))
+    display_results(results, update, replace)
+
+
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('-u', '--update', action='store_true',
@@ -309,10 +453,30 @@ def parse_args():
     parser.add_argument('-r', '--replace-ext', action='store_true',
                         help="If specified the all option will be replaced "
                              "with a full list of extensions")
+    parser.add_argument('--regions',
+                        help="Comma separated list of regions to verify, "
+                             "they are verified at the same time. Defaults "
+                             "to the region set in the config file")
+    parser.add_argument('-j', '--jobs', type=int, default=8,
+                        help="Number of API calls made at the same time "
+                             "for every region")
+    parser.add_argument('-t', '--timeout', type=float, default=60,
+                        help="Timeout in seconds of every API call")
     args = parser.parse_args()
+    if args.regions:
+        args.regions = [r.strip() for r in args.regions.split(',')
+                        if r.strip()]
+        if args.update and len(args.regions) > 1:
+            parser.error("--update can only be used with a single region")
     return args
 
 
+def _discover_region(region, jobs, timeout):
+    os = clients.ComputeAdminManager(interface='json')
+    configure_clients(os, region, timeout)
+    return os, discover(os, region, jobs)
+
+
 def main():
     print('Running config verification...')
     opts = parse_args()
@@ -328,20 +492,18 @@ def main():
         CONF_PARSER = moves.configparser.SafeConfigParser()
         CONF_PARSER.optionxform = str
         CONF_PARSER.readfp(conf_file)
-    os = clients.ComputeAdminManager(interface='json')
-    services = check_service_availability(os, update)
-    results = {}
-    for service in ['nova', 'nova_v3', 'cinder', 'neutron', 'swift']:
-        if service == 'nova_v3' and 'nova' not in services:
-            continue
-        elif service not in services:
-            continue
-        results = verify_extensions(os, service, results)
-    verify_keystone_api_versions(os, update)
-    verify_glance_api_versions(os, update)
-    verify_nova_api_versions(os, update)
-    verify_cinder_api_versions(os, update)
-    display_results(results, update, replace)
+    RawHttp.timeout = opts.timeout
+    regions = opts.regions or [None]
+    # The regions are discovered at the same time, and then reported one
+    # after the other
+    discovered = _run_concurrently(
+        [(_discover_region, (region, opts.jobs, opts.timeout))
+         for region in regions], len(regions))
+    for region, result in zip(regions, discovered):
+        if region:
+            print('Region %s:' % region)
+        os, results = _raise_error(result)
+        verify(os, results, update, replace)
     if update:
         conf_file.close()
         CONF_PARSER.write(outfile)
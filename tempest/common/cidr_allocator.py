@@ -0,0 +1,111 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import errno
+import hashlib
+import json
+import os
+
+import netaddr
+
+from tempest.openstack.common import lockutils
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno != errno.ESRCH
+    return True
+
+
+class CidrAllocator(object):
+
+    """
+    Allocates subnet cidrs out of the block configured for tenant networks.
+
+    The free blocks are computed locally from the cidrs the tenant already
+    uses, listed once by the caller. The cidrs handed out and not released
+    yet are recorded in a registry file in the lock_path, so that concurrent
+    workers don't pick the same block. Reservations of dead processes are
+    dropped.
+    """
+
+    def __init__(self, cidr, mask_bits, lock_path=None):
+        self.cidr = netaddr.IPNetwork(cidr)
+        self.mask_bits = mask_bits
+        self.lock_path = lock_path
+        self.name = 'cidr_registry_%s' % hashlib.md5(
+            '%s:%d' % (self.cidr, mask_bits)).hexdigest()
+
+    def _read(self, path):
+        try:
+            with open(path) as registry_file:
+                reserved = json.load(registry_file)
+        except (IOError, ValueError):
+            return {}
+        return dict((cidr, pid) for cidr, pid in reserved.iteritems()
+                    if _is_running(pid))
+
+    def _write(self, path, reserved):
+        tmp_path = '%s.%d' % (path, os.getpid())
+        with open(tmp_path, 'w') as registry_file:
+            json.dump(reserved, registry_file)
+        os.rename(tmp_path, path)
+
+    def _update(self, func):
+        """Call func with the reserved cidrs and save what it changed."""
+        if not self.lock_path:
+            return func({})
+        path = os.path.join(self.lock_path, self.name + '.json')
+        with lockutils.lock(self.name, external=True,
+                            lock_path=self.lock_path):
+            reserved = self._read(path)
+            result = func(reserved)
+            self._write(path, reserved)
+        return result
+
+    def free_block(self, used_cidrs):
+        """
+        :param used_cidrs: cidrs which can't be allocated
+        :return: the lowest free block of the tenant network cidr, None if
+            there is none left
+        """
+        free = netaddr.IPSet([self.cidr]) - netaddr.IPSet(used_cidrs)
+        for free_cidr in free.iter_cidrs():
+            if free_cidr.prefixlen <= self.mask_bits:
+                return netaddr.IPNetwork('%s/%d' % (free_cidr.network,
+                                                    self.mask_bits))
+        return None
+
+    def allocate(self, used_cidrs):
+        """
+        Reserve a free block.
+
+        :param used_cidrs: cidrs of the subnets of the tenant
+        :return: the reserved cidr as a string, None if there is none left
+        """
+        def reserve(reserved):
+            block = self.free_block(list(used_cidrs) + reserved.keys())
+            if block is None:
+                return None
+            reserved[str(block)] = os.getpid()
+            return str(block)
+
+        return self._update(reserve)
+
+    def release(self, cidr):
+        """Drop the reservation of a cidr returned by allocate."""
+        self._update(lambda reserved: reserved.pop(cidr, None))
@@ -37,6 +37,30 @@ def sudo_cmd_call(cmd):
     return stdout
 
 
+def sudo_script_call(script, timeout=None):
+    """Run a shell script with sudo, yield its output lines as they come.
+
+    The script is killed once it has run for timeout seconds. Closing the
+    generator before the end of the output stops the script too.
+    """
+    cmd = ['/usr/bin/sudo', '-n']
+    if timeout:
+        cmd += ['timeout', '-s', 'KILL', str(timeout)]
+    proc = subprocess.Popen(cmd + ['sh', '-c', script],
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT)
+    try:
+        for line in iter(proc.stdout.readline, ''):
+            yield line
+    finally:
+        # The script gets a SIGPIPE on its next write if it isn't over
+        proc.stdout.close()
+        proc.wait()
+    if proc.returncode != 0:
+        LOG.error("Script {0} returned with exit status {1}".format(
+            script, proc.returncode))
+
+
 def ip_addr_raw():
     return sudo_cmd_call("ip a")
 
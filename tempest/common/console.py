@@ -0,0 +1,98 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from multiprocessing import pool
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class ConsoleLog(object):
+    """The console output of a server, read a few lines at a time.
+
+    The compute API can only return the last lines of a console output. Every
+    read asks for a tail just long enough to hold the last lines read before,
+    doubling its length until they are found, and returns the lines which
+    follow them. The last line is only returned once it is complete.
+
+    :param get_output: function returning the given number of lines at the
+        end of the console output
+    :param tail_lines: number of lines of the first read
+    :param max_lines: number of lines a read fetches at most
+    """
+
+    # Number of lines by which the last lines read are found again
+    ANCHOR_LINES = 10
+
+    def __init__(self, get_output, tail_lines=100, max_lines=1000):
+        self.get_output = get_output
+        self.tail_lines = tail_lines
+        self.max_lines = max(max_lines, tail_lines)
+        self._anchor = []
+
+    def _find_anchor(self, lines):
+        size = len(self._anchor)
+        for start in range(len(lines) - size, -1, -1):
+            if lines[start:start + size] == self._anchor:
+                return start + size
+        return None
+
+    def read(self):
+        """Return the complete lines added since the last read."""
+        length = self.tail_lines
+        while True:
+            lines = (self.get_output(length) or '').split('\n')
+            # The output holds everything when it has less lines than asked
+            complete = len(lines) < length
+            # The last line is either empty or not finished yet
+            lines.pop()
+            if not self._anchor:
+                start = 0
+                break
+            start = self._find_anchor(lines)
+            if start is not None:
+                break
+            if complete or length >= self.max_lines:
+                LOG.debug("The console output read before is gone, it was "
+                          "truncated or more than %d lines were added",
+                          length)
+                start = 0
+                break
+            length = min(length * 2, self.max_lines)
+        if lines:
+            self._anchor = lines[-self.ANCHOR_LINES:]
+        return lines[start:]
+
+
+def read_many(console_logs, concurrency=10):
+    """Read ConsoleLogs concurrently.
+
+    :return: the new lines of every log, or the exception its read raised
+    """
+    def read(console_log):
+        try:
+            return console_log.read()
+        except Exception as exc:
+            return exc
+
+    if not console_logs:
+        return []
+    workers = pool.ThreadPool(min(concurrency, len(console_logs)))
+    try:
+        return workers.map(read, console_logs)
+    finally:
+        workers.close()
+        workers.join()
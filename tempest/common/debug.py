@@ -22,21 +22,64 @@ LOG = logging.getLogger(__name__)
 TABLES = ['filter', 'nat', 'mangle']
 
 
+# Printed before the output of every command of the dump script
+SECTION_MARKER = '==== tempest debug: '
+
+IP_NS_SCRIPT = """
+echo "{marker}Host Addr"; ip a
+echo "{marker}Host Route"; ip r
+for t in {tables}; do
+    echo "{marker}Host $t table"; iptables --line-numbers -L -nv -t $t
+done
+echo "{marker}Host ns list"; ip netns list
+for ns in $(ip netns list | awk '{{print $1}}'); do
+    ip netns exec "$ns" sh -c '
+        echo "{marker}ns($0) Addr"; ip a
+        echo "{marker}ns($0) Route"; ip r
+        for t in {tables}; do
+            echo "{marker}ns($0) table($t)"; iptables -v -S -t $t
+        done' "$ns"
+done
+"""
+
+
+def _log_section(title, lines):
+    if title is not None or lines:
+        LOG.info("%s:\n%s", title, ''.join(lines))
+
+
 def log_ip_ns():
+    """Log the addresses, routes and iptables of the host and namespaces.
+
+    Everything is collected by a single script run with sudo, each command
+    output being logged as soon as it is complete. The dump is cut after
+    debug.dump_timeout seconds or debug.dump_max_size bytes.
+    """
     if not CONF.debug.enable:
         return
-    LOG.info("Host Addr:\n" + commands.ip_addr_raw())
-    LOG.info("Host Route:\n" + commands.ip_route_raw())
-    for table in TABLES:
-        LOG.info('Host %s table:\n%s', table, commands.iptables_raw(table))
-    ns_list = commands.ip_ns_list()
-    LOG.info("Host ns list" + str(ns_list))
-    for ns in ns_list:
-        LOG.info("ns(%s) Addr:\n%s", ns, commands.ip_ns_addr(ns))
-        LOG.info("ns(%s) Route:\n%s", ns, commands.ip_ns_route(ns))
-        for table in TABLES:
-            LOG.info('ns(%s) table(%s):\n%s', ns, table,
-                     commands.iptables_ns(ns, table))
+    script = IP_NS_SCRIPT.format(marker=SECTION_MARKER,
+                                 tables=' '.join(TABLES))
+    max_size = CONF.debug.dump_max_size
+    title = None
+    lines = []
+    size = 0
+    output = commands.sudo_script_call(script, CONF.debug.dump_timeout)
+    try:
+        for line in output:
+            if line.startswith(SECTION_MARKER):
+                _log_section(title, lines)
+                title = line[len(SECTION_MARKER):].rstrip('\n')
+                lines = []
+                continue
+            size += len(line)
+            if max_size and size > max_size:
+                LOG.warning("Network debug dump truncated after %d bytes",
+                            max_size)
+                break
+            lines.append(line)
+    finally:
+        output.close()
+    _log_section(title, lines)
 
 
 def log_ovs_db():
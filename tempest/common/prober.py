@@ -0,0 +1,241 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Check the reachability of many addresses at once, in process.
+
+TCP probes are non-blocking connects. ICMP echo requests are sent through an
+unprivileged ICMP datagram socket, or a raw socket when running as root, all
+the addresses sharing the socket. When neither is permitted, or for the
+addresses which are not IPv4, a ping process is run for every attempt.
+"""
+
+import errno
+import os
+import select
+import socket
+import struct
+import subprocess
+import time
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += '\0'
+    total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _echo_request(ident, seq):
+    payload = struct.pack('!d', time.time())
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, ident,
+                       seq) + payload
+
+
+def _icmp_socket():
+    """Return an ICMP socket and whether it receives the IP headers.
+
+    (None, False) is returned if ICMP sockets are not permitted.
+    """
+    for sock_type, ip_header in ((socket.SOCK_DGRAM, False),
+                                 (socket.SOCK_RAW, True)):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type,
+                                 socket.IPPROTO_ICMP)
+        except socket.error:
+            continue
+        sock.setblocking(False)
+        return sock, ip_header
+    return None, False
+
+
+def _is_ipv4(address):
+    try:
+        socket.inet_aton(address)
+    except socket.error:
+        return False
+    return address.count('.') == 3
+
+
+class Prober(object):
+    """Probe addresses until each of them has the wanted reachability.
+
+    Every address is probed every interval seconds, an attempt failing
+    after attempt_timeout seconds, until an attempt has the wanted outcome.
+
+    :param port: TCP port to connect to, None to send ICMP echo requests
+    :param should_succeed: False to wait for the attempts to fail instead
+    """
+
+    def __init__(self, addresses, port=None, interval=1, attempt_timeout=1,
+                 should_succeed=True):
+        self.port = port
+        self.interval = interval
+        self.attempt_timeout = attempt_timeout
+        self.should_succeed = should_succeed
+        # address -> seconds until the wanted outcome, None until then
+        self.results = dict((address, None) for address in addresses)
+        self._pending = set(addresses)
+        self._next_attempt = dict((address, 0) for address in addresses)
+        # address -> (started_at, deadline, socket or process or None)
+        self._attempts = {}
+        self._icmp, self._icmp_ip_header = None, False
+        self._ident = os.getpid() & 0xffff
+        self._seq = 0
+        self._start_time = None
+
+    def _start_attempt(self, address, now):
+        deadline = now + self.attempt_timeout
+        if self.port is not None:
+            family = socket.AF_INET if _is_ipv4(address) else socket.AF_INET6
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            self._attempts[address] = (now, deadline, sock)
+            err = sock.connect_ex((address, self.port))
+            if err not in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                self._end_attempt(address, err == 0, now)
+        elif self._icmp is not None and _is_ipv4(address):
+            self._seq = (self._seq + 1) & 0xffff
+            self._attempts[address] = (now, deadline, None)
+            try:
+                self._icmp.sendto(_echo_request(self._ident, self._seq),
+                                  (address, 0))
+            except socket.error as exc:
+                LOG.debug("Failed to ping %s: %s", address, exc)
+                self._end_attempt(address, False, now)
+        else:
+            with open(os.devnull, 'w') as devnull:
+                proc = subprocess.Popen(
+                    ['ping', '-c1', '-w%d' % max(1, self.attempt_timeout),
+                     address], stdout=devnull, stderr=devnull)
+            # ping stops by itself, only kill it if it hangs
+            self._attempts[address] = (now, deadline + 5, proc)
+
+    def _end_attempt(self, address, success, now):
+        started_at, deadline, handle = self._attempts.pop(address)
+        if isinstance(handle, socket.socket):
+            handle.close()
+        elif handle is not None and handle.poll() is None:
+            handle.kill()
+            handle.wait()
+        if success == self.should_succeed:
+            self.results[address] = now - self._start_time
+            self._pending.discard(address)
+        else:
+            self._next_attempt[address] = started_at + self.interval
+
+    def _read_icmp(self, now):
+        while True:
+            try:
+                data, (source, _) = self._icmp.recvfrom(1024)
+            except socket.error as exc:
+                if exc.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return
+                raise
+            if self._icmp_ip_header:
+                data = data[(ord(data[0]) & 0x0f) * 4:]
+            if len(data) < 8:
+                continue
+            icmp_type, _, _, ident, _ = struct.unpack('!BBHHH', data[:8])
+            # The raw socket gets all the ICMP packets, the datagram socket
+            # only the replies to its requests, with an ident of its own
+            if icmp_type != ICMP_ECHO_REPLY or (self._icmp_ip_header and
+                                                ident != self._ident):
+                continue
+            attempt = self._attempts.get(source)
+            if attempt is not None and attempt[2] is None:
+                self._end_attempt(source, True, now)
+
+    def _poll(self, timeout):
+        sockets = [handle for _, _, handle in self._attempts.values()
+                   if isinstance(handle, socket.socket)]
+        icmp = [self._icmp] if self._icmp is not None else []
+        if any(handle is not None and not isinstance(handle, socket.socket)
+               for _, _, handle in self._attempts.values()):
+            # The ping processes are polled
+            timeout = min(timeout, 0.05)
+        if not sockets and not icmp:
+            time.sleep(timeout)
+            return
+        readable, writable, _ = select.select(icmp, sockets, [], timeout)
+        now = time.time()
+        if readable:
+            self._read_icmp(now)
+        for address, (_, _, handle) in self._attempts.items():
+            if handle in writable:
+                err = handle.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                self._end_attempt(address, err == 0, now)
+
+    def run(self, timeout):
+        """Probe for at most timeout seconds.
+
+        :return: dict mapping every address to the seconds it took to get
+            the wanted outcome, or None if it didn't in time
+        """
+        self._start_time = time.time()
+        end = self._start_time + timeout
+        if self.port is None and any(_is_ipv4(address)
+                                     for address in self._pending):
+            self._icmp, self._icmp_ip_header = _icmp_socket()
+            if self._icmp is None:
+                LOG.debug("ICMP sockets not permitted, running ping")
+        try:
+            while self._pending:
+                now = time.time()
+                for address, (_, deadline, handle) in self._attempts.items():
+                    if now >= deadline:
+                        self._end_attempt(address, False, now)
+                    elif (handle is not None and
+                            not isinstance(handle, socket.socket) and
+                            handle.poll() is not None):
+                        self._end_attempt(address, handle.returncode == 0,
+                                          now)
+                if not self._pending or now >= end:
+                    break
+                for address in list(self._pending):
+                    if (address not in self._attempts and
+                            now >= self._next_attempt[address]):
+                        self._start_attempt(address, now)
+                events = [end]
+                events.extend(deadline for _, deadline, _ in
+                              self._attempts.values())
+                events.extend(self._next_attempt[address]
+                              for address in self._pending
+                              if address not in self._attempts)
+                self._poll(max(0, min(events) - time.time()))
+        finally:
+            for address in self._attempts.keys():
+                self._end_attempt(address, not self.should_succeed,
+                                  time.time())
+            if self._icmp is not None:
+                self._icmp.close()
+        return self.results
+
+
+def probe(addresses, port=None, timeout=60, interval=1, should_succeed=True):
+    """Probe many addresses concurrently, see Prober."""
+    return Prober(addresses, port, interval,
+                  should_succeed=should_succeed).run(timeout)
@@ -0,0 +1,159 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+import os
+import threading
+import time
+
+from tempest import config
+from tempest.openstack.common import lockutils
+from tempest.openstack.common import log as logging
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+# Seconds spent waiting for the rate limits, by (service, method), since
+# the counters were last popped
+_throttled = collections.defaultdict(float)
+_throttled_lock = threading.Lock()
+
+
+def add_throttled_time(service, method, seconds):
+    with _throttled_lock:
+        _throttled[(service, method)] += seconds
+
+
+def pop_throttled_time():
+    """Return the time spent throttled by (service, method) and reset it."""
+    with _throttled_lock:
+        throttled = dict(_throttled)
+        _throttled.clear()
+    return throttled
+
+
+class TokenBucketLimiter(object):
+
+    """
+    Limits the rate of the requests sent for every (service, method).
+
+    Every request takes a token out of the bucket of its service and
+    method, which is refilled at a fixed rate up to burst tokens. A request
+    finding the bucket empty still takes its token, making the bucket go
+    negative, and waits until it is paid back, so that the requests are
+    sent in the order they were made. A 413 answer with a retry-after
+    header empties the bucket and holds it for that delay, the requests
+    waiting for it are then sent at the bucket rate once the delay is
+    over.
+
+    When a lock_path is given, the buckets are kept in files there and
+    shared by all the processes using it, otherwise they are only shared
+    by the threads of the process.
+    """
+
+    def __init__(self, rate, burst, lock_path=None):
+        self.rate = float(rate)
+        self.burst = burst
+        self.lock_path = lock_path
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _name(self, service, method):
+        return 'rate_limit_%s_%s' % (service, method)
+
+    def _read(self, path):
+        try:
+            with open(path) as bucket_file:
+                return json.load(bucket_file)
+        except (IOError, ValueError):
+            return None
+
+    def _write(self, path, bucket):
+        tmp_path = '%s.%d' % (path, os.getpid())
+        with open(tmp_path, 'w') as bucket_file:
+            json.dump(bucket, bucket_file)
+        os.rename(tmp_path, path)
+
+    def _update(self, service, method, func):
+        """Call func with the bucket refilled up to now and save it.
+
+        A bucket is a [tokens, updated_at, blocked_until] list.
+        """
+        if not self.lock_path:
+            with self._lock:
+                bucket = self._refill(self._buckets.get((service, method)))
+                result = func(bucket)
+                self._buckets[(service, method)] = bucket
+            return result
+        name = self._name(service, method)
+        path = os.path.join(self.lock_path, name + '.json')
+        with lockutils.lock(name, external=True, lock_path=self.lock_path):
+            bucket = self._refill(self._read(path))
+            result = func(bucket)
+            self._write(path, bucket)
+        return result
+
+    def _refill(self, bucket):
+        now = time.time()
+        if bucket is None:
+            return [self.burst, now, 0]
+        tokens, updated_at, blocked_until = bucket
+        # The bucket isn't refilled while it is held
+        elapsed = max(now - max(updated_at, blocked_until), 0)
+        tokens = min(self.burst, tokens + elapsed * self.rate)
+        return [tokens, now, blocked_until]
+
+    def acquire(self, service, method):
+        """Wait until a request can be sent, return the time waited."""
+        def take(bucket):
+            bucket[0] -= 1
+            now = bucket[1]
+            return max(bucket[2] - now, 0) + max(-bucket[0] / self.rate, 0)
+
+        delay = self._update(service, method, take)
+        if delay > 0:
+            LOG.debug("Waiting %.2fs for the %s rate limit of %s" %
+                      (delay, method, service))
+            time.sleep(delay)
+            add_throttled_time(service, method, delay)
+        return delay
+
+    def throttle(self, service, method, retry_after):
+        """Hold the bucket after a rate limited answer."""
+        def block(bucket):
+            now = bucket[1]
+            bucket[0] = min(bucket[0], 0)
+            bucket[2] = max(bucket[2], now + retry_after)
+
+        self._update(service, method, block)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """Return the limiter configured in rate_limiting, None if disabled."""
+    global _limiter
+    if not CONF.rate_limiting.requests_per_second:
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            lock_path = CONF.lock_path if CONF.rate_limiting.shared else None
+            _limiter = TokenBucketLimiter(
+                CONF.rate_limiting.requests_per_second,
+                CONF.rate_limiting.burst, lock_path)
+    return _limiter
@@ -16,14 +16,18 @@
 
 import collections
 import json
+from multiprocessing import pool
 import re
 import string
+import threading
 import time
 
+import httplib2
 import jsonschema
 from lxml import etree
 
 from tempest.common import http
+from tempest.common import rate_limiter
 from tempest.common.utils import misc as misc_utils
 from tempest.common import xml_utils as common
 from tempest import config
@@ -63,6 +67,8 @@ class RestClient(object):
 
         self.endpoint_url = None
         self.service = None
+        # The region to use for every service, instead of the configured one
+        self.region = None
         # The version of the API this client implements
         self.api_version = None
         self._skip_path = False
@@ -106,6 +112,8 @@ class RestClient(object):
         """
         Returns the region for a specific service
         """
+        if self.region:
+            return self.region
         service_region = None
         for cfgname in dir(CONF._config):
             # Find all config.FOO.catalog_type and assume FOO is a service.
@@ -414,6 +422,9 @@ class RestClient(object):
             except (ValueError, TypeError):
                 headers = self.get_headers()
 
+        limiter = rate_limiter.get_limiter()
+        if limiter:
+            limiter.acquire(self.service, method)
         resp, resp_body = self._request(method, url,
                                         headers=headers, body=body)
 
@@ -424,7 +435,14 @@ class RestClient(object):
                 retry < MAX_RECURSION_DEPTH):
             retry += 1
             delay = int(resp['retry-after'])
-            time.sleep(delay)
+            if limiter:
+                # Hold the bucket so that the other requests to the
+                # service wait for the delay too
+                limiter.throttle(self.service, method, delay)
+                limiter.acquire(self.service, method)
+            else:
+                time.sleep(delay)
+                rate_limiter.add_throttled_time(self.service, method, delay)
             resp, resp_body = self._request(method, url,
                                             headers=headers, body=body)
         self._error_checker(method, url, headers, body,
@@ -596,6 +614,26 @@ class NegativeRestClient(RestClient):
     """
     Version of RestClient that does not raise exceptions.
     """
+
+    def __init__(self, auth_provider):
+        self._local = threading.local()
+        super(NegativeRestClient, self).__init__(auth_provider)
+
+    @property
+    def http_obj(self):
+        # NOTE: Every thread sending requests uses its own connection, kept
+        # alive between the requests it sends.
+        http_obj = getattr(self._local, 'http_obj', None)
+        if http_obj is None:
+            dscv = CONF.identity.disable_ssl_certificate_validation
+            http_obj = httplib2.Http(disable_ssl_certificate_validation=dscv)
+            self._local.http_obj = http_obj
+        return http_obj
+
+    @http_obj.setter
+    def http_obj(self, http_obj):
+        self._local.http_obj = http_obj
+
     def _error_checker(self, method, url,
                        headers, body, resp, resp_body):
         pass
@@ -620,3 +658,25 @@ class NegativeRestClient(RestClient):
             assert False
 
         return resp, body
+
+    def send_requests(self, requests, concurrency):
+        """
+        Sends requests concurrently.
+
+        :param requests: A list of (method, url_template, resources, body)
+        :param concurrency: The number of requests sent at once
+        :return: A list with the (resp, body) of every request, or the
+                 exception it raised, in the order of the requests
+        """
+        def send(request):
+            try:
+                return self.send_request(*request)
+            except Exception as exc:
+                return exc
+
+        workers = pool.ThreadPool(max(1, min(concurrency, len(requests))))
+        try:
+            return workers.map(send, requests)
+        finally:
+            workers.close()
+            workers.join()
@@ -13,7 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import binascii
+import errno
+import hashlib
 import itertools
+import os
 import random
 import uuid
 
@@ -73,9 +77,126 @@ def arbitrary_string(size=4, base_text=None):
     return ''.join(itertools.islice(itertools.cycle(base_text), size))
 
 
+def _random_block(rand, size):
+    # getrandbits builds all the bits at once, formatting them in hex is
+    # much faster than picking the bytes one by one
+    if size <= 0:
+        return ''
+    return binascii.unhexlify('%0*x' % (size * 2, rand.getrandbits(size * 8)))
+
+
 def random_bytes(size=1024):
     """
     Return size randomly selected bytes as a string.
     """
-    return ''.join([chr(random.randint(0, 255))
-                    for i in range(size)])
+    return _random_block(random, size)
+
+
+class RandomPayload(object):
+    """
+    File-like object returning size random bytes, generated as they are read.
+
+    The payload is made of blocks generated from the seed and the index of
+    the block, so the same seed always gives the same content and seeking
+    anywhere in the payload doesn't generate what comes before. Only the
+    block being read is kept in memory, which makes it possible to upload
+    payloads of several GB.
+
+    Generating random bytes costs far more than copying them, so the
+    blocks are cut at random offsets of a pool of POOL_SIZE random bytes,
+    generated once from the seed. As the pool is larger than the window of
+    deflate, the payload still doesn't compress. Every block of a
+    compressible payload instead repeats a short random pattern.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+    POOL_SIZE = 1024 * 1024
+    PATTERN_SIZE = 64
+
+    # md5 checksums of the payloads, by size, seed and compressibility
+    _checksums = {}
+
+    def __init__(self, size, seed=None, compressible=False):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.size = size
+        self.seed = seed
+        self.compressible = compressible
+        self._pos = 0
+        self._pool = None
+        self._block_index = None
+        self._block = ''
+
+    def __len__(self):
+        return self.size
+
+    def _make_block(self, index):
+        start = index * self.BLOCK_SIZE
+        length = min(self.BLOCK_SIZE, self.size - start)
+        rand = random.Random((self.seed << 32) + index)
+        if self.compressible:
+            pattern = _random_block(rand, self.PATTERN_SIZE)
+            return (pattern * (length // self.PATTERN_SIZE + 1))[:length]
+        if self._pool is None:
+            self._pool = _random_block(random.Random(self.seed),
+                                       min(self.size, self.POOL_SIZE))
+        if self.size <= self.POOL_SIZE:
+            return self._pool[start:start + length]
+        offset = rand.randrange(len(self._pool))
+        block = self._pool[offset:offset + length]
+        if len(block) < length:
+            block += self._pool[:length - len(block)]
+        return block
+
+    def _get_block(self, index):
+        if index != self._block_index:
+            self._block = self._make_block(index)
+            self._block_index = index
+        return self._block
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size
+        end = min(self._pos + size, self.size)
+        chunks = []
+        while self._pos < end:
+            index, offset = divmod(self._pos, self.BLOCK_SIZE)
+            chunk = self._get_block(index)[offset:offset + end - self._pos]
+            chunks.append(chunk)
+            self._pos += len(chunk)
+        return ''.join(chunks)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise IOError(errno.EINVAL, 'Invalid argument')
+        self._pos = offset
+
+    def tell(self):
+        return self._pos
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.BLOCK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    @property
+    def checksum(self):
+        """The md5 hex digest of the whole payload.
+
+        It is computed once for a given content, without moving the read
+        position.
+        """
+        key = (self.size, self.seed, self.compressible)
+        if key not in self._checksums:
+            digest = hashlib.md5()
+            blocks = (self.size + self.BLOCK_SIZE - 1) // self.BLOCK_SIZE
+            for index in range(blocks):
+                digest.update(self._make_block(index))
+            self._checksums[key] = digest.hexdigest()
+        return self._checksums[key]
@@ -21,6 +21,67 @@ from tempest import exceptions
 
 CONF = config.CONF
 
+# Precedes the exit status of every command run by get_facts()
+FACT_MARKER = '--- tempest fact'
+
+
+def _parse_ram_size(output):
+    if output:
+        return output.split()[1]
+
+
+def _parse_boot_time(output):
+    return time.localtime(time.time() - int(output))
+
+
+# The facts about a guest, with the command getting them and the function
+# parsing its output, None to keep it as is
+FACTS = {
+    'hostname': ('hostname', lambda output: output.rstrip()),
+    'ram_size_in_mb': ('free -m | grep Mem', _parse_ram_size),
+    'number_of_vcpus': ('cat /proc/cpuinfo | grep processor | wc -l', int),
+    'partitions': ('cat /proc/partitions', None),
+    'boot_time': ('cut -f1 -d. /proc/uptime', _parse_boot_time),
+    'mac_address': ("/sbin/ifconfig | awk '/HWaddr/ {print $5}'", None),
+    'ip_list': ('/bin/ip address', None),
+}
+
+
+def _parse_fact(name, output):
+    parse = FACTS[name][1]
+    return output if parse is None else parse(output)
+
+
+def facts_script(names):
+    """Return a shell script running the commands of the given facts.
+
+    Every command is followed by a line with FACT_MARKER, the name of the
+    fact and the exit status of the command, all the commands being run
+    whatever their status.
+    """
+    script = []
+    for name in names:
+        script.append('{ %s\n}; printf "\\n%s %s %%s\\n" $?' %
+                      (FACTS[name][0], FACT_MARKER, name))
+    return '\n'.join(script)
+
+
+def parse_facts_output(output):
+    """Split the output of facts_script().
+
+    :return: dict mapping every fact to the exit status and the output of
+        its command
+    """
+    parts = re.split('\n%s (\\w+) (\\d+)\n' % re.escape(FACT_MARKER),
+                     output)
+    if len(parts) < 4 or parts[-1]:
+        raise exceptions.TempestException(
+            "Unexpected output of the facts commands:\n%s" % output)
+    results = {}
+    for i in range(0, len(parts) - 1, 3):
+        results[parts[i + 1]] = (int(parts[i + 2]), parts[i])
+    return results
+
 
 class RemoteClient():
 
@@ -53,32 +114,43 @@ class RemoteClient():
         """
         self.ssh_client.test_connection_auth()
 
+    def get_fact(self, name):
+        return _parse_fact(name, self.exec_command(FACTS[name][0]))
+
+    def get_facts(self, *names):
+        """Get several facts about the guest with a single command.
+
+        :param names: names of facts in FACTS
+        :return: dict mapping every name to the parsed fact
+        :raises SSHExecCommandFailed: if the command of a fact failed
+        """
+        results = parse_facts_output(
+            self.exec_command(facts_script(names)))
+        facts = {}
+        for name in names:
+            exit_status, output = results[name]
+            if exit_status != 0:
+                raise exceptions.SSHExecCommandFailed(
+                    command=FACTS[name][0], exit_status=exit_status,
+                    strerror=output)
+            facts[name] = _parse_fact(name, output)
+        return facts
+
     def hostname_equals_servername(self, expected_hostname):
-        # Get host name using command "hostname"
-        actual_hostname = self.exec_command("hostname").rstrip()
-        return expected_hostname == actual_hostname
+        return expected_hostname == self.get_fact('hostname')
 
     def get_ram_size_in_mb(self):
-        output = self.exec_command('free -m | grep Mem')
-        if output:
-            return output.split()[1]
+        return self.get_fact('ram_size_in_mb')
 
     def get_number_of_vcpus(self):
-        command = 'cat /proc/cpuinfo | grep processor | wc -l'
-        output = self.exec_command(command)
-        return int(output)
+        return self.get_fact('number_of_vcpus')
 
     def get_partitions(self):
         # Return the contents of /proc/partitions
-        command = 'cat /proc/partitions'
-        output = self.exec_command(command)
-        return output
+        return self.get_fact('partitions')
 
     def get_boot_time(self):
-        cmd = 'cut -f1 -d. /proc/uptime'
-        boot_secs = self.exec_command(cmd)
-        boot_time = time.time() - int(boot_secs)
-        return time.localtime(boot_time)
+        return self.get_fact('boot_time')
 
     def write_to_console(self, message):
         message = re.sub("([$\\`])", "\\\\\\\\\\1", message)
@@ -91,12 +163,10 @@ class RemoteClient():
         return self.exec_command(cmd)
 
     def get_mac_address(self):
-        cmd = "/sbin/ifconfig | awk '/HWaddr/ {print $5}'"
-        return self.exec_command(cmd)
+        return self.get_fact('mac_address')
 
     def get_ip_list(self):
-        cmd = "/bin/ip address"
-        return self.exec_command(cmd)
+        return self.get_fact('ip_list')
 
     def assign_static_ip(self, nic, addr):
         cmd = "sudo /bin/ip addr add {ip}/{mask} dev {nic}".format(
@@ -11,12 +11,15 @@
 #    under the License.
 
 
+import collections
+import re
 import time
 
 from tempest.common.utils import misc as misc_utils
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import log as logging
+from tempest.openstack.common import timeutils
 
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
@@ -131,3 +134,109 @@ def wait_for_image_status(client, image_id, status):
             if caller:
                 message = '(%s) %s' % (caller, message)
             raise exceptions.TimeoutException(message)
+
+
+class StackEventWatcher(object):
+    """Follows the events of a stack to know the status of its resources.
+
+    Every poll only asks for the events that came after the last one seen
+    and updates the status of all the resources at once, so any number of
+    resources is waited for with a single request per build_interval.
+
+    list_events is called with the id of the last event seen, None at
+    first, and returns the events which came after it. Events seen already
+    are skipped if it returns them anyway. If the marked listing fails, for
+    instance because the last event seen was pruned, all the events are
+    listed instead.
+    """
+
+    def __init__(self, list_events, stack_identifier, build_interval,
+                 build_timeout):
+        self.list_events = list_events
+        self.stack_identifier = stack_identifier
+        self.build_interval = build_interval
+        self.build_timeout = build_timeout
+        self.marker = None
+        self.seen = set()
+        # Last event of every resource, by resource name
+        self.resources = {}
+        # (status, event_time) of every event, by resource name
+        self.transitions = collections.defaultdict(list)
+
+    def poll(self):
+        """Fetch the new events, return them oldest first."""
+        try:
+            events = self.list_events(self.marker)
+        except (exceptions.NotFound, exceptions.BadRequest) as exc:
+            if self.marker is None:
+                raise
+            LOG.debug("Listing the events of stack %s after %s failed, "
+                      "listing all of them: %s", self.stack_identifier,
+                      self.marker, exc)
+            events = self.list_events(None)
+        events = sorted((event for event in events
+                         if event['id'] not in self.seen),
+                        key=lambda event: event['event_time'])
+        for event in events:
+            self.seen.add(event['id'])
+            name = event.get('resource_name') or event['logical_resource_id']
+            self.resources[name] = event
+            self.transitions[name].append((event['resource_status'],
+                                           event['event_time']))
+        if events:
+            self.marker = events[-1]['id']
+        return events
+
+    def durations(self):
+        """Return the seconds between the first and last event by resource.
+        """
+        durations = {}
+        for name, transitions in self.transitions.items():
+            first = timeutils.parse_isotime(transitions[0][1])
+            last = timeutils.parse_isotime(transitions[-1][1])
+            durations[name] = timeutils.delta_seconds(first, last)
+        return durations
+
+    def wait_for(self, statuses, failure_pattern='^.*_FAILED$'):
+        """Wait for resources to reach a given status.
+
+        :param statuses: dict of the status to wait for by resource name
+        """
+        fail_regexp = re.compile(failure_pattern)
+        start = time.time()
+        while True:
+            self.poll()
+            pending = []
+            for name, status in sorted(statuses.items()):
+                event = self.resources.get(name)
+                if event is None:
+                    # the resource may not have been created yet
+                    pending.append(name)
+                    continue
+                resource_status = event['resource_status']
+                if resource_status == status:
+                    continue
+                if fail_regexp.search(resource_status):
+                    raise exceptions.StackResourceBuildErrorException(
+                        resource_name=name,
+                        stack_identifier=self.stack_identifier,
+                        resource_status=resource_status,
+                        resource_status_reason=event.get(
+                            'resource_status_reason'))
+                pending.append(name)
+            if not pending:
+                break
+            if time.time() - start >= self.build_timeout:
+                message = ('Resources %s failed to reach their status '
+                           'within the required time (%s s).' %
+                           (', '.join('%s (%s)' % (name, statuses[name])
+                                      for name in pending),
+                            self.build_timeout))
+                raise exceptions.TimeoutException(message)
+            time.sleep(self.build_interval)
+
+        durations = self.durations()
+        LOG.debug("Stack %s resources reached their status after: %s" %
+                  (self.stack_identifier,
+                   ', '.join('%s %ss' % (name, durations[name])
+                             for name in sorted(statuses))))
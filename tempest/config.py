@@ -15,8 +15,13 @@
 
 from __future__ import print_function
 
+import hashlib
 import logging as std_logging
 import os
+import pickle
+import time
+
+_IMPORT_START = time.time()
 
 from oslo.config import cfg
 
@@ -798,6 +803,18 @@ BotoGroup = [
     cfg.IntOpt('build_interval',
                default=1,
                help="Status Change Test Interval"),
+    cfg.IntOpt('s3_upload_concurrency',
+               default=4,
+               help="Number of files, or parts of files, uploaded to S3 at "
+                    "the same time"),
+    cfg.IntOpt('s3_multipart_threshold',
+               default=16 * 1024 * 1024,
+               help="Size in bytes from which files are uploaded to S3 in "
+                    "several parts. 0 disables multipart uploads."),
+    cfg.IntOpt('s3_multipart_chunk_size',
+               default=8 * 1024 * 1024,
+               help="Size in bytes of the parts of multipart uploads, at "
+                    "least 5MB"),
 ]
 
 stress_group = cfg.OptGroup(name='stress', title='Stress Test Options')
@@ -870,7 +887,12 @@ ScenarioGroup = [
         'large_ops_number',
         default=0,
         help="specifies how many resources to request at once. Used "
-        "for large operations testing.")
+        "for large operations testing."),
+    cfg.IntOpt('cleanup_concurrency',
+               default=8,
+               help="Number of resources deleted, and of resource types "
+                    "waited for, at the same time when cleaning up after "
+                    "a scenario test."),
 ]
 
 
@@ -923,6 +945,24 @@ DebugGroup = [
     cfg.BoolOpt('enable',
                 default=True,
                 help="Enable diagnostic commands"),
+    cfg.IntOpt('dump_timeout',
+               default=120,
+               help="Time in seconds after which the dump of the network "
+                    "namespaces run by the diagnostic commands is stopped. "
+                    "0 means no limit."),
+    cfg.IntOpt('dump_max_size',
+               default=10 * 1024 * 1024,
+               help="Number of bytes of the dump of the network namespaces "
+                    "which are logged at most. 0 means no limit."),
+    cfg.IntOpt('console_tail_lines',
+               default=100,
+               help="Number of lines at the end of the console output of a "
+                    "server which are logged the first time it is dumped. "
+                    "Later dumps only log the lines added since."),
+    cfg.IntOpt('console_max_lines',
+               default=1000,
+               help="Number of lines of console output fetched and logged "
+                    "at most per server by a dump"),
     cfg.StrOpt('trace_requests',
                default='',
                help="""A regex to determine which requests should be traced.
@@ -964,6 +1004,14 @@ InputScenarioGroup = [
                default="[[\"^.*[Cc]irros.*$\", \"root\"]]",
                help="List of user mapped to regex "
                     "to matching image names."),
+    cfg.IntOpt('discovery_cache_ttl',
+               default=0,
+               help="Time in seconds for which the images and flavors "
+                    "listed to build input scenarios are cached in the "
+                    "lock_path and shared by all the test workers. 0 "
+                    "disables the cache. The images and flavors got by "
+                    "ImageUtils are also got again once older than that, "
+                    "they are kept for the whole run when it is 0."),
 ]
 
 
@@ -1018,6 +1066,16 @@ CLIGroup = [
     cfg.IntOpt('timeout',
                default=15,
                help="Number of seconds to wait on a CLI timeout"),
+    cfg.BoolOpt('cache_read_only',
+                default=False,
+                help="Run every command of the read-only CLI tests once per "
+                     "test worker and reuse its output, the commands the "
+                     "tests are known to run being started concurrently "
+                     "when the first test of a class is set up."),
+    cfg.IntOpt('concurrency',
+               default=4,
+               help="Number of CLI commands run at the same time when "
+                    "cache_read_only is set."),
 ]
 
 negative_group = cfg.OptGroup(name='negative', title="Negative Test Options")
@@ -1027,46 +1085,146 @@ NegativeGroup = [
                default='tempest.common.' +
                'generator.negative_generator.NegativeTestGenerator',
                help="Test generator class for all negative tests"),
+    cfg.StrOpt('scenario_cache_path',
+               default=None,
+               help="Directory where the scenarios generated for negative "
+                    "tests are cached, keyed on a hash of their schema. "
+                    "By default they are only cached in memory."),
+    cfg.BoolOpt('batch_requests',
+                default=False,
+                help="Send the requests of all the scenarios generated from "
+                     "a schema concurrently when the first of them runs. "
+                     "Each scenario still checks its own response."),
+    cfg.IntOpt('batch_concurrency',
+               default=8,
+               help="Number of requests sent at once in batch mode"),
+]
+
+
+rate_limiting_group = cfg.OptGroup(name='rate_limiting',
+                                   title="Client-side Rate Limiting Options")
+
+RateLimitingGroup = [
+    cfg.FloatOpt('requests_per_second',
+                 default=0.0,
+                 help="Rate at which the rest clients send the requests of "
+                      "a given method to a given service. 0 disables the "
+                      "client-side rate limiting."),
+    cfg.IntOpt('burst',
+               default=10,
+               help="Number of requests of a given method to a given "
+                    "service which can be sent at once before being limited "
+                    "to requests_per_second."),
+    cfg.BoolOpt('shared',
+                default=True,
+                help="Share the rate limits between all the test workers, "
+                     "through files in the lock_path. When a service "
+                     "answers with a 413 and a retry-after header, all the "
+                     "workers then wait for that delay."),
+]
+
+
+_opts = [
+    (auth_group, AuthGroup),
+    (compute_group, ComputeGroup),
+    (compute_features_group, ComputeFeaturesGroup),
+    (identity_group, IdentityGroup),
+    (identity_feature_group, IdentityFeatureGroup),
+    (image_group, ImageGroup),
+    (image_feature_group, ImageFeaturesGroup),
+    (network_group, NetworkGroup),
+    (network_feature_group, NetworkFeaturesGroup),
+    (queuing_group, QueuingGroup),
+    (volume_group, VolumeGroup),
+    (volume_feature_group, VolumeFeaturesGroup),
+    (object_storage_group, ObjectStoreGroup),
+    (object_storage_feature_group, ObjectStoreFeaturesGroup),
+    (database_group, DatabaseGroup),
+    (orchestration_group, OrchestrationGroup),
+    (telemetry_group, TelemetryGroup),
+    (dashboard_group, DashboardGroup),
+    (data_processing_group, DataProcessingGroup),
+    (boto_group, BotoGroup),
+    (compute_admin_group, ComputeAdminGroup),
+    (stress_group, StressGroup),
+    (scenario_group, ScenarioGroup),
+    (service_available_group, ServiceAvailableGroup),
+    (debug_group, DebugGroup),
+    (baremetal_group, BaremetalGroup),
+    (input_scenario_group, InputScenarioGroup),
+    (cli_group, CLIGroup),
+    (negative_group, NegativeGroup),
+    (rate_limiting_group, RateLimitingGroup),
 ]
 
 
 def register_opts():
-    register_opt_group(cfg.CONF, auth_group, AuthGroup)
-    register_opt_group(cfg.CONF, compute_group, ComputeGroup)
-    register_opt_group(cfg.CONF, compute_features_group,
-                       ComputeFeaturesGroup)
-    register_opt_group(cfg.CONF, identity_group, IdentityGroup)
-    register_opt_group(cfg.CONF, identity_feature_group,
-                       IdentityFeatureGroup)
-    register_opt_group(cfg.CONF, image_group, ImageGroup)
-    register_opt_group(cfg.CONF, image_feature_group, ImageFeaturesGroup)
-    register_opt_group(cfg.CONF, network_group, NetworkGroup)
-    register_opt_group(cfg.CONF, network_feature_group,
-                       NetworkFeaturesGroup)
-    register_opt_group(cfg.CONF, queuing_group, QueuingGroup)
-    register_opt_group(cfg.CONF, volume_group, VolumeGroup)
-    register_opt_group(cfg.CONF, volume_feature_group,
-                       VolumeFeaturesGroup)
-    register_opt_group(cfg.CONF, object_storage_group, ObjectStoreGroup)
-    register_opt_group(cfg.CONF, object_storage_feature_group,
-                       ObjectStoreFeaturesGroup)
-    register_opt_group(cfg.CONF, database_group, DatabaseGroup)
-    register_opt_group(cfg.CONF, orchestration_group, OrchestrationGroup)
-    register_opt_group(cfg.CONF, telemetry_group, TelemetryGroup)
-    register_opt_group(cfg.CONF, dashboard_group, DashboardGroup)
-    register_opt_group(cfg.CONF, data_processing_group,
-                       DataProcessingGroup)
-    register_opt_group(cfg.CONF, boto_group, BotoGroup)
-    register_opt_group(cfg.CONF, compute_admin_group, ComputeAdminGroup)
-    register_opt_group(cfg.CONF, stress_group, StressGroup)
-    register_opt_group(cfg.CONF, scenario_group, ScenarioGroup)
-    register_opt_group(cfg.CONF, service_available_group,
-                       ServiceAvailableGroup)
-    register_opt_group(cfg.CONF, debug_group, DebugGroup)
-    register_opt_group(cfg.CONF, baremetal_group, BaremetalGroup)
-    register_opt_group(cfg.CONF, input_scenario_group, InputScenarioGroup)
-    register_opt_group(cfg.CONF, cli_group, CLIGroup)
-    register_opt_group(cfg.CONF, negative_group, NegativeGroup)
+    for opt_group, options in _opts:
+        register_opt_group(cfg.CONF, opt_group, options)
+
+
+class SnapshotGroup(object):
+    """Read-only stand-in for an option group loaded from a snapshot."""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    def __getitem__(self, key):
+        return self.__dict__[key]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Options loaded from a config snapshot can't "
+                             "be changed")
+
+
+class ConfigSnapshot(object):
+    """Resolved values of all the tempest options, pickled to a file.
+
+    The snapshot is keyed on the config file mtime and size and on a hash
+    of the registered options, it is ignored as soon as either changes.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, config_path):
+        self.path = path
+        self.key = self._key(config_path)
+
+    @classmethod
+    def _key(cls, config_path):
+        digest = hashlib.sha1()
+        digest.update(str(cls.VERSION))
+        try:
+            st = os.stat(config_path)
+            digest.update('%s:%r:%d' % (config_path, st.st_mtime,
+                                        st.st_size))
+        except OSError:
+            digest.update('%s:missing' % config_path)
+        for opt_group, options in _opts:
+            digest.update(opt_group.name)
+            for opt in options:
+                digest.update('%s=%r' % (opt.dest, opt.default))
+        return digest.hexdigest()
+
+    def load(self):
+        """Return the snapshot groups or None if it is missing or stale."""
+        try:
+            with open(self.path, 'rb') as snapshot_file:
+                key, groups = pickle.load(snapshot_file)
+        except Exception:
+            return None
+        if key != self.key:
+            return None
+        return dict((name, SnapshotGroup(values))
+                    for name, values in groups.iteritems())
+
+    def save(self, groups):
+        """Store a dict mapping group attribute names to option values."""
+        tmp_path = '%s.%d' % (self.path, os.getpid())
+        with open(tmp_path, 'wb') as snapshot_file:
+            pickle.dump((self.key, groups), snapshot_file,
+                        pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_path, self.path)
 
 
 # this should never be called outside of this class
@@ -1110,6 +1268,7 @@ class TempestConfigPrivate(object):
         self.input_scenario = cfg.CONF['input-scenario']
         self.cli = cfg.CONF.cli
         self.negative = cfg.CONF.negative
+        self.rate_limiting = cfg.CONF.rate_limiting
         if not self.compute_admin.username:
             self.compute_admin.username = self.identity.admin_username
             self.compute_admin.password = self.identity.admin_password
@@ -1125,6 +1284,8 @@ class TempestConfigPrivate(object):
     def __init__(self, parse_conf=True, config_path=None):
         """Initialize a configuration from a conf directory and conf file."""
         super(TempestConfigPrivate, self).__init__()
+        self.startup_times = [('import', IMPORT_TIME)]
+        start = time.time()
         config_files = []
         failsafe_path = "/etc/tempest/" + self.DEFAULT_CONFIG_FILE
 
@@ -1148,13 +1309,54 @@ class TempestConfigPrivate(object):
             config_files.append(path)
 
         cfg.CONF([], project='tempest', default_config_files=config_files)
+        start = self._time_stage('parse', start)
         logging.setup('tempest')
         LOG = logging.getLogger('tempest')
         LOG.info("Using tempest config file %s" % path)
+        cfg.CONF.import_opt('lock_path', 'tempest.openstack.common.lockutils')
+        self.lock_path = cfg.CONF.lock_path
+        start = self._time_stage('logging', start)
+
+        # A snapshot of the resolved options can be used in place of
+        # registering and logging all the options.
+        snapshot = None
+        snapshot_path = os.environ.get('TEMPEST_CONFIG_SNAPSHOT')
+        if parse_conf and snapshot_path:
+            snapshot = ConfigSnapshot(snapshot_path, path)
+            groups = snapshot.load()
+            start = self._time_stage('snapshot', start)
+            if groups is not None:
+                LOG.info("Using tempest config snapshot %s" % snapshot_path)
+                self.__dict__.update(groups)
+                self._log_startup_times(LOG)
+                return
+
         register_opts()
         self._set_attrs()
+        start = self._time_stage('register', start)
         if parse_conf:
             cfg.CONF.log_opt_values(LOG, std_logging.DEBUG)
+            start = self._time_stage('log_opts', start)
+        if snapshot is not None:
+            snapshot.save(self._group_values())
+            start = self._time_stage('snapshot', start)
+        self._log_startup_times(LOG)
+
+    def _time_stage(self, stage, start):
+        now = time.time()
+        self.startup_times.append((stage, now - start))
+        return now
+
+    def _log_startup_times(self, log):
+        log.debug("Tempest config startup times: %s" %
+                  ", ".join("%s %.3fs" % stage for stage in
+                            self.startup_times))
+
+    def _group_values(self):
+        # getattr keeps the values _set_attrs assigned on the groups
+        return dict((name, dict((key, getattr(group, key)) for key in group))
+                    for name, group in self.__dict__.iteritems()
+                    if isinstance(group, cfg.ConfigOpts.GroupAttr))
 
 
 class TempestConfigProxy(object):
@@ -1184,4 +1386,6 @@ class TempestConfigProxy(object):
         self._path = path
 
 
+IMPORT_TIME = time.time() - _IMPORT_START
+
 CONF = TempestConfigProxy()
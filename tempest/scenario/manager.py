@@ -15,15 +15,14 @@
 #    under the License.
 
 import logging
+from multiprocessing import pool
 import os
 import re
-import subprocess
 import time
 
 from cinderclient import exceptions as cinder_exceptions
 import glanceclient
 from heatclient import exc as heat_exceptions
-import netaddr
 from neutronclient.common import exceptions as exc
 from novaclient import exceptions as nova_exceptions
 import six
@@ -31,10 +30,14 @@ import six
 from tempest.api.network import common as net_common
 from tempest import auth
 from tempest import clients
+from tempest.common import cidr_allocator
+from tempest.common import console
 from tempest.common import debug
 from tempest.common import isolated_creds
+from tempest.common import prober
 from tempest.common.utils import data_utils
 from tempest.common.utils.linux import remote_client
+from tempest.common import waiters
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import log
@@ -143,6 +146,8 @@ class OfficialClientTest(tempest.test.BaseTestCase):
     def setUp(self):
         super(OfficialClientTest, self).setUp()
         self.cleanup_waits = []
+        # server id -> ConsoleLog, the lines logged before aren't logged again
+        self._console_logs = {}
         # NOTE(mtreinish) This is safe to do in setUp instead of setUp class
         # because scenario tests in the same test class should not share
         # resources. If resources were shared between test cases then it
@@ -178,6 +183,10 @@ class OfficialClientTest(tempest.test.BaseTestCase):
             if not self.not_found_exception(e):
                 raise
 
+    def tearDown(self):
+        self._teardown_start = time.time()
+        super(OfficialClientTest, self).tearDown()
+
     def _wait_for_cleanups(self):
         """To handle async delete actions, a list of waits is added
         which will be iterated over as the last step of clearing the
@@ -186,9 +195,59 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         successful. This is the same basic approach used in the api tests to
         limit cleanup execution time except here it is multi-resource,
         because of the nature of the scenario tests.
+
+        The waits are grouped by resource type, every group is polled in a
+        single loop and the groups are waited for concurrently.
         """
+        start = time.time()
+        groups = []
+        waits_by_key = {}
         for wait in self.cleanup_waits:
-            self.delete_timeout(**wait)
+            key = (id(wait['things']), wait['error_status'],
+                   wait['not_found_exception'])
+            if key not in waits_by_key:
+                waits_by_key[key] = dict(wait, thing_id=[])
+                groups.append(waits_by_key[key])
+            waits_by_key[key]['thing_id'].append(wait['thing_id'])
+        self._run_concurrently([(self.delete_timeouts, (), wait)
+                                for wait in groups])
+        teardown_start = getattr(self, '_teardown_start', start)
+        LOG.info("Cleanup of %s took %.2fs, %.2fs of which waiting for %d "
+                 "resources to be deleted", self.id(),
+                 time.time() - teardown_start, time.time() - start,
+                 len(self.cleanup_waits))
+
+    @staticmethod
+    def _run_concurrently(calls):
+        """Run (callable, args, kwargs) calls in a pool of threads.
+
+        Every call is run even if some fail, the first failure is then
+        raised.
+        """
+        if not calls:
+            return
+        if len(calls) == 1:
+            func, args, kwargs = calls[0]
+            func(*args, **kwargs)
+            return
+
+        def run(call):
+            func, args, kwargs = call
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                LOG.exception("Calling %s failed", func)
+                return e
+
+        workers = pool.ThreadPool(
+            min(len(calls), max(CONF.scenario.cleanup_concurrency, 1)))
+        try:
+            errors = [e for e in workers.map(run, calls) if e is not None]
+        finally:
+            workers.close()
+            workers.join()
+        if errors:
+            raise errors[0]
 
     def addCleanup_with_wait(self, things, thing_id,
                              error_status='ERROR',
@@ -212,6 +271,30 @@ class OfficialClientTest(tempest.test.BaseTestCase):
             self.addCleanup(things.delete, thing_id)
         else:
             self.addCleanup(cleanup_callable, *cleanup_args, **cleanup_kwargs)
+        self._add_cleanup_wait(things, thing_id, error_status, exc_type)
+
+    def addCleanups_with_wait(self, things, thing_ids,
+                              error_status='ERROR',
+                              exc_type=nova_exceptions.NotFound,
+                              cleanup_callable=None, cleanup_args_list=None):
+        """Same as addCleanup_with_wait for several resources of a type
+
+        The resources are deleted concurrently, by a single cleanup.
+
+        @param thing_ids: ids of the resources
+        @param cleanup_args_list: the args to call cleanup_callable with for
+            every resource, defaults to things.delete(thing_id)
+        """
+        if cleanup_callable is None:
+            cleanup_callable = things.delete
+            cleanup_args_list = [[thing_id] for thing_id in thing_ids]
+        self.addCleanup(self._run_concurrently,
+                        [(cleanup_callable, args, {})
+                         for args in cleanup_args_list])
+        for thing_id in thing_ids:
+            self._add_cleanup_wait(things, thing_id, error_status, exc_type)
+
+    def _add_cleanup_wait(self, things, thing_id, error_status, exc_type):
         wait_dict = {
             'things': things,
             'thing_id': thing_id,
@@ -234,6 +317,18 @@ class OfficialClientTest(tempest.test.BaseTestCase):
                              error_status=error_status,
                              not_found_exception=not_found_exception)
 
+    def status_timeouts(self, things, thing_ids, expected_status,
+                        error_status='ERROR',
+                        not_found_exception=nova_exceptions.NotFound):
+        """
+        Same as status_timeout for several things, all of them are checked
+        on every iteration of the loop.
+        """
+        self._status_timeout(things, thing_ids,
+                             expected_status=expected_status,
+                             error_status=error_status,
+                             not_found_exception=not_found_exception)
+
     def delete_timeout(self, things, thing_id,
                        error_status='ERROR',
                        not_found_exception=nova_exceptions.NotFound):
@@ -249,9 +344,22 @@ class OfficialClientTest(tempest.test.BaseTestCase):
                              error_status=error_status,
                              not_found_exception=not_found_exception)
 
+    def delete_timeouts(self, things, thing_ids,
+                        error_status='ERROR',
+                        not_found_exception=nova_exceptions.NotFound):
+        """
+        Same as delete_timeout for several things, all of them are checked
+        on every iteration of the loop.
+        """
+        self._status_timeout(things,
+                             thing_ids,
+                             allow_notfound=True,
+                             error_status=error_status,
+                             not_found_exception=not_found_exception)
+
     def _status_timeout(self,
                         things,
-                        thing_id,
+                        thing_ids,
                         expected_status=None,
                         allow_notfound=False,
                         error_status='ERROR',
@@ -260,21 +368,27 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         log_status = expected_status if expected_status else ''
         if allow_notfound:
             log_status += ' or NotFound' if log_status != '' else 'NotFound'
+        if not isinstance(thing_ids, (list, tuple)):
+            thing_ids = [thing_ids]
+        pending = list(thing_ids)
 
-        def check_status():
-            # python-novaclient has resources available to its client
-            # that all implement a get() method taking an identifier
-            # for the singular resource to retrieve.
-            try:
-                thing = things.get(thing_id)
-            except not_found_exception:
-                if allow_notfound:
-                    return True
-                raise
-            except Exception as e:
-                if allow_notfound and self.not_found_exception(e):
-                    return True
-                raise
+        def check_thing_status(thing_id, listed=None):
+            if listed is not None and thing_id in listed:
+                thing = listed[thing_id]
+            else:
+                # python-novaclient has resources available to its client
+                # that all implement a get() method taking an identifier
+                # for the singular resource to retrieve.
+                try:
+                    thing = things.get(thing_id)
+                except not_found_exception:
+                    if allow_notfound:
+                        return True
+                    raise
+                except Exception as e:
+                    if allow_notfound and self.not_found_exception(e):
+                        return True
+                    raise
 
             new_status = thing.status
 
@@ -292,12 +406,34 @@ class OfficialClientTest(tempest.test.BaseTestCase):
             LOG.debug("Waiting for %s to get to %s status. "
                       "Currently in %s status",
                       thing, log_status, new_status)
+
+        def list_things():
+            # Waiting for several deletions takes a single list call per
+            # iteration. Listings can be filtered or paged, a thing missing
+            # from it is only deleted once get() doesn't find it either.
+            try:
+                return dict((thing.id, thing) for thing in things.list())
+            except Exception as e:
+                LOG.debug("Listing %s failed, getting every thing instead: "
+                          "%s", things, e)
+                return None
+
+        def check_status():
+            listed = None
+            if allow_notfound and len(thing_ids) > 1 and hasattr(things,
+                                                                 'list'):
+                listed = list_things()
+            pending[:] = [thing_id for thing_id in pending
+                          if not check_thing_status(thing_id, listed)]
+            return not pending
+
         if not tempest.test.call_until_true(
             check_status,
             CONF.compute.build_timeout,
             CONF.compute.build_interval):
             message = ("Timed out waiting for thing %s "
-                       "to become %s") % (thing_id, log_status)
+                       "to become %s") % (', '.join(map(str, pending)),
+                                          log_status)
             raise exceptions.TimeoutException(message)
 
     def _create_loginable_secgroup_rule_nova(self, client=None,
@@ -383,54 +519,94 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         @param create_kwargs: additional details for instance creation
         @return: client.server object
         """
-        if client is None:
-            client = self.compute_client
-        if name is None:
-            name = data_utils.rand_name('scenario-server-')
-        if image is None:
-            image = CONF.compute.image_ref
-        if flavor is None:
-            flavor = CONF.compute.flavor_ref
+        server = dict(name=name, image=image, flavor=flavor,
+                      create_kwargs=create_kwargs)
+        return self.create_servers([server], client=client,
+                                   wait_on_boot=wait_on_boot,
+                                   wait_on_delete=wait_on_delete)[0]
 
+    def _fixed_network_nics(self, client):
         fixed_network_name = CONF.compute.fixed_network_name
-        if 'nics' not in create_kwargs and fixed_network_name:
-            networks = client.networks.list()
-            # If several networks found, set the NetID on which to connect the
-            # server to avoid the following error "Multiple possible networks
-            # found, use a Network ID to be more specific."
-            # See Tempest #1250866
-            if len(networks) > 1:
-                for network in networks:
-                    if network.label == fixed_network_name:
-                        create_kwargs['nics'] = [{'net-id': network.id}]
-                        break
-                # If we didn't find the network we were looking for :
-                else:
-                    msg = ("The network on which the NIC of the server must "
-                           "be connected can not be found : "
-                           "fixed_network_name=%s. Starting instance without "
-                           "specifying a network.") % fixed_network_name
-                    LOG.info(msg)
-
-        LOG.debug("Creating a server (name: %s, image: %s, flavor: %s)",
-                  name, image, flavor)
-        server = client.servers.create(name, image, flavor, **create_kwargs)
-        self.assertEqual(server.name, name)
+        if not fixed_network_name:
+            return None
+        networks = client.networks.list()
+        # If several networks found, set the NetID on which to connect the
+        # server to avoid the following error "Multiple possible networks
+        # found, use a Network ID to be more specific."
+        # See Tempest #1250866
+        if len(networks) > 1:
+            for network in networks:
+                if network.label == fixed_network_name:
+                    return [{'net-id': network.id}]
+            # If we didn't find the network we were looking for :
+            else:
+                msg = ("The network on which the NIC of the server must "
+                       "be connected can not be found : "
+                       "fixed_network_name=%s. Starting instance without "
+                       "specifying a network.") % fixed_network_name
+                LOG.info(msg)
+        return None
+
+    def create_servers(self, servers, client=None, wait_on_boot=True,
+                       wait_on_delete=True):
+        """Creates several VM instances at once.
+
+        All the boot requests are sent before waiting for any instance, the
+        instances are then waited for together.
+
+        @param servers: list of dicts holding the name, image, flavor and
+            create_kwargs arguments of create_server for every instance
+        @param client: compute client to create the instances
+        @param wait_on_boot: wait for status ACTIVE before continue
+        @param wait_on_delete: force synchronous delete on cleanup
+        @return: list of client.server objects
+        """
+        if client is None:
+            client = self.compute_client
+        nics = None
+        created = []
+        server_ids = []
+        # The cleanups run in reverse order, the deletions of all the
+        # servers are waited for once they are all requested.
         if wait_on_delete:
-            self.addCleanup(self.delete_timeout,
+            self.addCleanup(self.delete_timeouts,
                             self.compute_client.servers,
-                            server.id)
-        self.addCleanup_with_wait(self.compute_client.servers, server.id,
-                                  cleanup_callable=self.delete_wrapper,
-                                  cleanup_args=[server])
+                            server_ids)
+        for server in servers:
+            name = server.get('name')
+            if name is None:
+                name = data_utils.rand_name('scenario-server-')
+            image = server.get('image')
+            if image is None:
+                image = CONF.compute.image_ref
+            flavor = server.get('flavor')
+            if flavor is None:
+                flavor = CONF.compute.flavor_ref
+            create_kwargs = dict(server.get('create_kwargs') or {})
+            if 'nics' not in create_kwargs:
+                if nics is None:
+                    nics = self._fixed_network_nics(client) or []
+                if nics:
+                    create_kwargs['nics'] = nics
+
+            LOG.debug("Creating a server (name: %s, image: %s, flavor: %s)",
+                      name, image, flavor)
+            created.append(client.servers.create(name, image, flavor,
+                                                 **create_kwargs))
+            server_ids.append(created[-1].id)
+            self.addCleanup_with_wait(self.compute_client.servers,
+                                      created[-1].id,
+                                      cleanup_callable=self.delete_wrapper,
+                                      cleanup_args=[created[-1]])
+            self.assertEqual(created[-1].name, name)
         if wait_on_boot:
-            self.status_timeout(client.servers, server.id, 'ACTIVE')
+            self.status_timeouts(client.servers, server_ids, 'ACTIVE')
         # The instance retrieved on creation is missing network
         # details, necessitating retrieval after it becomes active to
         # ensure correct details.
-        server = client.servers.get(server.id)
-        LOG.debug("Created server: %s", server)
-        return server
+        created = [client.servers.get(server_id) for server_id in server_ids]
+        LOG.debug("Created servers: %s", created)
+        return created
 
     def create_volume(self, client=None, size=1, name=None,
                       snapshot_id=None, imageRef=None, volume_type=None,
@@ -512,8 +688,20 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         if not servers:
             servers = self.compute_client.servers.list()
         for server in servers:
+            if server.id not in self._console_logs:
+                self._console_logs[server.id] = console.ConsoleLog(
+                    server.get_console_output,
+                    CONF.debug.console_tail_lines,
+                    CONF.debug.console_max_lines)
+        outputs = console.read_many([self._console_logs[server.id]
+                                     for server in servers])
+        for server, output in zip(servers, outputs):
+            if isinstance(output, Exception):
+                LOG.debug('Console output for %s not available: %s',
+                          server.id, output)
+                continue
             LOG.debug('Console output for %s', server.id)
-            LOG.debug(server.get_console_output())
+            LOG.debug('\n'.join(output))
 
     def wait_for_volume_status(self, status):
         volume_id = self.volume.id
@@ -858,24 +1046,17 @@ class NetworkScenarioTest(OfficialClientTest):
         configured for tenant networks.
         """
 
-        def cidr_in_use(cidr, tenant_id):
-            """
-            :return True if subnet with cidr already exist in tenant
-                False else
-            """
-            cidr_in_use = self._list_subnets(tenant_id=tenant_id, cidr=cidr)
-            return len(cidr_in_use) != 0
-
-        tenant_cidr = netaddr.IPNetwork(CONF.network.tenant_network_cidr)
+        allocator = cidr_allocator.CidrAllocator(
+            CONF.network.tenant_network_cidr,
+            CONF.network.tenant_network_mask_bits,
+            CONF.lock_path)
+        # The tenant subnets are listed once, the free blocks are then
+        # computed locally and reserved against the other workers.
+        used_cidrs = [subnet['cidr'] for subnet in
+                      self._list_subnets(tenant_id=network.tenant_id)]
         result = None
-        # Repeatedly attempt subnet creation with sequential cidr
-        # blocks until an unallocated block is found.
-        for subnet_cidr in tenant_cidr.subnet(
-            CONF.network.tenant_network_mask_bits):
-            str_cidr = str(subnet_cidr)
-            if cidr_in_use(str_cidr, tenant_id=network.tenant_id):
-                continue
-
+        str_cidr = allocator.allocate(used_cidrs)
+        while str_cidr is not None:
             body = dict(
                 subnet=dict(
                     name=data_utils.rand_name(namestart),
@@ -890,12 +1071,16 @@ class NetworkScenarioTest(OfficialClientTest):
                 result = self.network_client.create_subnet(body=body)
                 break
             except exc.NeutronClientException as e:
+                allocator.release(str_cidr)
                 is_overlapping_cidr = 'overlaps with another subnet' in str(e)
                 if not is_overlapping_cidr:
                     raise
+                used_cidrs.append(str_cidr)
+                str_cidr = allocator.allocate(used_cidrs)
         self.assertIsNotNone(result, 'Unable to allocate tenant network')
         subnet = net_common.DeletableSubnet(client=self.network_client,
                                             **result['subnet'])
+        self.addCleanup(allocator.release, str_cidr)
         self.assertEqual(subnet.cidr, str_cidr)
         self.addCleanup(self.delete_wrapper, subnet)
         return subnet
@@ -951,17 +1136,13 @@ class NetworkScenarioTest(OfficialClientTest):
         return floating_ip
 
     def _ping_ip_address(self, ip_address, should_succeed=True):
-        cmd = ['ping', '-c1', '-w1', ip_address]
-
-        def ping():
-            proc = subprocess.Popen(cmd,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-            proc.wait()
-            return (proc.returncode == 0) == should_succeed
-
-        return tempest.test.call_until_true(
-            ping, CONF.compute.ping_timeout, 1)
+        seconds = prober.probe([ip_address], timeout=CONF.compute.ping_timeout,
+                               should_succeed=should_succeed)[ip_address]
+        if seconds is None:
+            return False
+        LOG.debug('Ping of %s %s after %.1fs', ip_address,
+                  'succeeded' if should_succeed else 'failed', seconds)
+        return True
 
     def _create_pool(self, lb_method, protocol, subnet_id):
         """Wrapper utility that returns a test pool."""
@@ -1372,50 +1553,42 @@ class OrchestrationScenarioTest(OfficialClientTest):
                     if o['output_key'] == output_key), None)
 
     def _ping_ip_address(self, ip_address, should_succeed=True):
-        cmd = ['ping', '-c1', '-w1', ip_address]
-
-        def ping():
-            proc = subprocess.Popen(cmd,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-            proc.wait()
-            return (proc.returncode == 0) == should_succeed
+        results = prober.probe([ip_address],
+                               timeout=CONF.orchestration.build_timeout,
+                               should_succeed=should_succeed)
+        return results[ip_address] is not None
 
-        return tempest.test.call_until_true(
-            ping, CONF.orchestration.build_timeout, 1)
+    def _wait_for_resources_status(self, stack_identifier, statuses,
+                                   failure_pattern='^.*_FAILED$'):
+        """Waits for Resources to reach a given status.
 
-    def _wait_for_resource_status(self, stack_identifier, resource_name,
-                                  status, failure_pattern='^.*_FAILED$'):
-        """Waits for a Resource to reach a given status."""
-        fail_regexp = re.compile(failure_pattern)
-        build_timeout = CONF.orchestration.build_timeout
-        build_interval = CONF.orchestration.build_interval
+        All the resources are followed through the events of the stack, with
+        a single request per build_interval.
 
-        start = timeutils.utcnow()
-        while timeutils.delta_seconds(start,
-                                      timeutils.utcnow()) < build_timeout:
+        :param statuses: dict of the status to wait for by resource name
+        """
+        def list_events(marker):
+            # heatclient has no marker, the events seen are skipped by the
+            # watcher
             try:
-                res = self.client.resources.get(
-                    stack_identifier, resource_name)
+                events = self.client.events.list(stack_identifier)
             except heat_exceptions.HTTPNotFound:
-                # ignore this, as the resource may not have
-                # been created yet
-                pass
-            else:
-                if res.resource_status == status:
-                    return
-                if fail_regexp.search(res.resource_status):
-                    raise exceptions.StackResourceBuildErrorException(
-                        resource_name=res.resource_name,
-                        stack_identifier=stack_identifier,
-                        resource_status=res.resource_status,
-                        resource_status_reason=res.resource_status_reason)
-            time.sleep(build_interval)
+                return []
+            return [event.to_dict() for event in events]
 
-        message = ('Resource %s failed to reach %s status within '
-                   'the required time (%s s).' %
-                   (res.resource_name, status, build_timeout))
-        raise exceptions.TimeoutException(message)
+        watcher = waiters.StackEventWatcher(
+            list_events, stack_identifier,
+            CONF.orchestration.build_interval,
+            CONF.orchestration.build_timeout)
+        watcher.wait_for(statuses, failure_pattern)
+        return watcher
+
+    def _wait_for_resource_status(self, stack_identifier, resource_name,
+                                  status, failure_pattern='^.*_FAILED$'):
+        """Waits for a Resource to reach a given status."""
+        self._wait_for_resources_status(stack_identifier,
+                                        {resource_name: status},
+                                        failure_pattern)
 
     def _wait_for_stack_status(self, stack_identifier, status,
                                failure_pattern='^.*_FAILED$'):
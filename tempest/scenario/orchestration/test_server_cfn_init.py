@@ -63,16 +63,12 @@ class CfnInitScenarioTest(manager.OrchestrationScenarioTest):
 
     def check_stack(self):
         sid = self.stack_identifier
-        self._wait_for_resource_status(
-            sid, 'WaitHandle', 'CREATE_COMPLETE')
-        self._wait_for_resource_status(
-            sid, 'SmokeSecurityGroup', 'CREATE_COMPLETE')
-        self._wait_for_resource_status(
-            sid, 'SmokeKeys', 'CREATE_COMPLETE')
-        self._wait_for_resource_status(
-            sid, 'CfnUser', 'CREATE_COMPLETE')
-        self._wait_for_resource_status(
-            sid, 'SmokeServer', 'CREATE_COMPLETE')
+        self._wait_for_resources_status(
+            sid, {'WaitHandle': 'CREATE_COMPLETE',
+                  'SmokeSecurityGroup': 'CREATE_COMPLETE',
+                  'SmokeKeys': 'CREATE_COMPLETE',
+                  'CfnUser': 'CREATE_COMPLETE',
+                  'SmokeServer': 'CREATE_COMPLETE'})
 
         server_resource = self.client.resources.get(sid, 'SmokeServer')
         server_id = server_resource.physical_resource_id
@@ -43,9 +43,8 @@ class TestLargeOpsScenario(manager.NetworkScenarioTest):
         super(TestLargeOpsScenario, cls).setUpClass()
 
     def _wait_for_server_status(self, status):
-        for server in self.servers:
-            self.status_timeout(
-                self.compute_client.servers, server.id, status)
+        self.status_timeouts(self.compute_client.servers,
+                             [server.id for server in self.servers], status)
 
     def nova_boot(self):
         name = data_utils.rand_name('scenario-server-')
@@ -59,14 +58,13 @@ class TestLargeOpsScenario(manager.NetworkScenarioTest):
             security_groups=[secgroup.name])
         # needed because of bug 1199788
         self.servers = [x for x in client.servers.list() if name in x.name]
-        for server in self.servers:
-            # after deleting all servers - wait for all servers to clear
-            # before cleanup continues
-            self.addCleanup(self.delete_timeout,
-                            self.compute_client.servers,
-                            server.id)
-        for server in self.servers:
-            self.addCleanup_with_wait(self.compute_client.servers, server.id)
+        # after deleting all servers - wait for all servers to clear
+        # before cleanup continues
+        self.addCleanup(self.delete_timeouts,
+                        self.compute_client.servers,
+                        [server.id for server in self.servers])
+        self.addCleanups_with_wait(self.compute_client.servers,
+                                   [server.id for server in self.servers])
         self._wait_for_server_status('ACTIVE')
 
     def _large_ops_scenario(self):
@@ -94,36 +94,41 @@ class TestLoadBalancerBasic(manager.NetworkScenarioTest):
             **rule)
 
     def _create_server(self, name):
-        keypair = self.create_keypair(name='keypair-%s' % name)
+        return self._create_servers([name])[0]
+
+    def _create_servers(self, names=('server1', 'server2')):
+        """Boot the servers together and wait for all of them at once."""
         security_groups = [self.security_group.name]
         net = self._list_networks(tenant_id=self.tenant_id)[0]
-        create_kwargs = {
-            'nics': [
-                {'net-id': net['id']},
-            ],
-            'key_name': keypair.name,
-            'security_groups': security_groups,
-        }
-        server = self.create_server(name=name,
-                                    create_kwargs=create_kwargs)
-        self.servers_keypairs[server.id] = keypair
-        if (config.network.public_network_id and not
-                config.network.tenant_networks_reachable):
-            public_network_id = config.network.public_network_id
-            floating_ip = self._create_floating_ip(
-                server, public_network_id)
-            self.floating_ips[floating_ip] = server
-            self.server_ips[server.id] = floating_ip.floating_ip_address
-        else:
-            self.server_ips[server.id] = server.networks[net['name']][0]
-        self.server_fixed_ips[server.id] = server.networks[net['name']][0]
+        specs = []
+        keypairs = []
+        for name in names:
+            keypair = self.create_keypair(name='keypair-%s' % name)
+            keypairs.append(keypair)
+            create_kwargs = {
+                'nics': [
+                    {'net-id': net['id']},
+                ],
+                'key_name': keypair.name,
+                'security_groups': security_groups,
+            }
+            specs.append(dict(name=name, create_kwargs=create_kwargs))
+        servers = self.create_servers(specs)
+        for server, keypair in zip(servers, keypairs):
+            self.servers_keypairs[server.id] = keypair
+            if (config.network.public_network_id and not
+                    config.network.tenant_networks_reachable):
+                public_network_id = config.network.public_network_id
+                floating_ip = self._create_floating_ip(
+                    server, public_network_id)
+                self.floating_ips[floating_ip] = server
+                self.server_ips[server.id] = floating_ip.floating_ip_address
+            else:
+                self.server_ips[server.id] = server.networks[net['name']][0]
+            self.server_fixed_ips[server.id] = (
+                server.networks[net['name']][0])
         self.assertTrue(self.servers_keypairs)
-        return server
-
-    def _create_servers(self):
-        for count in range(2):
-            self._create_server(name=("server%s" % (count + 1)))
-        self.assertEqual(len(self.servers_keypairs), 2)
+        return servers
 
     def _start_servers(self):
         """
@@ -13,9 +13,12 @@
 #    under the License.
 
 
+import hashlib
 import json
+import os
 import re
 import string
+import time
 import unicodedata
 
 import testscenarios
@@ -25,6 +28,7 @@ from tempest import auth
 from tempest import clients
 from tempest.common.utils import misc
 from tempest import config
+from tempest.openstack.common import lockutils
 
 CONF = config.CONF
 
@@ -43,9 +47,32 @@ class ImageUtils(object):
         ocm = clients.OfficialClientManager(
             auth.get_default_credentials('user'))
         self.client = ocm.compute_client
+        self._images = {}
+        self._flavors = {}
+
+    def _get_cached(self, cache, item_id, get):
+        # The items are got again once older than discovery_cache_ttl, they
+        # are kept as long as the process when it is 0
+        ttl = CONF.input_scenario.discovery_cache_ttl
+        now = time.time()
+        if item_id in cache:
+            fetched_at, item = cache[item_id]
+            if not ttl or now - fetched_at < ttl:
+                return item
+        item = get(item_id)
+        cache[item_id] = (now, item)
+        return item
+
+    def _get_image(self, image_id):
+        return self._get_cached(self._images, image_id,
+                                self.client.images.get)
+
+    def _get_flavor(self, flavor_id):
+        return self._get_cached(self._flavors, flavor_id,
+                                self.client.flavors.get)
 
     def ssh_user(self, image_id):
-        _image = self.client.images.get(image_id)
+        _image = self._get_image(image_id)
         for regex, user in self.ssh_users:
             # First match wins
             if re.match(regex, _image.name) is not None:
@@ -58,18 +85,66 @@ class ImageUtils(object):
                              string=str(image.name))
 
     def is_sshable_image(self, image_id):
-        _image = self.client.images.get(image_id)
+        _image = self._get_image(image_id)
         return self._is_sshable_image(_image)
 
     def _is_flavor_enough(self, flavor, image):
         return image.minDisk <= flavor.disk
 
     def is_flavor_enough(self, flavor_id, image_id):
-        _image = self.client.images.get(image_id)
-        _flavor = self.client.flavors.get(flavor_id)
+        _image = self._get_image(image_id)
+        _flavor = self._get_flavor(flavor_id)
         return self._is_flavor_enough(_flavor, _image)
 
 
+class DiscoveryCache(object):
+
+    """
+    Names and ids of the images and flavors listed for input scenarios,
+    stored as json files in the lock_path. The first worker lists them from
+    the cloud, the other ones reuse them until they are older than ttl.
+    """
+
+    def __init__(self, ttl, lock_path):
+        self.ttl = ttl
+        self.lock_path = lock_path
+        cloud = '%s:%s:%s' % (CONF.identity.uri, CONF.identity.username,
+                              CONF.identity.tenant_name)
+        self.name = 'input_scenario_%s' % hashlib.md5(cloud).hexdigest()
+
+    def _read(self, path):
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                return None
+            with open(path) as cache_file:
+                return json.load(cache_file)
+        except (OSError, IOError, ValueError):
+            return None
+
+    def _write(self, path, items):
+        tmp_path = '%s.%d' % (path, os.getpid())
+        with open(tmp_path, 'w') as cache_file:
+            json.dump(items, cache_file)
+        os.rename(tmp_path, path)
+
+    def get(self, kind, fetch):
+        """
+        :param kind: the kind of items cached, such as images or flavors
+        :param fetch: a callable returning a list of (name, id) of the items
+        :return: a list of (name, id) pairs
+        """
+        if not self.ttl or not self.lock_path:
+            return fetch()
+        name = '%s_%s' % (self.name, kind)
+        path = os.path.join(self.lock_path, name + '.json')
+        with lockutils.lock(name, external=True, lock_path=self.lock_path):
+            items = self._read(path)
+            if items is None:
+                items = [list(item) for item in fetch()]
+                self._write(path, items)
+        return items
+
+
 @misc.singleton
 class InputScenarioUtils(object):
 
@@ -104,6 +179,16 @@ class InputScenarioUtils(object):
         self.client = ocm.compute_client
         self.image_pattern = CONF.input_scenario.image_regex
         self.flavor_pattern = CONF.input_scenario.flavor_regex
+        self.cache = DiscoveryCache(CONF.input_scenario.discovery_cache_ttl,
+                                    CONF.lock_path)
+
+    def _list_images(self):
+        return [(i.name, i.id)
+                for i in self.client.images.list(detailed=False)]
+
+    def _list_flavors(self):
+        return [(f.name, f.id)
+                for f in self.client.flavors.list(detailed=False)]
 
     def _normalize_name(self, name):
         nname = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore')
@@ -118,10 +203,11 @@ class InputScenarioUtils(object):
         if not CONF.service_available.glance:
             return []
         if not hasattr(self, '_scenario_images'):
-            images = self.client.images.list(detailed=False)
+            images = self.cache.get('images', self._list_images)
             self._scenario_images = [
-                (self._normalize_name(i.name), dict(image_ref=i.id))
-                for i in images if re.search(self.image_pattern, str(i.name))
+                (self._normalize_name(name), dict(image_ref=image_id))
+                for name, image_id in images
+                if re.search(self.image_pattern, str(name))
             ]
         return self._scenario_images
 
@@ -131,10 +217,11 @@ class InputScenarioUtils(object):
         :return: a scenario with name and uuid of flavors
         """
         if not hasattr(self, '_scenario_flavors'):
-            flavors = self.client.flavors.list(detailed=False)
+            flavors = self.cache.get('flavors', self._list_flavors)
             self._scenario_flavors = [
-                (self._normalize_name(f.name), dict(flavor_ref=f.id))
-                for f in flavors if re.search(self.flavor_pattern, str(f.name))
+                (self._normalize_name(name), dict(flavor_ref=flavor_id))
+                for name, flavor_id in flavors
+                if re.search(self.flavor_pattern, str(name))
             ]
         return self._scenario_flavors
 
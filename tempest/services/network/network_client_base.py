@@ -57,6 +57,19 @@ resource_plural_map = {
 
 
 class NetworkClientBase(object):
+
+    # Prefixes of the dynamic methods and the name of the method building
+    # them for a given resource
+    _method_prefixes = (('list_', '_lister'),
+                        ('delete_', '_deleter'),
+                        ('show_', '_shower'),
+                        ('create_', '_creater'),
+                        ('update_', '_updater'))
+    # Cache of the (functor, resource) of the dynamic method names and of
+    # the uri of every resource
+    _method_table = {}
+    _uris = {}
+
     def __init__(self, auth_provider):
         self.rest_client = self.get_rest_client(
             auth_provider)
@@ -88,16 +101,20 @@ class NetworkClientBase(object):
         raise NotImplementedError
 
     def get_uri(self, plural_name):
-        # get service prefix from resource name
-        service_prefix = service_resource_prefix_map.get(
-            plural_name)
-        if plural_name not in hyphen_exceptions:
-            plural_name = plural_name.replace("_", "-")
-        if service_prefix:
-            uri = '%s/%s/%s' % (self.uri_prefix, service_prefix,
-                                plural_name)
-        else:
-            uri = '%s/%s' % (self.uri_prefix, plural_name)
+        key = (self.uri_prefix, plural_name)
+        uri = self._uris.get(key)
+        if uri is None:
+            # get service prefix from resource name
+            service_prefix = service_resource_prefix_map.get(
+                plural_name)
+            if plural_name not in hyphen_exceptions:
+                plural_name = plural_name.replace("_", "-")
+            if service_prefix:
+                uri = '%s/%s/%s' % (self.uri_prefix, service_prefix,
+                                    plural_name)
+            else:
+                uri = '%s/%s' % (self.uri_prefix, plural_name)
+            self._uris[key] = uri
         return uri
 
     def pluralize(self, resource_name):
@@ -105,8 +122,10 @@ class NetworkClientBase(object):
         return resource_plural_map.get(resource_name, resource_name + 's')
 
     def _lister(self, plural_name):
+        list_uri = self.get_uri(plural_name)
+
         def _list(**filters):
-            uri = self.get_uri(plural_name)
+            uri = list_uri
             if filters:
                 uri += '?' + urllib.urlencode(filters, doseq=1)
             resp, body = self.get(uri)
@@ -116,20 +135,22 @@ class NetworkClientBase(object):
         return _list
 
     def _deleter(self, resource_name):
+        resource_uri = self.get_uri(self.pluralize(resource_name))
+
         def _delete(resource_id):
-            plural = self.pluralize(resource_name)
-            uri = '%s/%s' % (self.get_uri(plural), resource_id)
+            uri = '%s/%s' % (resource_uri, resource_id)
             return self.delete(uri)
 
         return _delete
 
     def _shower(self, resource_name):
+        resource_uri = self.get_uri(self.pluralize(resource_name))
+
         def _show(resource_id, **fields):
             # fields is a dict which key is 'fields' and value is a
             # list of field's name. An example:
             # {'fields': ['id', 'name']}
-            plural = self.pluralize(resource_name)
-            uri = '%s/%s' % (self.get_uri(plural), resource_id)
+            uri = '%s/%s' % (resource_uri, resource_id)
             if fields:
                 uri += '?' + urllib.urlencode(fields, doseq=1)
             resp, body = self.get(uri)
@@ -139,20 +160,21 @@ class NetworkClientBase(object):
         return _show
 
     def _creater(self, resource_name):
+        resource_uri = self.get_uri(self.pluralize(resource_name))
+
         def _create(**kwargs):
-            plural = self.pluralize(resource_name)
-            uri = self.get_uri(plural)
             post_data = self.serialize({resource_name: kwargs})
-            resp, body = self.post(uri, post_data)
+            resp, body = self.post(resource_uri, post_data)
             body = self.deserialize_single(body)
             return resp, body
 
         return _create
 
     def _updater(self, resource_name):
+        resource_uri = self.get_uri(self.pluralize(resource_name))
+
         def _update(res_id, **kwargs):
-            plural = self.pluralize(resource_name)
-            uri = '%s/%s' % (self.get_uri(plural), res_id)
+            uri = '%s/%s' % (resource_uri, res_id)
             post_data = self.serialize({resource_name: kwargs})
             resp, body = self.put(uri, post_data)
             body = self.deserialize_single(body)
@@ -161,17 +183,21 @@ class NetworkClientBase(object):
         return _update
 
     def __getattr__(self, name):
-        method_prefixes = ["list_", "delete_", "show_", "create_", "update_"]
-        method_functors = [self._lister,
-                           self._deleter,
-                           self._shower,
-                           self._creater,
-                           self._updater]
-        for index, prefix in enumerate(method_prefixes):
-            prefix_len = len(prefix)
-            if name[:prefix_len] == prefix:
-                return method_functors[index](name[prefix_len:])
-        raise AttributeError(name)
+        method = self._method_table.get(name)
+        if method is None:
+            for prefix, functor in self._method_prefixes:
+                if name.startswith(prefix):
+                    method = (functor, name[len(prefix):])
+                    self._method_table[name] = method
+                    break
+            else:
+                raise AttributeError(name)
+        functor, resource = method
+        bound_method = getattr(self, functor)(resource)
+        # Keep the method on the instance, further lookups of the same name
+        # don't go through __getattr__ anymore
+        self.__dict__[name] = bound_method
+        return bound_method
 
     # Common methods that are hard to automate
     def create_bulk_network(self, count, names):
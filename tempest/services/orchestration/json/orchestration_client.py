@@ -19,6 +19,7 @@ import time
 import urllib
 
 from tempest.common import rest_client
+from tempest.common import waiters
 from tempest import config
 from tempest import exceptions
 
@@ -141,38 +142,43 @@ class OrchestrationClient(rest_client.RestClient):
         """Deletes the specified Stack."""
         return self.delete("stacks/%s" % str(stack_identifier))
 
-    def wait_for_resource_status(self, stack_identifier, resource_name,
-                                 status, failure_pattern='^.*_FAILED$'):
-        """Waits for a Resource to reach a given status."""
-        start = int(time.time())
-        fail_regexp = re.compile(failure_pattern)
-
-        while True:
+    def event_watcher(self, stack_identifier):
+        """Return a StackEventWatcher following the events of a stack."""
+        def list_events(marker):
+            params = {'sort_dir': 'asc'}
+            if marker:
+                params['marker'] = marker
             try:
-                resp, body = self.get_resource(
-                    stack_identifier, resource_name)
+                return self.list_events(stack_identifier, params)[1]
             except exceptions.NotFound:
-                # ignore this, as the resource may not have
-                # been created yet
-                pass
-            else:
-                resource_name = body['resource_name']
-                resource_status = body['resource_status']
-                if resource_status == status:
-                    return
-                if fail_regexp.search(resource_status):
-                    raise exceptions.StackResourceBuildErrorException(
-                        resource_name=resource_name,
-                        stack_identifier=stack_identifier,
-                        resource_status=resource_status,
-                        resource_status_reason=body['resource_status_reason'])
+                # The stack may not have been created yet, a marked listing
+                # fails for the watcher to list all the events instead
+                if marker:
+                    raise
+                return []
+
+        return waiters.StackEventWatcher(list_events, stack_identifier,
+                                         self.build_interval,
+                                         self.build_timeout)
+
+    def wait_for_resources_status(self, stack_identifier, statuses,
+                                  failure_pattern='^.*_FAILED$'):
+        """Waits for Resources to reach a given status.
+
+        :param statuses: dict of the status to wait for by resource name
+        :return: the StackEventWatcher, which records the transitions of
+            every resource
+        """
+        watcher = self.event_watcher(stack_identifier)
+        watcher.wait_for(statuses, failure_pattern)
+        return watcher
 
-            if int(time.time()) - start >= self.build_timeout:
-                message = ('Resource %s failed to reach %s status within '
-                           'the required time (%s s).' %
-                           (resource_name, status, self.build_timeout))
-                raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+    def wait_for_resource_status(self, stack_identifier, resource_name,
+                                 status, failure_pattern='^.*_FAILED$'):
+        """Waits for a Resource to reach a given status."""
+        self.wait_for_resources_status(stack_identifier,
+                                       {resource_name: status},
+                                       failure_pattern)
 
     def wait_for_stack_status(self, stack_identifier, status,
                               failure_pattern='^.*_FAILED$'):
@@ -211,9 +217,11 @@ class OrchestrationClient(rest_client.RestClient):
         body = json.loads(body)
         return resp, body['metadata']
 
-    def list_events(self, stack_identifier):
+    def list_events(self, stack_identifier, params=None):
         """Returns list of all events for a stack."""
         url = 'stacks/{stack_identifier}/events'.format(**locals())
+        if params:
+            url += '?%s' % urllib.urlencode(params)
         resp, body = self.get(url)
         body = json.loads(body)
         return resp, body['events']
@@ -138,8 +138,10 @@ class QueuingClientJSON(rest_client.RestClient):
                                extra_headers=True,
                                headers=self.headers)
 
-        body = json.loads(body)
-        self.validate_response(queues_schema.claim_messages, resp, body)
+        # There is nothing to claim when the queue is empty
+        if resp['status'] != '204':
+            body = json.loads(body)
+            self.validate_response(queues_schema.claim_messages, resp, body)
         return resp, body
 
     def query_claim(self, claim_uri):
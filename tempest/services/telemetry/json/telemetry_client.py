@@ -13,10 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json as std_json
+import re
+
 from tempest.common import rest_client
 from tempest.openstack.common import jsonutils as json
 import tempest.services.telemetry.telemetry_client_base as client
 
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
 
 class TelemetryClientJSON(client.TelemetryClientBase):
 
@@ -26,6 +31,27 @@ class TelemetryClientJSON(client.TelemetryClientBase):
     def deserialize(self, body):
         return json.loads(body.replace("\n", ""))
 
+    def deserialize_iter(self, body):
+        """Decode the items of a json list one at a time."""
+        # strict=False accepts the newlines deserialize strips out
+        decoder = std_json.JSONDecoder(strict=False)
+        idx = WHITESPACE.match(body).end()
+        if body[idx:idx + 1] != '[':
+            raise ValueError("Expected a json list: %s" % body[:80])
+        idx = WHITESPACE.match(body, idx + 1).end()
+        if body[idx:idx + 1] == ']':
+            return
+        while True:
+            item, idx = decoder.raw_decode(body, idx)
+            yield item
+            idx = WHITESPACE.match(body, idx).end()
+            if body[idx:idx + 1] == ']':
+                return
+            if body[idx:idx + 1] != ',':
+                raise ValueError("Expected ',' at %d: %s" %
+                                 (idx, body[idx:idx + 80]))
+            idx = WHITESPACE.match(body, idx + 1).end()
+
     def serialize(self, body):
         return json.dumps(body)
 
@@ -90,17 +90,42 @@ class TelemetryClientBase(object):
             body = self.deserialize(body)
         return resp, body
 
-    def helper_list(self, uri, query=None, period=None):
-        uri_dict = {}
-        if query:
-            uri_dict = {'q.field': query[0],
-                        'q.op': query[1],
-                        'q.value': query[2]}
+    def deserialize_iter(self, body):
+        """
+        :param body: serialized list
+        :return: iterator over the deserialized items of the list
+        """
+        return iter(self.deserialize(body))
+
+    @staticmethod
+    def _query_params(query):
+        """
+        :param query: (field, op, value) triple, or list of triples which
+            must all match
+        :return: list of the q.field/q.op/q.value params of the query
+        """
+        if not query:
+            return []
+        if isinstance(query[0], six.string_types):
+            query = [query]
+        params = []
+        for field, op, value in query:
+            params.extend([('q.field', field), ('q.op', op),
+                           ('q.value', value)])
+        return params
+
+    def _list_uri(self, uri, query=None, period=None, limit=None):
+        params = self._query_params(query)
         if period:
-            uri_dict['period'] = period
-        if uri_dict:
-            uri += "?%s" % urllib.urlencode(uri_dict)
-        return self.get(uri)
+            params.append(('period', period))
+        if limit:
+            params.append(('limit', limit))
+        if params:
+            uri += "?%s" % urllib.urlencode(params)
+        return uri
+
+    def helper_list(self, uri, query=None, period=None, limit=None):
+        return self.get(self._list_uri(uri, query, period, limit))
 
     def list_resources(self, query=None):
         uri = '%s/resources' % self.uri_prefix
@@ -118,9 +143,54 @@ class TelemetryClientBase(object):
         uri = "%s/meters/%s/statistics" % (self.uri_prefix, meter)
         return self.helper_list(uri, query, period)
 
-    def list_samples(self, meter_id, query=None):
+    def list_samples(self, meter_id, query=None, limit=None):
         uri = '%s/meters/%s' % (self.uri_prefix, meter_id)
-        return self.helper_list(uri, query)
+        return self.helper_list(uri, query, limit=limit)
+
+    def iter_samples(self, meter_id, query=None, page_size=1000):
+        """
+        Yield the samples of a meter, newest first, a page at a time.
+
+        The API has no marker, so every page after the first one asks for
+        the samples not newer than the last sample returned, skipping the
+        ones already returned. Only one page is held in memory and its
+        samples are decoded as they are yielded.
+
+        :param query: same as for list_samples
+        :param page_size: number of samples fetched per request
+        """
+        uri = '%s/meters/%s' % (self.uri_prefix, meter_id)
+        if query and isinstance(query[0], six.string_types):
+            query = [query]
+        query = list(query or [])
+        limit = page_size
+        last_timestamp = None
+        # message ids of the samples returned with the last timestamp
+        last_ids = set()
+        while True:
+            page_query = list(query)
+            if last_timestamp is not None:
+                page_query.append(('timestamp', 'le', last_timestamp))
+            resp, body = self.rest_client.get(
+                self._list_uri(uri, page_query, limit=limit))
+            count = 0
+            new = 0
+            for sample in self.deserialize_iter(body):
+                count += 1
+                timestamp = sample['timestamp']
+                if timestamp != last_timestamp:
+                    last_timestamp = timestamp
+                    last_ids = set()
+                elif sample['message_id'] in last_ids:
+                    continue
+                last_ids.add(sample['message_id'])
+                new += 1
+                yield sample
+            if count < limit:
+                return
+            # When a whole page had the same timestamp and was already
+            # returned, get a larger one to get past it
+            limit = page_size if new else limit * 2
 
     def get_resource(self, resource_id):
         uri = '%s/resources/%s' % (self.uri_prefix, resource_id)
@@ -10,9 +10,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import socket
-import subprocess
-
+from tempest.common import prober
 from tempest.common.utils import data_utils
 from tempest import config
 import tempest.stress.stressaction as stressaction
@@ -23,50 +21,25 @@ CONF = config.CONF
 
 class FloatingStress(stressaction.StressAction):
 
-    # from the scenario manager
-    def ping_ip_address(self, ip_address):
-        cmd = ['ping', '-c1', '-w1', ip_address]
-
-        proc = subprocess.Popen(cmd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        proc.wait()
-        success = proc.returncode == 0
-        return success
-
-    def tcp_connect_scan(self, addr, port):
-        # like tcp
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            s.connect((addr, port))
-        except socket.error as exc:
-            self.logger.info("%s(%s): %s", self.server_id, self.floating['ip'],
-                             str(exc))
-            return False
-        self.logger.info("%s(%s): Connected :)", self.server_id,
-                         self.floating['ip'])
-        s.close()
-        return True
-
     def check_port_ssh(self):
-        def func():
-            return self.tcp_connect_scan(self.floating['ip'], 22)
-        if not tempest.test.call_until_true(func, self.check_timeout,
-                                            self.check_interval):
+        ip = self.floating['ip']
+        seconds = prober.probe([ip], port=22, timeout=self.check_timeout,
+                               interval=self.check_interval)[ip]
+        if seconds is None:
             raise RuntimeError("Cannot connect to the ssh port.")
+        self.logger.info("%s(%s): Connected after %.1fs :)", self.server_id,
+                         ip, seconds)
 
     def check_icmp_echo(self):
-        self.logger.info("%s(%s): Pinging..",
-                         self.server_id, self.floating['ip'])
-
-        def func():
-            return self.ping_ip_address(self.floating['ip'])
-        if not tempest.test.call_until_true(func, self.check_timeout,
-                                            self.check_interval):
+        ip = self.floating['ip']
+        self.logger.info("%s(%s): Pinging..", self.server_id, ip)
+        seconds = prober.probe([ip], timeout=self.check_timeout,
+                               interval=self.check_interval)[ip]
+        if seconds is None:
             raise RuntimeError("%s(%s): Cannot ping the machine.",
-                               self.server_id, self.floating['ip'])
-        self.logger.info("%s(%s): pong :)",
-                         self.server_id, self.floating['ip'])
+                               self.server_id, ip)
+        self.logger.info("%s(%s): pong after %.1fs :)", self.server_id, ip,
+                         seconds)
 
     def _create_vm(self):
         self.name = name = data_utils.rand_name("instance")
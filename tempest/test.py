@@ -15,6 +15,7 @@
 
 import atexit
 import functools
+import hashlib
 import json
 import os
 import re
@@ -31,6 +32,7 @@ import testtools
 from tempest import clients
 import tempest.common.generator.valid_generator as valid
 from tempest.common import isolated_creds
+from tempest.common import rate_limiter
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import importutils
@@ -306,6 +308,17 @@ class BaseTestCase(BaseDeps):
             self.useFixture(fixtures.LoggerFixture(nuke_handlers=False,
                                                    format=self.log_format,
                                                    level=None))
+        rate_limiter.pop_throttled_time()
+        self.addCleanup(self._log_throttled_time)
+
+    def _log_throttled_time(self):
+        throttled = rate_limiter.pop_throttled_time()
+        if throttled:
+            LOG.info("%s was throttled for %.2fs: %s" % (
+                self.id(), sum(throttled.values()),
+                ', '.join('%s %s %.2fs' % (service, method, seconds)
+                          for (service, method), seconds
+                          in sorted(throttled.items()))))
 
     @classmethod
     def get_client_manager(cls, interface=None):
@@ -388,6 +401,13 @@ class BaseTestCase(BaseDeps):
 class NegativeAutoTest(BaseTestCase):
 
     _resources = {}
+    # Generated scenarios and valid templates keyed on a hash of the schema
+    # they are generated from
+    _scenarios = {}
+    _valid_templates = {}
+    # Responses to the requests sent in batch mode, keyed on the test class
+    # and the request arguments
+    _batch_responses = {}
 
     @classmethod
     def setUpClass(cls):
@@ -459,11 +479,68 @@ class NegativeAutoTest(BaseTestCase):
                 create invalid data for the api calls. For "GET" and "HEAD",
                 the data is used to generate query strings appended to the url,
                 otherwise for the body of the http call.
+
+        The generated scenarios are cached, keyed on a hash of the
+        description, in memory and in CONF.negative.scenario_cache_path if it
+        is set.
         """
         description = NegativeAutoTest.load_schema(description)
+        generator_class = CONF.negative.test_generator
+        key = NegativeAutoTest._schema_hash(generator_class, description)
+        scenario_list = NegativeAutoTest._scenarios.get(key)
+        if scenario_list is None:
+            scenario_list = NegativeAutoTest._load_scenario(key)
+        if scenario_list is None:
+            scenario_list = NegativeAutoTest._generate_scenario(
+                generator_class, description)
+            NegativeAutoTest._save_scenario(key, scenario_list)
+        NegativeAutoTest._scenarios[key] = scenario_list
+        return list(scenario_list)
+
+    @staticmethod
+    def _schema_hash(*args):
+        return hashlib.sha1(json.dumps(args, sort_keys=True)).hexdigest()
+
+    @staticmethod
+    def _scenario_path(key):
+        cache_path = CONF.negative.scenario_cache_path
+        if cache_path:
+            return os.path.join(cache_path, 'negative_%s.json' % key)
+
+    @staticmethod
+    def _load_scenario(key):
+        path = NegativeAutoTest._scenario_path(key)
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path) as scenario_file:
+                scenarios = json.load(scenario_file)
+        except (IOError, ValueError):
+            LOG.warning("Ignoring invalid scenario cache file %s" % path)
+            return None
+        scenario_list = []
+        for name, attrs in scenarios:
+            if attrs.get("resource") is not None:
+                attrs["resource"] = tuple(attrs["resource"])
+            scenario_list.append((str(name), attrs))
+        return scenario_list
+
+    @staticmethod
+    def _save_scenario(key, scenario_list):
+        path = NegativeAutoTest._scenario_path(key)
+        if path is None:
+            return
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        tmp_path = '%s.%d' % (path, os.getpid())
+        with open(tmp_path, 'w') as scenario_file:
+            json.dump(scenario_list, scenario_file)
+        os.rename(tmp_path, path)
+
+    @staticmethod
+    def _generate_scenario(generator_class, description):
         LOG.debug(description)
-        generator = importutils.import_class(
-            CONF.negative.test_generator)()
+        generator = importutils.import_class(generator_class)()
         generator.validate_schema(description)
         schema = description.get("json-schema", None)
         resources = description.get("resources", [])
@@ -517,36 +594,86 @@ class NegativeAutoTest(BaseTestCase):
         description = NegativeAutoTest.load_schema(description)
         LOG.info("Executing %s" % description["name"])
         LOG.debug(description)
+        scenario = dict((attr, getattr(self, attr))
+                        for attr in ("resource", "schema")
+                        if hasattr(self, attr))
+        request = self._request_arguments(description, scenario)
+
+        if "admin_client" in description and description["admin_client"]:
+            client = self.admin_client
+        else:
+            client = self.client
+        if CONF.negative.batch_requests:
+            resp, resp_body = self._batch_response(description, client,
+                                                   request)
+        else:
+            resp, resp_body = client.send_request(*request)
+        self._check_negative_response(resp.status, resp_body)
+
+    def _request_arguments(self, description, scenario):
+        """
+        Returns the method, url template, resources and body of the request
+        of a scenario, given as a dict of its attributes.
+        """
         method = description["http-method"]
         url = description["url"]
+        invalid_resource = scenario.get("resource")
 
-        resources = [self.get_resource(r) for
+        resources = [self._get_resource(r, invalid_resource) for
                      r in description.get("resources", [])]
 
-        if hasattr(self, "resource"):
+        if invalid_resource is not None:
             # Note(mkoderer): The resources list already contains an invalid
             # entry (see get_resource).
             # We just send a valid json-schema with it
             valid_schema = None
             schema = description.get("json-schema", None)
             if schema:
-                valid_schema = \
-                    valid.ValidTestGenerator().generate_valid(schema)
+                valid_schema = NegativeAutoTest.valid_template(schema)
             new_url, body = self._http_arguments(valid_schema, url, method)
-        elif hasattr(self, "schema"):
-            new_url, body = self._http_arguments(self.schema, url, method)
+        elif "schema" in scenario:
+            new_url, body = self._http_arguments(scenario["schema"], url,
+                                                 method)
         else:
             raise Exception("testscenarios are not active. Please make sure "
                             "that your test runner supports the load_tests "
                             "mechanism")
+        return method, new_url, tuple(resources), body
 
-        if "admin_client" in description and description["admin_client"]:
-            client = self.admin_client
-        else:
-            client = self.client
-        resp, resp_body = client.send_request(method, new_url,
-                                              resources, body=body)
-        self._check_negative_response(resp.status, resp_body)
+    def _batch_response(self, description, client, request):
+        """
+        Returns the response to a request, sending the requests of all the
+        scenarios of the description concurrently the first time one of them
+        is needed.
+        """
+        key = (self.__class__, request)
+        if key not in self._batch_responses:
+            requests = [
+                self._request_arguments(description, scenario)
+                for _, scenario in self.generate_scenario(description)]
+            LOG.info("Sending %d requests of %s in batch" %
+                     (len(requests), description["name"]))
+            responses = client.send_requests(
+                requests, CONF.negative.batch_concurrency)
+            for scenario_request, response in zip(requests, responses):
+                self._batch_responses[(self.__class__,
+                                       scenario_request)] = response
+        response = self._batch_responses[key]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    @staticmethod
+    def valid_template(schema):
+        """
+        Returns a valid json dictionary for a json-schema, generated only
+        once per schema.
+        """
+        key = NegativeAutoTest._schema_hash(schema)
+        if key not in NegativeAutoTest._valid_templates:
+            NegativeAutoTest._valid_templates[key] = \
+                valid.ValidTestGenerator().generate_valid(schema)
+        return NegativeAutoTest._valid_templates[key]
 
     def _http_arguments(self, json_dict, url, method):
         LOG.debug("dict: %s url: %s method: %s" % (json_dict, url, method))
@@ -587,12 +714,15 @@ class NegativeAutoTest(BaseTestCase):
         :param name: The name of the kind of resource such as "flavor", "role",
             etc.
         """
+        return self._get_resource(name, getattr(self, "resource", None))
+
+    def _get_resource(self, name, invalid_resource):
         if isinstance(name, dict):
             name = name['name']
-        if hasattr(self, "resource") and self.resource[0] == name:
+        if invalid_resource is not None and invalid_resource[0] == name:
             LOG.debug("Return invalid resource (%s) value: %s" %
-                      (self.resource[0], self.resource[1]))
-            return self.resource[1]
+                      (invalid_resource[0], invalid_resource[1]))
+            return invalid_resource[1]
         if name in self._resources:
             return self._resources[name]
         return None
@@ -0,0 +1,198 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cache of the test ids found by test discovery.
+
+Discovering the tempest tests imports every test module, and some of them
+query the cloud to build their scenarios. The manifest records which test
+ids every module produced, keyed on a fingerprint of the source tree, so
+that listing the tests does not need to import anything and a worker only
+needs to import the modules holding the tests of its load list.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+if sys.version_info >= (2, 7):
+    import unittest
+else:
+    import unittest2 as unittest
+
+MANIFEST_VERSION = 1
+
+# Files outside of the python sources the discovered test ids depend on
+_EXTRA_SOURCES = [('etc', 'schemas')]
+
+
+def _config_file(base_path):
+    conf_dir = os.environ.get('TEMPEST_CONFIG_DIR',
+                              os.path.join(base_path, 'etc'))
+    conf_file = os.environ.get('TEMPEST_CONFIG', 'tempest.conf')
+    return os.path.join(conf_dir, conf_file)
+
+
+def _stat_entry(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return '%s:missing' % path
+    return '%s:%r:%d' % (path, st.st_mtime, st.st_size)
+
+
+def source_fingerprint(base_path):
+    """Return a hash of the mtime and size of the files tests depend on."""
+    digest = hashlib.sha1()
+    roots = [os.path.join(base_path, 'tempest')]
+    roots.extend(os.path.join(base_path, *extra) for extra in _EXTRA_SOURCES)
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames
+                                 if not d.startswith(('.', '__')))
+            for filename in sorted(filenames):
+                if filename.endswith(('.py', '.json')):
+                    path = os.path.join(dirpath, filename)
+                    digest.update(_stat_entry(path))
+    digest.update(_stat_entry(_config_file(base_path)))
+    return digest.hexdigest()
+
+
+class ManifestTest(unittest.TestCase):
+    """Stand-in for a test which is only known by its id."""
+
+    def __init__(self, test_id):
+        super(ManifestTest, self).__init__()
+        self._test_id = test_id
+
+    def id(self):
+        return self._test_id
+
+    def runTest(self):
+        self.fail("%s was listed from the test manifest and can't be run, "
+                  "use --load-list to run it" % self._test_id)
+
+
+class TestManifest(object):
+    """A json file mapping every test module to the test ids it holds."""
+
+    def __init__(self, path, fingerprint, pattern=None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.pattern = pattern
+        self.modules = None
+
+    def load(self):
+        """Load the manifest, return False if it is missing or stale."""
+        try:
+            with open(self.path) as manifest_file:
+                data = json.load(manifest_file)
+        except (IOError, ValueError):
+            return False
+        if (data.get('version') != MANIFEST_VERSION or
+                data.get('fingerprint') != self.fingerprint or
+                data.get('pattern') != self.pattern):
+            return False
+        self.modules = [(module, ids) for module, ids in data['modules']]
+        return True
+
+    def save(self, suite):
+        """Record the test ids of a discovered suite.
+
+        Nothing is recorded when some modules failed to import, so that the
+        import errors keep being reported until they are fixed.
+        """
+        modules = []
+        ids_by_module = {}
+        for test in _iterate_tests(suite):
+            module = test.__class__.__module__
+            if not module.startswith('tempest.'):
+                return False
+            if module not in ids_by_module:
+                ids_by_module[module] = []
+                modules.append((module, ids_by_module[module]))
+            ids_by_module[module].append(test.id())
+        data = {'version': MANIFEST_VERSION,
+                'fingerprint': self.fingerprint,
+                'pattern': self.pattern,
+                'modules': modules}
+        # Workers may rebuild the manifest at the same time, write it
+        # aside and rename it so that readers never see a partial file
+        tmp_path = '%s.%d' % (self.path, os.getpid())
+        with open(tmp_path, 'w') as manifest_file:
+            json.dump(data, manifest_file)
+        os.rename(tmp_path, self.path)
+        self.modules = modules
+        return True
+
+    def placeholder_suite(self):
+        """Return a suite of stand-in tests, good enough for --list."""
+        suite = unittest.TestSuite()
+        for module, ids in self.modules:
+            suite.addTests(ManifestTest(test_id) for test_id in ids)
+        return suite
+
+    def modules_for(self, test_ids):
+        """Return the modules holding the given test ids.
+
+        None is returned if some of the ids are unknown to the manifest.
+        """
+        module_by_id = {}
+        for module, ids in self.modules:
+            for test_id in ids:
+                module_by_id[test_id] = module
+        needed = []
+        for test_id in test_ids:
+            module = module_by_id.get(test_id)
+            if module is None:
+                return None
+            if module not in needed:
+                needed.append(module)
+        return needed
+
+
+def _iterate_tests(suite):
+    if isinstance(suite, unittest.TestSuite):
+        for test in suite:
+            for sub_test in _iterate_tests(test):
+                yield sub_test
+    else:
+        yield suite
+
+
+def load_modules(loader, modules):
+    """Build a suite importing only the given test modules."""
+    suite = unittest.TestSuite()
+    for name in modules:
+        __import__(name)
+        suite.addTests(loader.loadTestsFromModule(sys.modules[name]))
+    return suite
+
+
+def runner_options(argv):
+    """Return whether the runner lists tests and the ids it should load."""
+    listing = '--list' in argv
+    load_list = None
+    for i, arg in enumerate(argv):
+        if arg == '--load-list' and i + 1 < len(argv):
+            load_list = argv[i + 1]
+        elif arg.startswith('--load-list='):
+            load_list = arg.split('=', 1)[1]
+    if load_list is None:
+        return listing, None
+    with open(load_list) as id_file:
+        ids = [line.strip() for line in id_file if line.strip()]
+    return listing, ids
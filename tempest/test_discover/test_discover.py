@@ -14,22 +14,59 @@
 
 import os
 import sys
+import time
 
 if sys.version_info >= (2, 7):
     import unittest
 else:
     import unittest2 as unittest
 
+from tempest.test_discover import manifest as test_manifest
 
-def load_tests(loader, tests, pattern):
+TEST_DIRS = ['./tempest/api', './tempest/cli', './tempest/scenario',
+             './tempest/thirdparty']
+
+
+def discover(loader, base_path, pattern):
     suite = unittest.TestSuite()
-    base_path = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
-    base_path = os.path.split(base_path)[0]
-    for test_dir in ['./tempest/api', './tempest/cli', './tempest/scenario',
-                     './tempest/thirdparty']:
+    for test_dir in TEST_DIRS:
         if not pattern:
             suite.addTests(loader.discover(test_dir, top_level_dir=base_path))
         else:
             suite.addTests(loader.discover(test_dir, pattern=pattern,
                            top_level_dir=base_path))
     return suite
+
+
+def load_tests(loader, tests, pattern):
+    start = time.time()
+    base_path = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+    base_path = os.path.split(base_path)[0]
+    # The manifest is only used when TEMPEST_TEST_MANIFEST points to the
+    # file it should be stored in.
+    manifest_path = os.environ.get('TEMPEST_TEST_MANIFEST')
+    manifest = None
+    suite = None
+    mode = 'discovery'
+    if manifest_path:
+        manifest = test_manifest.TestManifest(
+            manifest_path, test_manifest.source_fingerprint(base_path),
+            pattern)
+        if manifest.load():
+            listing, load_list = test_manifest.runner_options(sys.argv)
+            if listing:
+                suite = manifest.placeholder_suite()
+                mode = 'manifest listing'
+            elif load_list is not None:
+                modules = manifest.modules_for(load_list)
+                if modules is not None:
+                    suite = test_manifest.load_modules(loader, modules)
+                    mode = 'manifest loading of %d modules' % len(modules)
+    if suite is None:
+        suite = discover(loader, base_path, pattern)
+        if manifest is not None:
+            manifest.save(suite)
+    if os.environ.get('TEMPEST_DISCOVER_TIMING'):
+        sys.stderr.write("Tests loaded by %s in %.3fs\n" %
+                         (mode, time.time() - start))
+    return suite
@@ -16,8 +16,10 @@ import mock
 import testtools
 
 from tempest import cli
+from tempest import config
 from tempest import exceptions
 from tempest.tests import base
+from tempest.tests import fake_config
 
 
 class TestMinClientVersion(base.TestCase):
@@ -57,3 +59,69 @@ class TestMinClientVersion(base.TestCase):
         # Tests that an exception is raised if the command output is empty.
         self.assertRaises(exceptions.TempestException,
                           cli.check_client_version, 'nova', '2.18.0')
+
+
+class TestExecuteCache(base.TestCase):
+
+    def setUp(self):
+        super(TestExecuteCache, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.patch('tempest.cli._CACHE', new={})
+        self.patch('tempest.cli.COMMAND_TIMES', new={})
+        self.popen = self.patch('subprocess.Popen')
+        self.popen.return_value.communicate.return_value = ('out', 'err')
+        self.popen.return_value.returncode = 0
+
+    def test_execute_without_cache(self):
+        cli.execute('nova', 'list')
+        cli.execute('nova', 'list')
+        self.assertEqual(2, self.popen.call_count)
+        self.assertEqual(2, len(cli.COMMAND_TIMES['nova list']))
+
+    def test_execute_with_cache(self):
+        self.assertEqual('out', cli.execute('nova', 'list', cache=True))
+        self.assertEqual('out', cli.execute('nova', 'list', cache=True))
+        cli.execute('nova', 'list', params='--all-tenants 1', cache=True)
+        self.assertEqual(2, self.popen.call_count)
+
+    def test_failure_is_not_cached(self):
+        self.popen.return_value.returncode = 1
+        for i in range(2):
+            self.assertRaises(exceptions.CommandFailed, cli.execute,
+                              'nova', 'list', cache=True)
+        self.assertEqual(2, self.popen.call_count)
+        self.popen.return_value.returncode = 0
+        self.assertEqual('out', cli.execute('nova', 'list', cache=True))
+        self.assertEqual('out', cli.execute('nova', 'list', cache=True))
+        self.assertEqual(3, self.popen.call_count)
+
+    def test_execute_many_failure_is_not_cached(self):
+        self.popen.return_value.returncode = 1
+        cli.execute_many([('nova', 'list', '', '', False)], 4)
+        self.assertEqual('out', cli.execute('nova', 'list', fail_ok=True,
+                                            cache=True))
+        self.assertEqual(2, self.popen.call_count)
+
+    def test_execute_many(self):
+        cli.execute('nova', 'list', cache=True)
+        cli.execute_many([('nova', 'list', '', '', False),
+                          ('nova', 'flavor-list', '', '', False),
+                          ('nova', 'flavor-list', '', '', False),
+                          ('nova', 'flavor-list', '', '', True)], 4)
+        self.assertEqual(3, self.popen.call_count)
+        cli.execute('nova', 'flavor-list', cache=True)
+        cli.execute('nova', 'flavor-list', merge_stderr=True, cache=True)
+        self.assertEqual(3, self.popen.call_count)
+
+    def test_prefetch_output(self):
+        execute_many = self.patch('tempest.cli.execute_many')
+        client_test = cli.ReadOnlyClientTestBase('setUp')
+        client_test.prefetch_output([('nova', ('list',), {}),
+                                     ('keystone', ('catalog',),
+                                      {'flags': '--debug'})])
+        calls = execute_many.call_args[0][0]
+        self.assertEqual(['nova', 'keystone'], [c[0] for c in calls])
+        self.assertEqual(['list', 'catalog'], [c[1] for c in calls])
+        self.assertIn('--debug', calls[1][2])
+        self.assertFalse(self.popen.called)
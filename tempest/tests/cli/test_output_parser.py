@@ -175,3 +175,22 @@ class TestOutputParser(base.TestCase):
                                                 with_label=True)
         self.assertIsInstance(actual, list)
         self.assertEqual(expected, actual)
+
+    def test_table_with_separator_in_value(self):
+        output_lines = """
++----+-------+
+| ID | Name  |
++----+-------+
+| 11 | a | b |
++----+-------+
+"""
+        expected = {'headers': ['ID', 'Name'], 'values': [['11', 'a | b']]}
+        self.assertEqual(expected, output_parser.table(output_lines))
+
+    def test_tables_without_end_of_table(self):
+        output_lines = 'test' + self.OUTPUT_LINES + 'test2' +\
+            self.OUTPUT_LINES2.rstrip('\n').rsplit('\n', 1)[0]
+        expected = [{'headers': self.EXPECTED_TABLE['headers'],
+                     'label': 'test',
+                     'values': self.EXPECTED_TABLE['values']}]
+        self.assertEqual(expected, output_parser.tables(output_lines))
@@ -0,0 +1,124 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from tempest.cmd import javelin
+from tempest import config
+from tempest import exceptions
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+class TestRunTasks(base.TestCase):
+
+    def setUp(self):
+        super(TestRunTasks, self).setUp()
+        self.patch('tempest.cmd.javelin.LOG')
+        self.order = []
+        self.lock = threading.Lock()
+
+    def _task(self, name, result=None):
+        def task():
+            with self.lock:
+                self.order.append(name)
+            return result
+        return task
+
+    def test_dependencies_run_first(self):
+        tasks = [(('servers', 'vm'), self._task('vm', 'vm_id'),
+                  [('users', 'bob'), ('images', 'cirros')]),
+                 (('images', 'cirros'), self._task('cirros'),
+                  [('users', 'bob')]),
+                 (('users', 'bob'), self._task('bob'),
+                  [('tenants', 'missing')])]
+        results = javelin.run_tasks(tasks, jobs=4)
+        self.assertEqual(['bob', 'cirros', 'vm'], self.order)
+        self.assertEqual('vm_id', results[('servers', 'vm')])
+
+    def test_independent_tasks_run_concurrently(self):
+        barrier = threading.Event()
+        started = []
+
+        def task(name):
+            def run():
+                started.append(name)
+                if len(started) == 2:
+                    barrier.set()
+                self.assertTrue(barrier.wait(5))
+            return run
+
+        javelin.run_tasks([(('images', 'a'), task('a'), []),
+                           (('images', 'b'), task('b'), [])], jobs=2)
+        self.assertEqual(['a', 'b'], sorted(started))
+
+    def test_failure_stops_dependent_tasks(self):
+        def fail():
+            raise ValueError()
+
+        tasks = [(('users', 'bob'), fail, []),
+                 (('images', 'cirros'), self._task('cirros'),
+                  [('users', 'bob')])]
+        self.assertRaises(ValueError, javelin.run_tasks, tasks, 2)
+        self.assertEqual([], self.order)
+
+    def test_circular_dependencies(self):
+        tasks = [(('users', 'a'), self._task('a'), [('users', 'b')]),
+                 (('users', 'b'), self._task('b'), [('users', 'a')])]
+        self.assertRaises(ValueError, javelin.run_tasks, tasks, 2)
+
+    def test_reverse_tasks(self):
+        tasks = [(('images', 'cirros'), self._task('cirros'), []),
+                 (('servers', 'vm'), self._task('vm'),
+                  [('images', 'cirros')])]
+        javelin.run_tasks(javelin.reverse_tasks(tasks))
+        self.assertEqual(['vm', 'cirros'], self.order)
+
+
+class TestWaitForServers(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitForServers, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.patch('tempest.cmd.javelin.LOG')
+        self.patch('time.sleep')
+        self.client = mock.Mock()
+        self.patch('tempest.cmd.javelin.client_for_user',
+                   return_value=self.client)
+
+    def _listings(self, *listings):
+        self.client.servers.list_servers_with_detail.side_effect = [
+            (None, {'servers': [{'id': server_id, 'status': status}
+                                for server_id, status in listing]})
+            for listing in listings]
+
+    def test_wait_for_active(self):
+        self._listings([('a', 'BUILD'), ('b', 'ACTIVE')],
+                       [('a', 'ACTIVE'), ('b', 'ACTIVE')])
+        javelin.wait_for_servers([('bob', 'a'), ('bob', 'b')], 'ACTIVE')
+        self.assertEqual(
+            2, self.client.servers.list_servers_with_detail.call_count)
+
+    def test_wait_for_deletion(self):
+        self._listings([('a', 'ERROR')], [])
+        javelin.wait_for_servers([('bob', 'a'), ('bob', 'b')], None)
+
+    def test_boot_error(self):
+        self._listings([('a', 'ERROR')])
+        self.assertRaises(exceptions.BuildErrorException,
+                          javelin.wait_for_servers, [('bob', 'a')], 'ACTIVE')
@@ -397,3 +397,71 @@ class TestDiscovery(base.TestCase):
         self.assertIn('extensions', results['swift'])
         self.assertEqual(['not_fake', 'fake1', 'fake2'],
                          results['swift']['extensions'])
+
+
+class TestConcurrentDiscovery(base.TestCase):
+
+    def setUp(self):
+        super(TestConcurrentDiscovery, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.fake_os = mock.MagicMock()
+        self.fake_os.endpoints_client.list_endpoints.return_value = (None, [
+            {'service_id': 'nova_id', 'region': 'r1'},
+            {'service_id': 'nova_id', 'region': 'r1'},
+            {'service_id': 'glance_id', 'region': 'r2'}])
+        self.fake_os.service_client.get_service.side_effect = (
+            lambda service_id: (None, {'type': service_id[:-3]}))
+
+    def test_get_catalog_services(self):
+        services = verify_tempest_config._get_catalog_services(self.fake_os)
+        self.assertEqual(['nova', 'glance'], services)
+        self.assertEqual(2,
+                         self.fake_os.service_client.get_service.call_count)
+
+    def test_get_catalog_services_of_region(self):
+        services = verify_tempest_config._get_catalog_services(self.fake_os,
+                                                               region='r2')
+        self.assertEqual(['glance'], services)
+
+    def test_discover_returns_errors(self):
+        self.useFixture(mockpatch.PatchObject(
+            verify_tempest_config, '_get_api_versions',
+            side_effect=lambda os, service: ['%s_v2' % service]))
+        self.fake_os.image_client.get_versions.side_effect = ValueError()
+        discovered = verify_tempest_config.discover(self.fake_os, jobs=4)
+        self.assertEqual(['nova', 'glance'], discovered['services'])
+        self.assertEqual(['keystone_v2'], discovered['keystone'])
+        self.assertIsInstance(discovered['glance'], ValueError)
+        self.assertIn('swift_extensions', discovered)
+
+    def test_verify_ignores_unavailable_services(self):
+        discovered = {'services': ['compute'],
+                      'keystone': ['v2.0'], 'glance': ['v1.0'],
+                      'nova': ['v2.0'], 'cinder': ['v1.0'],
+                      'nova_extensions': ['fake1'],
+                      'swift_extensions': ValueError()}
+        for service in ('nova_v3', 'cinder', 'neutron'):
+            discovered['%s_extensions' % service] = []
+        self.useFixture(mockpatch.PatchObject(
+            verify_tempest_config, 'check_service_availability',
+            return_value=['nova']))
+        verify_extensions = self.useFixture(mockpatch.PatchObject(
+            verify_tempest_config, 'verify_extensions',
+            return_value={})).mock
+        for name in ('keystone', 'glance', 'nova', 'cinder'):
+            self.useFixture(mockpatch.PatchObject(
+                verify_tempest_config, 'verify_%s_api_versions' % name))
+        self.useFixture(mockpatch.PatchObject(verify_tempest_config,
+                                              'display_results'))
+        verify_tempest_config.verify(self.fake_os, discovered, False, False)
+        self.assertEqual(['nova'],
+                         [call[0][1]
+                          for call in verify_extensions.call_args_list])
+
+    def test_configure_clients(self):
+        fake_os = mock.Mock()
+        fake_os.servers_client = mock.Mock(region=None)
+        verify_tempest_config.configure_clients(fake_os, 'r1', 10)
+        self.assertEqual('r1', fake_os.servers_client.region)
+        self.assertEqual(10, fake_os.servers_client.http_obj.timeout)
@@ -0,0 +1,73 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+
+import fixtures
+
+from tempest.common import cidr_allocator
+from tempest.tests import base
+
+
+class TestCidrAllocator(base.TestCase):
+
+    def setUp(self):
+        super(TestCidrAllocator, self).setUp()
+        self.lock_path = self.useFixture(fixtures.TempDir()).path
+        self.allocator = cidr_allocator.CidrAllocator('10.100.0.0/16', 28,
+                                                      self.lock_path)
+
+    def test_free_block(self):
+        self.assertEqual('10.100.0.0/28',
+                         str(self.allocator.free_block([])))
+        self.assertEqual('10.100.0.32/28',
+                         str(self.allocator.free_block(['10.100.0.0/28',
+                                                        '10.100.0.16/28',
+                                                        '192.168.0.0/24'])))
+
+    def test_free_block_skips_overlapping_cidrs(self):
+        self.assertEqual('10.100.1.0/28',
+                         str(self.allocator.free_block(['10.100.0.0/24'])))
+        self.assertEqual('10.100.0.16/28',
+                         str(self.allocator.free_block(['10.100.0.4/30'])))
+
+    def test_free_block_exhausted(self):
+        self.assertIsNone(self.allocator.free_block(['10.0.0.0/8']))
+
+    def test_allocate_reserves_across_allocators(self):
+        other = cidr_allocator.CidrAllocator('10.100.0.0/16', 28,
+                                             self.lock_path)
+        self.assertEqual('10.100.0.0/28', self.allocator.allocate([]))
+        self.assertEqual('10.100.0.16/28', other.allocate([]))
+        self.allocator.release('10.100.0.0/28')
+        self.assertEqual('10.100.0.0/28', other.allocate([]))
+
+    def test_allocate_drops_dead_reservations(self):
+        self.allocator.allocate([])
+        path = os.path.join(self.lock_path, self.allocator.name + '.json')
+        with open(path) as registry_file:
+            reserved = json.load(registry_file)
+        self.assertEqual({'10.100.0.0/28': os.getpid()}, reserved)
+        self.patch('tempest.common.cidr_allocator._is_running',
+                   return_value=False)
+        self.assertEqual('10.100.0.0/28', self.allocator.allocate([]))
+
+    def test_allocate_without_lock_path(self):
+        allocator = cidr_allocator.CidrAllocator('10.100.0.0/16', 28)
+        self.assertEqual('10.100.0.16/28',
+                         allocator.allocate(['10.100.0.0/28']))
+        self.assertEqual('10.100.0.16/28',
+                         allocator.allocate(['10.100.0.0/28']))
@@ -0,0 +1,110 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest.common import console
+from tempest.tests import base
+
+
+class FakeConsole(object):
+
+    def __init__(self):
+        self.output = ''
+        self.lengths = []
+
+    def add(self, *lines):
+        self.output += ''.join(line + '\n' for line in lines)
+
+    def get_output(self, length):
+        self.lengths.append(length)
+        return '\n'.join(self.output.split('\n')[-length:])
+
+
+class TestConsoleLog(base.TestCase):
+
+    def setUp(self):
+        super(TestConsoleLog, self).setUp()
+        self.console = FakeConsole()
+        self.log = console.ConsoleLog(self.console.get_output,
+                                      tail_lines=4, max_lines=16)
+
+    def test_first_read_is_the_tail(self):
+        self.console.add(*['line%d' % i for i in range(10)])
+        self.assertEqual(['line7', 'line8', 'line9'], self.log.read())
+
+    def test_read_new_lines(self):
+        self.console.add('a', 'b')
+        self.assertEqual(['a', 'b'], self.log.read())
+        self.assertEqual([], self.log.read())
+        self.console.add('c')
+        self.assertEqual(['c'], self.log.read())
+        self.assertEqual([4, 4, 4], self.console.lengths)
+
+    def test_tail_grows_until_lines_read_found(self):
+        self.console.add('a', 'b')
+        self.log.read()
+        self.console.add(*['line%d' % i for i in range(8)])
+        self.assertEqual(['line%d' % i for i in range(8)], self.log.read())
+        self.assertEqual([4, 4, 8, 16], self.console.lengths)
+
+    def test_whole_output_fetched_once_per_read(self):
+        # Like the EC2 console output, which has no tail length
+        fetches = []
+
+        def get_whole_output(length):
+            fetches.append(length)
+            return self.console.output
+
+        self.console.add(*['line%d' % i for i in range(10)])
+        whole_log = console.ConsoleLog(get_whole_output, max_lines=0)
+        self.assertEqual(['line%d' % i for i in range(10)], whole_log.read())
+        self.console.output = 'x\n' * 200
+        self.assertEqual(['x'] * 200, whole_log.read())
+        self.console.add('new')
+        self.assertEqual(['new'], whole_log.read())
+        self.assertEqual(3, len(fetches))
+
+    def test_partial_line(self):
+        self.console.output = 'a\nb'
+        self.assertEqual(['a'], self.log.read())
+        self.console.output += 'c\n'
+        self.assertEqual(['bc'], self.log.read())
+
+    def test_lines_read_gone(self):
+        self.console.add('a', 'b')
+        self.log.read()
+        self.console.output = 'x\n'
+        self.assertEqual(['x'], self.log.read())
+
+    def test_too_many_new_lines(self):
+        self.console.add('a')
+        self.log.read()
+        self.console.add(*['line%d' % i for i in range(20)])
+        self.assertEqual(['line%d' % i for i in range(5, 20)],
+                         self.log.read())
+
+
+class TestReadMany(base.TestCase):
+
+    def test_read_many(self):
+        fake = FakeConsole()
+        fake.add('a')
+
+        def fail(length):
+            raise IOError()
+
+        outputs = console.read_many([console.ConsoleLog(fake.get_output),
+                                     console.ConsoleLog(fail)])
+        self.assertEqual(['a'], outputs[0])
+        self.assertIsInstance(outputs[1], IOError)
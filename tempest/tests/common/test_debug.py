@@ -39,6 +39,8 @@ class TestDebug(base.TestCase):
         self.ip_ns_route_mock = self.patch(common_pre + '.ip_ns_route')
         self.iptables_ns_mock = self.patch(common_pre + '.iptables_ns')
         self.ovs_db_dump_mock = self.patch(common_pre + '.ovs_db_dump')
+        self.sudo_script_call_mock = self.patch(common_pre +
+                                                '.sudo_script_call')
 
         self.log_mock = self.patch('tempest.common.debug.LOG')
 
@@ -46,42 +48,59 @@ class TestDebug(base.TestCase):
         self.useFixture(mockpatch.PatchObject(test.CONF.debug,
                                               'enable', False))
         debug.log_ip_ns()
-        self.assertFalse(self.ip_addr_raw_mock.called)
+        self.assertFalse(self.sudo_script_call_mock.called)
         self.assertFalse(self.log_mock.info.called)
 
+    def _dump_output(self, ns_list):
+        marker = debug.SECTION_MARKER
+        lines = [marker + 'Host Addr\n', 'host addr\n',
+                 marker + 'Host ns list\n']
+        lines.extend('%s\n' % ns for ns in ns_list)
+        for ns in ns_list:
+            lines.extend([marker + 'ns(%s) Addr\n' % ns,
+                          '%s addr 1\n' % ns, '%s addr 2\n' % ns])
+        return lines
+
     def test_log_ip_ns_debug_enabled(self):
         self.useFixture(mockpatch.PatchObject(test.CONF.debug,
                                               'enable', True))
-
-        self.ip_ns_list_mock.return_value = [1, 2]
+        self.sudo_script_call_mock.return_value = (
+            line for line in self._dump_output(['ns1', 'ns2']))
 
         debug.log_ip_ns()
-        self.ip_addr_raw_mock.assert_called_with()
-        self.assertTrue(self.log_mock.info.called)
-        self.ip_route_raw_mock.assert_called_with()
-        self.assertEqual(len(debug.TABLES), self.iptables_raw_mock.call_count)
+        self.assertEqual(1, self.sudo_script_call_mock.call_count)
+        script, timeout = self.sudo_script_call_mock.call_args[0]
+        self.assertEqual(test.CONF.debug.dump_timeout, timeout)
         for table in debug.TABLES:
-            self.assertIn(mock.call(table),
-                          self.iptables_raw_mock.call_args_list)
-
-        self.ip_ns_list_mock.assert_called_with()
-        self.assertEqual(len(self.ip_ns_list_mock.return_value),
-                         self.ip_ns_addr_mock.call_count)
-        self.assertEqual(len(self.ip_ns_list_mock.return_value),
-                         self.ip_ns_route_mock.call_count)
-        for ns in self.ip_ns_list_mock.return_value:
-            self.assertIn(mock.call(ns),
-                          self.ip_ns_addr_mock.call_args_list)
-            self.assertIn(mock.call(ns),
-                          self.ip_ns_route_mock.call_args_list)
-
-        self.assertEqual(len(debug.TABLES) *
-                         len(self.ip_ns_list_mock.return_value),
-                         self.iptables_ns_mock.call_count)
-        for ns in self.ip_ns_list_mock.return_value:
-            for table in debug.TABLES:
-                self.assertIn(mock.call(ns, table),
-                              self.iptables_ns_mock.call_args_list)
+            self.assertIn(table, script)
+        self.assertFalse(self.ip_addr_raw_mock.called)
+        self.assertFalse(self.ip_ns_addr_mock.called)
+        self.assertEqual(
+            [mock.call('%s:\n%s', 'Host Addr', 'host addr\n'),
+             mock.call('%s:\n%s', 'Host ns list', 'ns1\nns2\n'),
+             mock.call('%s:\n%s', 'ns(ns1) Addr',
+                       'ns1 addr 1\nns1 addr 2\n'),
+             mock.call('%s:\n%s', 'ns(ns2) Addr',
+                       'ns2 addr 1\nns2 addr 2\n')],
+            self.log_mock.info.call_args_list)
+
+    def test_log_ip_ns_max_size(self):
+        self.useFixture(mockpatch.PatchObject(test.CONF.debug,
+                                              'enable', True))
+        self.useFixture(mockpatch.PatchObject(test.CONF.debug,
+                                              'dump_max_size', 24))
+        output = mock.MagicMock()
+        output.__iter__.return_value = iter(self._dump_output(['ns1']))
+        self.sudo_script_call_mock.return_value = output
+
+        debug.log_ip_ns()
+        self.assertEqual(
+            [mock.call('%s:\n%s', 'Host Addr', 'host addr\n'),
+             mock.call('%s:\n%s', 'Host ns list', 'ns1\n'),
+             mock.call('%s:\n%s', 'ns(ns1) Addr', '')],
+            self.log_mock.info.call_args_list)
+        self.assertTrue(self.log_mock.warning.called)
+        output.close.assert_called_once_with()
 
     def test_log_ovs_db_debug_disabled(self):
         self.useFixture(mockpatch.PatchObject(test.CONF.debug,
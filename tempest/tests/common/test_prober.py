@@ -0,0 +1,83 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from distutils import spawn
+import socket
+
+from tempest.common import prober
+from tempest.tests import base
+
+
+class TestTCPProbe(base.TestCase):
+
+    def setUp(self):
+        super(TestTCPProbe, self).setUp()
+        listening = socket.socket()
+        listening.bind(('0.0.0.0', 0))
+        listening.listen(5)
+        self.addCleanup(listening.close)
+        self.open_port = listening.getsockname()[1]
+        # Nothing listens on a port which is bound only
+        closed = socket.socket()
+        closed.bind(('127.0.0.1', 0))
+        self.addCleanup(closed.close)
+        self.closed_port = closed.getsockname()[1]
+
+    def test_open_port(self):
+        results = prober.probe(['127.0.0.1', '127.0.0.2'],
+                               port=self.open_port, timeout=5)
+        self.assertEqual(['127.0.0.1', '127.0.0.2'], sorted(results))
+        self.assertIsNotNone(results['127.0.0.1'])
+        self.assertIsNotNone(results['127.0.0.2'])
+
+    def test_closed_port(self):
+        results = prober.probe(['127.0.0.1'], port=self.closed_port,
+                               timeout=0.5, interval=0.1)
+        self.assertEqual({'127.0.0.1': None}, results)
+
+    def test_closed_port_should_fail(self):
+        results = prober.probe(['127.0.0.1'], port=self.closed_port,
+                               timeout=5, should_succeed=False)
+        self.assertIsNotNone(results['127.0.0.1'])
+
+    def test_open_port_should_fail(self):
+        results = prober.probe(['127.0.0.1'], port=self.open_port,
+                               timeout=0.5, interval=0.1,
+                               should_succeed=False)
+        self.assertEqual({'127.0.0.1': None}, results)
+
+
+class TestICMPProbe(base.TestCase):
+
+    def test_checksum(self):
+        packet = prober._echo_request(0x1234, 1)
+        self.assertEqual(0, prober._checksum(packet))
+
+    def test_ping_localhost(self):
+        sock, _ = prober._icmp_socket()
+        if sock is None:
+            self.skipTest("ICMP sockets are not permitted")
+        sock.close()
+        results = prober.probe(['127.0.0.1', '127.0.0.2'], timeout=5)
+        self.assertIsNotNone(results['127.0.0.1'])
+        self.assertIsNotNone(results['127.0.0.2'])
+
+    def test_ping_process(self):
+        if spawn.find_executable('ping') is None:
+            self.skipTest("ping is not installed")
+        self.patch('tempest.common.prober._icmp_socket',
+                   return_value=(None, False))
+        results = prober.probe(['127.0.0.1'], timeout=5)
+        self.assertIsNotNone(results['127.0.0.1'])
@@ -0,0 +1,84 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fixtures
+
+from tempest.common import rate_limiter
+from tempest.tests import base
+
+
+class TestTokenBucketLimiter(base.TestCase):
+
+    lock_path = None
+
+    def setUp(self):
+        super(TestTokenBucketLimiter, self).setUp()
+        self.now = 1000.0
+        self.patch('time.time', side_effect=lambda: self.now)
+        self.sleep = self.patch('time.sleep')
+        self.limiter = rate_limiter.TokenBucketLimiter(2, 3, self.lock_path)
+        rate_limiter.pop_throttled_time()
+
+    def test_burst(self):
+        for i in range(3):
+            self.assertEqual(0, self.limiter.acquire('compute', 'GET'))
+        self.assertEqual(0.5, self.limiter.acquire('compute', 'GET'))
+        self.assertEqual(1.0, self.limiter.acquire('compute', 'GET'))
+        self.sleep.assert_called_with(1.0)
+        self.assertEqual({('compute', 'GET'): 1.5},
+                         rate_limiter.pop_throttled_time())
+        self.assertEqual({}, rate_limiter.pop_throttled_time())
+
+    def test_buckets_per_service_and_method(self):
+        for i in range(3):
+            self.limiter.acquire('compute', 'GET')
+        self.assertEqual(0, self.limiter.acquire('compute', 'POST'))
+        self.assertEqual(0, self.limiter.acquire('volume', 'GET'))
+
+    def test_refill(self):
+        for i in range(3):
+            self.limiter.acquire('compute', 'GET')
+        self.now += 1
+        self.assertEqual(0, self.limiter.acquire('compute', 'GET'))
+        self.assertEqual(0, self.limiter.acquire('compute', 'GET'))
+        self.assertEqual(0.5, self.limiter.acquire('compute', 'GET'))
+        self.now += 60
+        for i in range(3):
+            self.assertEqual(0, self.limiter.acquire('compute', 'GET'))
+
+    def test_throttle(self):
+        self.limiter.acquire('compute', 'GET')
+        self.limiter.throttle('compute', 'GET', 10)
+        self.assertEqual(10.5, self.limiter.acquire('compute', 'GET'))
+        self.assertEqual(11.0, self.limiter.acquire('compute', 'GET'))
+        self.assertEqual(0, self.limiter.acquire('compute', 'POST'))
+        # The bucket isn't refilled while it is held
+        self.now += 10
+        self.assertEqual(1.5, self.limiter.acquire('compute', 'GET'))
+
+
+class TestSharedTokenBucketLimiter(TestTokenBucketLimiter):
+
+    def setUp(self):
+        self.lock_path = self.useFixture(fixtures.TempDir()).path
+        super(TestSharedTokenBucketLimiter, self).setUp()
+
+    def test_shared_between_limiters(self):
+        for i in range(3):
+            self.limiter.acquire('compute', 'GET')
+        other = rate_limiter.TokenBucketLimiter(2, 3, self.lock_path)
+        self.assertEqual(0.5, other.acquire('compute', 'GET'))
+        other.throttle('compute', 'GET', 5)
+        self.assertEqual(6.0, self.limiter.acquire('compute', 'GET'))
@@ -18,6 +18,7 @@ from oslo.config import cfg
 
 from tempest.common.utils.linux import remote_client
 from tempest import config
+from tempest import exceptions
 from tempest.openstack.common.fixture import mockpatch
 from tempest.tests import base
 from tempest.tests import fake_config
@@ -148,3 +149,82 @@ a0:b0:c0:d0:e0:f0"""
         nic = 'eth0'
         self.conn.turn_nic_on(nic)
         self._assert_exec_called_with('sudo /bin/ip link set %s up' % nic)
+
+    def test_get_facts(self):
+        facts_output = """fake_hostname
+
+--- tempest fact hostname 0
+2
+
+--- tempest fact number_of_vcpus 0
+Mem:          1993       1525        467          0         60        847
+
+--- tempest fact ram_size_in_mb 0
+5000
+
+--- tempest fact boot_time 0
+"""
+        self.ssh_mock.mock.exec_command.return_value = facts_output
+        self.useFixture(mockpatch.PatchObject(time, 'time',
+                                              return_value=15000))
+        facts = self.conn.get_facts('hostname', 'number_of_vcpus',
+                                    'ram_size_in_mb', 'boot_time')
+        self.assertEqual({'hostname': 'fake_hostname',
+                          'number_of_vcpus': 2,
+                          'ram_size_in_mb': '1993',
+                          'boot_time': time.localtime(10000)}, facts)
+        self.assertEqual(1, self.ssh_mock.mock.exec_command.call_count)
+        self._assert_exec_called_with(
+            remote_client.facts_script(['hostname', 'number_of_vcpus',
+                                        'ram_size_in_mb', 'boot_time']))
+
+    def test_get_facts_failed_command(self):
+        facts_output = """fake_hostname
+
+--- tempest fact hostname 0
+
+--- tempest fact mac_address 127
+"""
+        self.ssh_mock.mock.exec_command.return_value = facts_output
+        self.assertRaises(exceptions.SSHExecCommandFailed,
+                          self.conn.get_facts, 'hostname', 'mac_address')
+
+    def test_facts_script(self):
+        self.assertEqual(
+            '{ hostname\n}; printf "\\n--- tempest fact hostname %s\\n" $?\n'
+            '{ cat /proc/partitions\n}; '
+            'printf "\\n--- tempest fact partitions %s\\n" $?',
+            remote_client.facts_script(['hostname', 'partitions']))
+
+
+class TestParseFactsOutput(base.TestCase):
+
+    def test_parse(self):
+        proc_partitions = """major minor  #blocks  name
+
+ 253        0   1048576 vda
+"""
+        output = ("\n--- tempest fact mac_address 0\n" +
+                  proc_partitions +
+                  "\n--- tempest fact partitions 0\n"
+                  "no such file\n"
+                  "\n--- tempest fact ip_list 1\n")
+        self.assertEqual({'mac_address': (0, ''),
+                          'partitions': (0, proc_partitions),
+                          'ip_list': (1, 'no such file\n')},
+                         remote_client.parse_facts_output(output))
+
+    def test_output_without_trailing_newline(self):
+        output = "fake_hostname\n--- tempest fact hostname 0\n"
+        self.assertEqual({'hostname': (0, 'fake_hostname')},
+                         remote_client.parse_facts_output(output))
+
+    def test_truncated_output(self):
+        output = ("fake_hostname\n\n--- tempest fact hostname 0\n"
+                  "processor : 0\n")
+        self.assertRaises(exceptions.TempestException,
+                          remote_client.parse_facts_output, output)
+
+    def test_no_marker(self):
+        self.assertRaises(exceptions.TempestException,
+                          remote_client.parse_facts_output, 'fake_hostname')
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import os
+import zlib
 
 from tempest.common.utils import data_utils
 from tempest.tests import base
@@ -75,3 +78,72 @@ class TestDataUtils(base.TestCase):
         self.assertEqual(actual, "abc" * (30 / len("abc")))
         actual = data_utils.arbitrary_string(size=5, base_text="deadbeaf")
         self.assertEqual(actual, "deadb")
+
+    def test_random_bytes(self):
+        actual = data_utils.random_bytes()
+        self.assertIsInstance(actual, str)
+        self.assertEqual(1024, len(actual))
+        self.assertNotEqual(actual, data_utils.random_bytes())
+        self.assertEqual(3, len(data_utils.random_bytes(3)))
+        self.assertEqual('', data_utils.random_bytes(0))
+
+
+class TestRandomPayload(base.TestCase):
+
+    size = 3 * data_utils.RandomPayload.POOL_SIZE + 12345
+
+    def test_read(self):
+        payload = data_utils.RandomPayload(self.size, seed=42)
+        self.assertEqual(self.size, len(payload))
+        content = payload.read()
+        self.assertEqual(self.size, len(content))
+        self.assertEqual(self.size, payload.tell())
+        self.assertEqual('', payload.read(10))
+        payload.seek(0)
+        chunks = [payload.read(100000)]
+        while chunks[-1]:
+            chunks.append(payload.read(100000))
+        self.assertEqual(content, ''.join(chunks))
+        self.assertEqual(content, ''.join(
+            data_utils.RandomPayload(self.size, seed=42)))
+
+    def test_seek(self):
+        payload = data_utils.RandomPayload(self.size, seed=42)
+        content = payload.read()
+        payload.seek(-100, os.SEEK_END)
+        self.assertEqual(content[-100:], payload.read())
+        payload.seek(70000)
+        payload.seek(1000, os.SEEK_CUR)
+        self.assertEqual(71000, payload.tell())
+        self.assertEqual(content[71000:200000], payload.read(129000))
+        self.assertRaises(IOError, payload.seek, -1)
+
+    def test_seed(self):
+        content = data_utils.RandomPayload(self.size, seed=42).read()
+        self.assertEqual(
+            content, data_utils.RandomPayload(self.size, seed=42).read())
+        self.assertNotEqual(
+            content, data_utils.RandomPayload(self.size, seed=43).read())
+        payload = data_utils.RandomPayload(self.size)
+        self.assertEqual(
+            payload.read(),
+            data_utils.RandomPayload(self.size, seed=payload.seed).read())
+
+    def test_checksum(self):
+        payload = data_utils.RandomPayload(self.size, seed=42)
+        payload.seek(10)
+        expected = hashlib.md5(
+            data_utils.RandomPayload(self.size, seed=42).read()).hexdigest()
+        self.assertEqual(expected, payload.checksum)
+        self.assertEqual(10, payload.tell())
+        self.assertEqual(expected, data_utils.RandomPayload(self.size,
+                                                            seed=42).checksum)
+
+    def test_compressible(self):
+        incompressible = data_utils.RandomPayload(self.size, seed=42).read()
+        compressible = data_utils.RandomPayload(self.size, seed=42,
+                                                compressible=True).read()
+        self.assertEqual(self.size, len(compressible))
+        self.assertGreater(len(zlib.compress(incompressible)),
+                           self.size * 0.95)
+        self.assertLess(len(zlib.compress(compressible)), self.size * 0.05)
@@ -13,6 +13,7 @@
 #    under the License.
 
 import os
+import tempfile
 
 from oslo.config import cfg
 
@@ -41,10 +42,13 @@ class ConfigFixture(conf_fixture.Config):
                               group='identity')
         self.conf.set_default('neutron', True, group='service_available')
         self.conf.set_default('heat', True, group='service_available')
-        if not os.path.exists(str(os.environ.get('OS_TEST_LOCK_PATH'))):
-            os.mkdir(str(os.environ.get('OS_TEST_LOCK_PATH')))
-        self.conf.set_default('lock_path',
-                              str(os.environ.get('OS_TEST_LOCK_PATH')))
+        # Like .testr.conf, default to the temporary directory when the
+        # tests are run without OS_TEST_LOCK_PATH
+        lock_path = os.environ.get('OS_TEST_LOCK_PATH',
+                                   tempfile.gettempdir())
+        if not os.path.exists(lock_path):
+            os.mkdir(lock_path)
+        self.conf.set_default('lock_path', lock_path)
         self.conf.set_default('auth_version', 'v2', group='identity')
         for config_option in ['username', 'password', 'tenant_name']:
             # Identity group items
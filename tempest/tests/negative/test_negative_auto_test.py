@@ -15,7 +15,9 @@
 
 import json
 
+import fixtures
 import mock
+from oslo.config import cfg
 
 from tempest import config
 import tempest.test as test
@@ -43,6 +45,9 @@ class TestNegativeAutoTest(base.TestCase):
         super(TestNegativeAutoTest, self).setUp()
         self.useFixture(fake_config.ConfigFixture())
         self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.stubs.Set(test.NegativeAutoTest, '_scenarios', {})
+        self.stubs.Set(test.NegativeAutoTest, '_valid_templates', {})
+        self.stubs.Set(test.NegativeAutoTest, '_batch_responses', {})
 
     def _check_prop_entries(self, result, entry):
         entries = [a for a in result if entry in a[0]]
@@ -82,3 +87,72 @@ class TestNegativeAutoTest(base.TestCase):
             self.assertEqual(return_file, self.fake_input_desc)
         return_dict = test.NegativeAutoTest.load_schema(self.fake_input_desc)
         self.assertEqual(return_file, return_dict)
+
+    def test_generate_scenario_cached(self):
+        with mock.patch.object(test.NegativeAutoTest, '_generate_scenario',
+                               return_value=[('gen_none', {})]) as gen_mock:
+            first = test.NegativeAutoTest.generate_scenario(
+                self.fake_input_desc)
+            second = test.NegativeAutoTest.generate_scenario(
+                dict(self.fake_input_desc))
+        self.assertEqual(1, gen_mock.call_count)
+        self.assertEqual(first, second)
+
+    def test_generate_scenario_disk_cache(self):
+        cache_path = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_default('scenario_cache_path', cache_path,
+                             group='negative')
+        scenarios = test.NegativeAutoTest.generate_scenario(
+            self.fake_input_desc)
+        self.stubs.Set(test.NegativeAutoTest, '_scenarios', {})
+        with mock.patch.object(test.NegativeAutoTest,
+                               '_generate_scenario') as gen_mock:
+            cached = test.NegativeAutoTest.generate_scenario(
+                self.fake_input_desc)
+        self.assertFalse(gen_mock.called)
+        self.assertEqual(scenarios, cached)
+        self._check_resource_entries(cached, "inv_res")
+
+    def test_valid_template_cached(self):
+        schema = self.fake_input_desc['json-schema']
+        template = test.NegativeAutoTest.valid_template(schema)
+        self.assertEqual({'minRam': 0, 'minDisk': 0}, template)
+        self.assertIs(template, test.NegativeAutoTest.valid_template(
+            dict(schema)))
+
+    def _execute_scenarios(self, client):
+        scenarios = test.NegativeAutoTest.generate_scenario(
+            self.fake_input_desc)
+        for _, attrs in scenarios:
+            negative_test = test.NegativeAutoTest('execute')
+            negative_test.client = client
+            for key, value in attrs.items():
+                setattr(negative_test, key, value)
+            negative_test.execute(self.fake_input_desc)
+        return scenarios
+
+    def test_execute(self):
+        client = mock.Mock()
+        client.send_request.return_value = (mock.Mock(status=400), None)
+        scenarios = self._execute_scenarios(client)
+        self.assertEqual(len(scenarios), client.send_request.call_count)
+        self.assertFalse(client.send_requests.called)
+
+    def test_execute_batch(self):
+        cfg.CONF.set_default('batch_requests', True, group='negative')
+        client = mock.Mock()
+        client.send_requests.side_effect = lambda requests, concurrency: [
+            (mock.Mock(status=400), None)] * len(requests)
+        scenarios = self._execute_scenarios(client)
+        self.assertFalse(client.send_request.called)
+        self.assertEqual(1, client.send_requests.call_count)
+        requests = client.send_requests.call_args[0][0]
+        self.assertEqual(len(scenarios), len(requests))
+        self.assertEqual(len(scenarios), len(set(requests)))
+
+    def test_execute_batch_failure(self):
+        cfg.CONF.set_default('batch_requests', True, group='negative')
+        client = mock.Mock()
+        client.send_requests.side_effect = lambda requests, concurrency: [
+            (mock.Mock(status=200), None)] * len(requests)
+        self.assertRaises(AssertionError, self._execute_scenarios, client)
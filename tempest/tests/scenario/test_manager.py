@@ -0,0 +1,201 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from novaclient import exceptions as nova_exceptions
+
+from tempest import config
+from tempest import exceptions
+from tempest.scenario import manager
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+class FakeServer(object):
+
+    def __init__(self, server_id, name=None, status=None):
+        self.id = server_id
+        self.name = name
+        self.status = status
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class FakeServers(object):
+
+    def __init__(self):
+        self.statuses = {}
+        self.calls = []
+
+    def create(self, name, image, flavor, **kwargs):
+        self.calls.append(('create', name))
+        server_id = 'id-%s' % name
+        self.statuses[server_id] = ['BUILD', 'ACTIVE']
+        return FakeServer(server_id, name=name)
+
+    def get(self, server_id):
+        self.calls.append(('get', server_id))
+        statuses = self.statuses[server_id]
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return FakeServer(server_id, status=status)
+
+
+class TestCreateServers(base.TestCase):
+
+    def setUp(self):
+        super(TestCreateServers, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.patch('time.sleep')
+        # Only the helpers of the scenario are used, it is never run
+        self.scenario = manager.OfficialClientTest('setUp')
+        self.scenario.cleanup_waits = []
+        self.servers = FakeServers()
+        self.client = mock.Mock(servers=self.servers)
+        self.client.networks.list.return_value = []
+        self.scenario.compute_client = self.client
+
+    def test_create_servers(self):
+        servers = self.scenario.create_servers(
+            [dict(name='vm1'), dict(name='vm2', create_kwargs={'nics': []})])
+        self.assertEqual(['id-vm1', 'id-vm2'],
+                         [server.id for server in servers])
+        # Both servers are booted before any of them is waited for
+        self.assertEqual([('create', 'vm1'), ('create', 'vm2'),
+                          ('get', 'id-vm1'), ('get', 'id-vm2'),
+                          ('get', 'id-vm1'), ('get', 'id-vm2')],
+                         self.servers.calls[:6])
+        self.assertEqual(['id-vm1', 'id-vm2'],
+                         [wait['thing_id']
+                          for wait in self.scenario.cleanup_waits])
+
+    def test_create_servers_failure_deletes_booted_servers(self):
+        create = self.servers.create
+        booted = []
+
+        def create_once(name, image, flavor, **kwargs):
+            if booted:
+                raise ValueError(name)
+            booted.append(create(name, image, flavor, **kwargs))
+            return booted[-1]
+
+        self.servers.create = create_once
+        self.assertRaises(ValueError, self.scenario.create_servers,
+                          [dict(name='vm1', create_kwargs={'nics': []}),
+                           dict(name='vm2', create_kwargs={'nics': []})],
+                          wait_on_delete=False)
+        self.assertEqual(['id-vm1'], [wait['thing_id']
+                                      for wait in self.scenario.cleanup_waits])
+        self.scenario.doCleanups()
+        self.assertTrue(booted[0].deleted)
+
+    def test_create_server(self):
+        server = self.scenario.create_server(name='vm1',
+                                             create_kwargs={'nics': []})
+        self.assertEqual('id-vm1', server.id)
+
+    def test_status_timeouts_error(self):
+        self.servers.statuses = {'id-vm1': ['ACTIVE'], 'id-vm2': ['ERROR']}
+        self.assertRaises(exceptions.BuildErrorException,
+                          self.scenario.status_timeouts,
+                          self.servers, ['id-vm1', 'id-vm2'], 'ACTIVE')
+
+    def test_status_timeouts_timeout(self):
+        self.servers.statuses = {'id-vm1': ['ACTIVE'], 'id-vm2': ['BUILD']}
+        self.patch('tempest.test.call_until_true', side_effect=(
+            lambda func, duration, sleep_for: func()))
+        exc = self.assertRaises(exceptions.TimeoutException,
+                                self.scenario.status_timeouts,
+                                self.servers, ['id-vm1', 'id-vm2'], 'ACTIVE')
+        self.assertIn('id-vm2', str(exc))
+        self.assertNotIn('id-vm1', str(exc))
+
+
+class TestCleanupWaits(base.TestCase):
+
+    def setUp(self):
+        super(TestCleanupWaits, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.patch('time.sleep')
+        self.scenario = manager.OfficialClientTest('setUp')
+        self.scenario.cleanup_waits = []
+        self.servers = mock.Mock()
+        self.volumes = mock.Mock()
+
+    def test_waits_are_grouped_by_type(self):
+        delete_timeouts = mock.Mock()
+        self.scenario.delete_timeouts = delete_timeouts
+        for things, thing_id in [(self.servers, 'vm1'),
+                                 (self.volumes, 'vol1'),
+                                 (self.servers, 'vm2')]:
+            self.scenario.addCleanup_with_wait(things, thing_id)
+        self.scenario._wait_for_cleanups()
+        self.assertEqual(2, delete_timeouts.call_count)
+        groups = sorted(call[1]['thing_id']
+                        for call in delete_timeouts.call_args_list)
+        self.assertEqual([['vm1', 'vm2'], ['vol1']], groups)
+
+    def test_deletions_use_single_list_call(self):
+        self.servers.list.side_effect = [[FakeServer('vm2', status='ACTIVE')],
+                                         []]
+        self.servers.get.side_effect = nova_exceptions.NotFound(404)
+        self.scenario.delete_timeouts(self.servers, ['vm1', 'vm2'])
+        self.assertEqual(2, self.servers.list.call_count)
+        # Only the things missing from the listing are looked up
+        self.assertEqual([mock.call('vm1'), mock.call('vm2')],
+                         self.servers.get.call_args_list)
+
+    def test_deletion_of_thing_missing_from_listing(self):
+        # The listing is filtered, vm1 still exists
+        self.servers.list.return_value = [FakeServer('vm2', status='ACTIVE')]
+        self.servers.get.side_effect = [FakeServer('vm1', status='ACTIVE'),
+                                        nova_exceptions.NotFound(404)]
+        self.patch('tempest.test.call_until_true', side_effect=(
+            lambda func, duration, sleep_for: func()))
+        exc = self.assertRaises(exceptions.TimeoutException,
+                                self.scenario.delete_timeouts,
+                                self.servers, ['vm1', 'vm2'])
+        self.assertIn('vm1', str(exc))
+
+    def test_deletion_error(self):
+        self.servers.list.return_value = [FakeServer('vm1', status='ERROR')]
+        self.assertRaises(exceptions.BuildErrorException,
+                          self.scenario.delete_timeouts,
+                          self.servers, ['vm1', 'vm2'])
+
+    def test_add_cleanups_with_wait(self):
+        self.scenario.addCleanups_with_wait(self.servers, ['vm1', 'vm2'])
+        self.assertEqual(['vm1', 'vm2'],
+                         [wait['thing_id']
+                          for wait in self.scenario.cleanup_waits])
+        self.scenario.doCleanups()
+        self.servers.delete.assert_has_calls([mock.call('vm1'),
+                                              mock.call('vm2')],
+                                             any_order=True)
+
+    def test_run_concurrently_raises_after_all_calls(self):
+        calls = []
+
+        def fail(name):
+            calls.append(name)
+            raise ValueError(name)
+
+        self.assertRaises(ValueError,
+                          self.scenario._run_concurrently,
+                          [(fail, ('a',), {}), (calls.append, ('b',), {})])
+        self.assertEqual(['a', 'b'], sorted(calls))
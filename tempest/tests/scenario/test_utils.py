@@ -0,0 +1,102 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import time
+
+import fixtures
+import mock
+from oslo.config import cfg
+
+from tempest import config
+from tempest.scenario import utils
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+class TestDiscoveryCache(base.TestCase):
+
+    def setUp(self):
+        super(TestDiscoveryCache, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.lock_path = self.useFixture(fixtures.TempDir()).path
+        self.fetch = mock.Mock(return_value=[('cirros', 'fake_id')])
+
+    def test_cache_disabled(self):
+        cache = utils.DiscoveryCache(0, self.lock_path)
+        cache.get('images', self.fetch)
+        cache.get('images', self.fetch)
+        self.assertEqual(2, self.fetch.call_count)
+        self.assertEqual([], os.listdir(self.lock_path))
+
+    def test_fetch_once(self):
+        utils.DiscoveryCache(60, self.lock_path).get('images', self.fetch)
+        items = utils.DiscoveryCache(60, self.lock_path).get('images',
+                                                             self.fetch)
+        self.assertEqual([['cirros', 'fake_id']], items)
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_kinds_are_cached_separately(self):
+        cache = utils.DiscoveryCache(60, self.lock_path)
+        cache.get('images', self.fetch)
+        cache.get('flavors', self.fetch)
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_expired_cache(self):
+        cache = utils.DiscoveryCache(60, self.lock_path)
+        cache.get('images', self.fetch)
+        now = time.time() + 120
+        self.useFixture(fixtures.MonkeyPatch('time.time', lambda: now))
+        cache.get('images', self.fetch)
+        self.assertEqual(2, self.fetch.call_count)
+
+
+class TestImageUtils(base.TestCase):
+
+    def setUp(self):
+        super(TestImageUtils, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        cfg.CONF.set_default('discovery_cache_ttl', 60,
+                             group='input-scenario')
+        self.patch('tempest.clients.OfficialClientManager')
+        self.patch('tempest.auth.get_default_credentials')
+        # ImageUtils is a singleton, its state is reset for every test
+        self.image_utils = utils.ImageUtils()
+        self.image_utils._images = {}
+        self.image_utils._flavors = {}
+        self.client = self.image_utils.client = mock.Mock()
+        self.client.images.get.return_value = mock.Mock(minDisk=1)
+        self.client.flavors.get.return_value = mock.Mock(disk=1)
+        self.now = time.time()
+        self.useFixture(fixtures.MonkeyPatch('time.time', lambda: self.now))
+
+    def test_lookups_are_cached(self):
+        self.assertTrue(self.image_utils.is_flavor_enough('flavor', 'image'))
+        self.assertTrue(self.image_utils.is_flavor_enough('flavor', 'image'))
+        self.image_utils.is_sshable_image('image')
+        self.client.images.get.assert_called_once_with('image')
+        self.client.flavors.get.assert_called_once_with('flavor')
+
+    def test_lookups_expire(self):
+        self.image_utils.is_flavor_enough('flavor', 'image')
+        self.now += 30
+        self.image_utils.is_flavor_enough('flavor', 'image')
+        self.assertEqual(1, self.client.images.get.call_count)
+        self.now += 60
+        self.image_utils.is_flavor_enough('flavor', 'image')
+        self.assertEqual(2, self.client.images.get.call_count)
+        self.assertEqual(2, self.client.flavors.get.call_count)
@@ -0,0 +1,97 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tempest.tests import base
+from tempest.thirdparty.boto.utils import wait
+
+
+class FakeResource(object):
+
+    def __init__(self, id, status):
+        self.id = id
+        self.status = status
+
+
+class TestBatchWaiter(base.TestCase):
+
+    def setUp(self):
+        super(TestBatchWaiter, self).setUp()
+        self.listings = []
+        self.waiter = wait.BatchWaiter(self._list, 'status')
+        self.sleep = self.patch('time.sleep')
+
+    def _list(self):
+        listing = self.listings.pop(0)
+        return [FakeResource(id, status) for id, status in listing.items()]
+
+    def test_wait_lists_once_per_poll(self):
+        self.listings = [{'a': 'creating', 'b': 'creating'},
+                         {'a': 'available', 'b': 'creating'},
+                         {'a': 'available', 'b': 'available'}]
+        callback = mock.Mock()
+        self.waiter.add('a', 'available', callback)
+        self.waiter.add('b', 'available')
+        wait.batch_wait([self.waiter], build_interval=1, build_timeout=10)
+        self.assertEqual([], self.listings)
+        callback.assert_called_once_with('available')
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_missing_resource_is_gone(self):
+        self.listings = [{'a': 'deleting'}, {}]
+        self.waiter.add('a', self.waiter.GONE)
+        wait.batch_wait([self.waiter], build_interval=1, build_timeout=10)
+        self.assertEqual('_GONE', self.waiter.states['a'])
+
+    def test_ready(self):
+        self.listings = [{'a': 'available'}] * 2
+        ready = mock.Mock(side_effect=[False, True])
+        self.waiter.add('a', 'available', ready=ready)
+        self.waiter.poll()
+        self.assertIn('a', self.waiter.waits)
+        self.waiter.poll()
+        self.assertNotIn('a', self.waiter.waits)
+
+    def test_failed_callback(self):
+        self.listings = [{'a': 'available', 'b': 'available'}]
+        self.waiter.add('a', 'available', mock.Mock(side_effect=IOError()))
+        self.waiter.add('b', 'available')
+        self.waiter.poll()
+        self.assertEqual({}, self.waiter.waits)
+        self.assertEqual(['a'], self.waiter.failed)
+
+    def test_waiting(self):
+        self.listings = [{'a': 'in-use'}, {'a': 'detaching'},
+                         {'a': 'available'}]
+        waiting = mock.Mock(side_effect=[ValueError(), None])
+        self.waiter.add('a', 'available', waiting=waiting)
+        wait.batch_wait([self.waiter], build_interval=1, build_timeout=10)
+        self.assertEqual([mock.call('in-use'), mock.call('detaching')],
+                         waiting.call_args_list)
+        self.assertEqual([], self.waiter.failed)
+
+    def test_shared_deadline(self):
+        other = wait.BatchWaiter(lambda: [FakeResource('c', 'deleting')],
+                                 'status')
+        other.add('c', self.waiter.GONE)
+        self.listings = [{}]
+        self.waiter.add('a', self.waiter.GONE)
+        self.patch('time.time', side_effect=[0, 5, 11])
+        exc = self.assertRaises(self.failureException, wait.batch_wait,
+                                [self.waiter, other], build_interval=1,
+                                build_timeout=10)
+        self.assertIn('c at "deleting"', str(exc))
+        self.assertEqual({}, self.waiter.waits)
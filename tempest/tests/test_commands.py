@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import StringIO
 import subprocess
 
 import mock
@@ -87,3 +88,26 @@ class TestCommands(base.TestCase):
                         'iptables', '-v', '-S', '-t', table]
             commands.iptables_ns(ns, table)
             mock.assert_called_once_with(expected, **self.subprocess_args)
+
+    @mock.patch('subprocess.Popen')
+    def test_sudo_script_call(self, mock):
+        mock.return_value.stdout = StringIO.StringIO('line 1\nline 2\n')
+        mock.return_value.returncode = 0
+        lines = list(commands.sudo_script_call('echo foo', 10))
+        self.assertEqual(['line 1\n', 'line 2\n'], lines)
+        expected = ['/usr/bin/sudo', '-n', 'timeout', '-s', 'KILL', '10',
+                    'sh', '-c', 'echo foo']
+        mock.assert_called_once_with(expected, **self.subprocess_args)
+        mock.return_value.wait.assert_called_once_with()
+
+    @mock.patch('subprocess.Popen')
+    def test_sudo_script_call_closed(self, mock):
+        stdout = StringIO.StringIO('line 1\nline 2\n')
+        mock.return_value.stdout = stdout
+        output = commands.sudo_script_call('echo foo')
+        self.assertEqual('line 1\n', next(output))
+        output.close()
+        self.assertTrue(stdout.closed)
+        mock.return_value.wait.assert_called_once_with()
+        self.assertEqual(['/usr/bin/sudo', '-n', 'sh', '-c', 'echo foo'],
+                         mock.call_args[0][0])
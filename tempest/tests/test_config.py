@@ -0,0 +1,115 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import subprocess
+import sys
+
+import fixtures
+
+from tempest import config
+from tempest.tests import base
+
+
+class TestConfigSnapshot(base.TestCase):
+
+    def setUp(self):
+        super(TestConfigSnapshot, self).setUp()
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        self.snapshot_path = os.path.join(tmp_dir, 'snapshot')
+        self.config_path = os.path.join(tmp_dir, 'tempest.conf')
+        with open(self.config_path, 'w') as config_file:
+            config_file.write('[compute]\n')
+        self.groups = {'compute': {'build_interval': 1,
+                                   'image_ref': 'fake_image'}}
+
+    def test_load_missing_snapshot(self):
+        snapshot = config.ConfigSnapshot(self.snapshot_path, self.config_path)
+        self.assertIsNone(snapshot.load())
+
+    def test_save_and_load(self):
+        config.ConfigSnapshot(self.snapshot_path,
+                              self.config_path).save(self.groups)
+        groups = config.ConfigSnapshot(self.snapshot_path,
+                                       self.config_path).load()
+        self.assertEqual(['compute'], groups.keys())
+        self.assertEqual(1, groups['compute'].build_interval)
+        self.assertEqual('fake_image', groups['compute']['image_ref'])
+
+    def test_loaded_groups_are_read_only(self):
+        config.ConfigSnapshot(self.snapshot_path,
+                              self.config_path).save(self.groups)
+        groups = config.ConfigSnapshot(self.snapshot_path,
+                                       self.config_path).load()
+        self.assertRaises(AttributeError, setattr, groups['compute'],
+                          'build_interval', 2)
+        self.assertEqual(1, groups['compute'].build_interval)
+
+    def test_config_file_change_invalidates_snapshot(self):
+        config.ConfigSnapshot(self.snapshot_path,
+                              self.config_path).save(self.groups)
+        with open(self.config_path, 'a') as config_file:
+            config_file.write('build_interval = 2\n')
+        snapshot = config.ConfigSnapshot(self.snapshot_path, self.config_path)
+        self.assertIsNone(snapshot.load())
+
+    def test_options_change_invalidates_snapshot(self):
+        config.ConfigSnapshot(self.snapshot_path,
+                              self.config_path).save(self.groups)
+        opt_group, options = config._opts[0]
+        self.patch('tempest.config._opts',
+                   new=[(opt_group, options[:-1])] + config._opts[1:])
+        snapshot = config.ConfigSnapshot(self.snapshot_path, self.config_path)
+        self.assertIsNone(snapshot.load())
+
+
+class TestConfigSnapshotProcesses(base.TestCase):
+
+    script = """
+from tempest import config
+admin = config.CONF.compute_admin
+stages = [stage for stage, _ in config.CONF.startup_times]
+print('%s %s %s %s' % (admin.username, admin.password, admin.tenant_name,
+                       'register' in stages))
+"""
+
+    def setUp(self):
+        super(TestConfigSnapshotProcesses, self).setUp()
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        with open(os.path.join(tmp_dir, 'tempest.conf'), 'w') as conf_file:
+            conf_file.write('[DEFAULT]\n'
+                            'lock_path = %s\n'
+                            '[identity]\n'
+                            'admin_username = boss\n'
+                            'admin_password = pw\n'
+                            'admin_tenant_name = boss\n' % tmp_dir)
+        self.env = dict(os.environ,
+                        TEMPEST_CONFIG_DIR=tmp_dir,
+                        TEMPEST_CONFIG='tempest.conf',
+                        TEMPEST_CONFIG_SNAPSHOT=os.path.join(tmp_dir,
+                                                             'snapshot'))
+
+    def _run(self):
+        proc = subprocess.Popen([sys.executable, '-c', self.script],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, env=self.env)
+        out, err = proc.communicate()
+        self.assertEqual(0, proc.returncode, err)
+        return out.split()
+
+    def test_compute_admin_fallback_survives_snapshot(self):
+        self.assertEqual(['boss', 'pw', 'boss', 'True'], self._run())
+        # The second process loads the snapshot written by the first one
+        self.assertEqual(['boss', 'pw', 'boss', 'False'], self._run())
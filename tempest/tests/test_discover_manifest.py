@@ -0,0 +1,135 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import unittest
+
+import fixtures
+
+from tempest.test_discover import manifest
+from tempest.tests import base
+
+
+class FakeTest(unittest.TestCase):
+
+    def test_one(self):
+        pass
+
+    def test_two(self):
+        pass
+
+FakeTest.__module__ = 'tempest.api.fake'
+
+
+class TestManifest(base.TestCase):
+
+    def setUp(self):
+        super(TestManifest, self).setUp()
+        self.tmp_dir = self.useFixture(fixtures.TempDir()).path
+        self.path = os.path.join(self.tmp_dir, 'manifest.json')
+        self.suite = unittest.TestSuite([
+            unittest.TestSuite([FakeTest('test_one')]),
+            FakeTest('test_two')])
+
+    def test_load_missing_manifest(self):
+        self.assertFalse(manifest.TestManifest(self.path, 'abc').load())
+
+    def test_save_and_load(self):
+        self.assertTrue(
+            manifest.TestManifest(self.path, 'abc', 'test*.py').save(
+                self.suite))
+        loaded = manifest.TestManifest(self.path, 'abc', 'test*.py')
+        self.assertTrue(loaded.load())
+        self.assertEqual([('tempest.api.fake',
+                           [FakeTest('test_one').id(),
+                            FakeTest('test_two').id()])],
+                         loaded.modules)
+
+    def test_stale_manifest(self):
+        manifest.TestManifest(self.path, 'abc', 'test*.py').save(self.suite)
+        self.assertFalse(
+            manifest.TestManifest(self.path, 'def', 'test*.py').load())
+        self.assertFalse(
+            manifest.TestManifest(self.path, 'abc', 'foo*.py').load())
+
+    def test_save_with_import_failure(self):
+        failure = unittest.FunctionTestCase(lambda: None)
+        self.suite.addTest(failure)
+        self.assertFalse(
+            manifest.TestManifest(self.path, 'abc').save(self.suite))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_placeholder_suite(self):
+        test_manifest = manifest.TestManifest(self.path, 'abc')
+        test_manifest.save(self.suite)
+        ids = [test.id() for test in test_manifest.placeholder_suite()]
+        self.assertEqual([FakeTest('test_one').id(),
+                          FakeTest('test_two').id()], ids)
+
+    def test_modules_for(self):
+        test_manifest = manifest.TestManifest(self.path, 'abc')
+        test_manifest.save(self.suite)
+        self.assertEqual(['tempest.api.fake'],
+                         test_manifest.modules_for(
+                             [FakeTest('test_two').id()]))
+        self.assertIsNone(test_manifest.modules_for(['tempest.api.unknown']))
+
+
+class TestSourceFingerprint(base.TestCase):
+
+    def setUp(self):
+        super(TestSourceFingerprint, self).setUp()
+        self.base_path = self.useFixture(fixtures.TempDir()).path
+        os.mkdir(os.path.join(self.base_path, 'tempest'))
+        self.source = os.path.join(self.base_path, 'tempest', 'test_a.py')
+        with open(self.source, 'w') as source:
+            source.write('pass\n')
+        self.useFixture(fixtures.EnvironmentVariable('TEMPEST_CONFIG_DIR',
+                                                     self.base_path))
+
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(manifest.source_fingerprint(self.base_path),
+                         manifest.source_fingerprint(self.base_path))
+
+    def test_fingerprint_changes_with_sources(self):
+        before = manifest.source_fingerprint(self.base_path)
+        with open(self.source, 'a') as source:
+            source.write('pass\n')
+        self.assertNotEqual(before,
+                            manifest.source_fingerprint(self.base_path))
+
+    def test_fingerprint_changes_with_config(self):
+        before = manifest.source_fingerprint(self.base_path)
+        with open(os.path.join(self.base_path, 'tempest.conf'), 'w') as conf:
+            conf.write('[DEFAULT]\n')
+        self.assertNotEqual(before,
+                            manifest.source_fingerprint(self.base_path))
+
+
+class TestRunnerOptions(base.TestCase):
+
+    def test_listing(self):
+        self.assertEqual((True, None),
+                         manifest.runner_options(['discover', '--list']))
+
+    def test_load_list(self):
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        load_list = os.path.join(tmp_dir, 'ids')
+        with open(load_list, 'w') as id_file:
+            id_file.write('tempest.a.b\n\ntempest.c.d\n')
+        self.assertEqual((False, ['tempest.a.b', 'tempest.c.d']),
+                         manifest.runner_options(['--load-list', load_list]))
+        self.assertEqual((False, ['tempest.a.b', 'tempest.c.d']),
+                         manifest.runner_options(['--load-list=' + load_list]))
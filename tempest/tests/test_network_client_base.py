@@ -0,0 +1,89 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import mock
+
+from tempest import config
+from tempest.services.network import network_client_base
+from tempest.tests import base
+from tempest.tests import fake_auth_provider
+from tempest.tests import fake_config
+
+
+class FakeNetworkClient(network_client_base.NetworkClientBase):
+
+    def get_rest_client(self, auth_provider):
+        return mock.Mock()
+
+    def serialize(self, data):
+        return json.dumps(data)
+
+    def deserialize_single(self, body):
+        return json.loads(body)
+
+    def deserialize_list(self, body):
+        return json.loads(body).values()[0]
+
+
+class TestNetworkClientBase(base.TestCase):
+
+    def setUp(self):
+        super(TestNetworkClientBase, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.client = FakeNetworkClient(
+            fake_auth_provider.FakeAuthProvider())
+        self.rest_client = self.client.rest_client
+        self.rest_client.get.return_value = ({}, '{"pools": [{"id": 1}]}')
+
+    def test_get_uri(self):
+        self.assertEqual('v2.0/networks', self.client.get_uri('networks'))
+        self.assertEqual('v2.0/lb/health_monitors',
+                         self.client.get_uri('health_monitors'))
+        self.assertEqual('v2.0/metering/metering-labels',
+                         self.client.get_uri('metering_labels'))
+
+    def test_list(self):
+        resp, body = self.client.list_pools(name='foo')
+        self.assertEqual({'pools': [{'id': 1}]}, body)
+        self.rest_client.get.assert_called_once_with(
+            'v2.0/lb/pools?name=foo', None)
+
+    def test_show_update_delete(self):
+        self.rest_client.put.return_value = ({}, '{"ikepolicy": {}}')
+        self.client.show_pool('id1')
+        self.rest_client.get.assert_called_once_with('v2.0/lb/pools/id1',
+                                                     None)
+        self.client.update_ikepolicy('id2', name='bar')
+        self.rest_client.put.assert_called_once_with(
+            'v2.0/vpn/ikepolicies/id2', '{"ikepolicy": {"name": "bar"}}',
+            None)
+        self.client.delete_firewall_policy('id3')
+        self.rest_client.delete.assert_called_once_with(
+            'v2.0/fw/firewall_policies/id3', None)
+
+    def test_method_is_cached_on_instance(self):
+        list_pools = self.client.list_pools
+        self.assertIs(list_pools, self.client.list_pools)
+        self.assertIs(list_pools, self.client.__dict__['list_pools'])
+        other_client = FakeNetworkClient(
+            fake_auth_provider.FakeAuthProvider())
+        self.assertIsNot(list_pools, other_client.list_pools)
+
+    def test_unknown_method(self):
+        self.assertRaises(AttributeError, getattr, self.client, 'foo_pools')
+        self.assertFalse(hasattr(self.client, '__deepcopy__'))
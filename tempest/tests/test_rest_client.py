@@ -13,10 +13,12 @@
 #    under the License.
 
 import json
+import threading
 
 import httplib2
 from oslotest import mockpatch
 
+from tempest.common import rate_limiter
 from tempest.common import rest_client
 from tempest.common import xml_utils as xml
 from tempest import config
@@ -542,6 +544,30 @@ class TestNegativeRestClient(BaseRestClientTestClass):
                           self.negative_rest_client.send_request,
                           'OTHER', self.url, [])
 
+    def test_send_requests(self):
+        requests = [('GET', 'fake/%s', [str(i)], None) for i in range(10)]
+        responses = self.negative_rest_client.send_requests(requests, 4)
+        self.assertEqual(['fake/%d' % i for i in range(10)],
+                         [body['uri'][-len('fake/%d' % i):]
+                          for i, (__, body) in enumerate(responses)])
+
+    def test_send_requests_exception(self):
+        responses = self.negative_rest_client.send_requests(
+            [('GET', self.url, [], None), ('OTHER', self.url, [], None)], 2)
+        self.assertEqual('GET', responses[0][1]['method'])
+        self.assertIsInstance(responses[1], AssertionError)
+
+    def test_thread_local_http_obj(self):
+        http_objs = []
+        thread = threading.Thread(
+            target=lambda: http_objs.append(
+                self.negative_rest_client.http_obj))
+        thread.start()
+        thread.join()
+        self.assertIsNot(self.negative_rest_client.http_obj, http_objs[0])
+        self.assertIs(self.negative_rest_client.http_obj,
+                      self.negative_rest_client.http_obj)
+
 
 class TestExpectedSuccess(BaseRestClientTestClass):
 
@@ -588,3 +614,40 @@ class TestExpectedSuccess(BaseRestClientTestClass):
         read_code = 202
         self.assertRaises(AssertionError, self.rest_client.expected_success,
                           expected_code, read_code)
+
+
+class TestRestClientRateLimiting(BaseRestClientTestClass):
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestRestClientRateLimiting, self).setUp()
+        self.rest_client.service = 'compute'
+        self.useFixture(mockpatch.PatchObject(self.rest_client,
+                                              '_error_checker'))
+        self.useFixture(mockpatch.PatchObject(self.rest_client,
+                                              'is_absolute_limit',
+                                              return_value=False))
+        limited = httplib2.Response({'status': 413, 'retry-after': '3'})
+        self.useFixture(mockpatch.PatchObject(
+            self.rest_client, '_request',
+            side_effect=[(limited, '{}'), (httplib2.Response({}), '{}')]))
+        self.sleep = self.patch('time.sleep')
+        rate_limiter.pop_throttled_time()
+
+    def test_retry_after_without_limiter(self):
+        self.patch('tempest.common.rate_limiter.get_limiter',
+                   return_value=None)
+        resp, __ = self.rest_client.get(self.url)
+        self.assertEqual(200, resp.status)
+        self.sleep.assert_called_once_with(3)
+        self.assertEqual({('compute', 'GET'): 3},
+                         rate_limiter.pop_throttled_time())
+
+    def test_retry_after_with_limiter(self):
+        get_limiter = self.patch('tempest.common.rate_limiter.get_limiter')
+        limiter = get_limiter.return_value
+        resp, __ = self.rest_client.get(self.url)
+        self.assertEqual(200, resp.status)
+        limiter.throttle.assert_called_once_with('compute', 'GET', 3)
+        self.assertEqual(2, limiter.acquire.call_count)
+        self.assertFalse(self.sleep.called)
@@ -0,0 +1,116 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+from boto import exception
+import fixtures
+import mock
+
+from tempest import config
+from tempest.tests import base
+from tempest.tests import fake_config
+from tempest.thirdparty.boto.utils import s3
+
+
+class TestS3UploadDir(base.TestCase):
+
+    def setUp(self):
+        super(TestS3UploadDir, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.path = self.useFixture(fixtures.TempDir()).path
+        os.mkdir(os.path.join(self.path, 'sub'))
+        for name, size in (('small', 10), ('sub/big', 25)):
+            with open(os.path.join(self.path, name), 'wb') as f:
+                f.write('x' * size)
+        self.bucket = mock.Mock()
+        self.bucket.name = 'bucket'
+        self.key_class = self.patch('boto.s3.key.Key')
+        self.addCleanup(s3.pop_timings, 'bucket')
+        # Parts much smaller than S3 allows keep the files small
+        self.patch('tempest.thirdparty.boto.utils.s3.MIN_PART_SIZE', new=10)
+
+    def _upload(self, **kwargs):
+        s3.s3_upload_dir(self.bucket, self.path, prefix='pre/',
+                         concurrency=2, **kwargs)
+
+    def test_upload_files(self):
+        self._upload(multipart_threshold=0)
+        targets = sorted(call[1][0] for call in
+                         self.key_class.return_value.mock_calls
+                         if call[0] == 'set_contents_from_filename')
+        self.assertEqual([os.path.join(self.path, 'small'),
+                          os.path.join(self.path, 'sub', 'big')], targets)
+        self.assertFalse(self.bucket.initiate_multipart_upload.called)
+        self.assertEqual((2, 35), s3.pop_timings('bucket')['upload'][:2])
+
+    def test_upload_parts(self):
+        upload = self.bucket.initiate_multipart_upload.return_value
+        parts = []
+        upload.upload_part_from_file.side_effect = (
+            lambda fp, part_num, size: parts.append((part_num, fp.read(size),
+                                                     size)))
+        self._upload(multipart_threshold=20, chunk_size=10)
+        self.bucket.initiate_multipart_upload.assert_called_once_with(
+            'pre/sub/big')
+        self.assertEqual([(1, 'x' * 10, 10), (2, 'x' * 10, 10),
+                          (3, 'x' * 5, 5)], sorted(parts))
+        upload.complete_upload.assert_called_once_with()
+        self.assertEqual(1, self.key_class.call_count)
+
+    def test_chunk_size_below_minimum_part_size(self):
+        self.patch('tempest.thirdparty.boto.utils.s3.MIN_PART_SIZE', new=20)
+        upload = self.bucket.initiate_multipart_upload.return_value
+        parts = []
+        upload.upload_part_from_file.side_effect = (
+            lambda fp, part_num, size: parts.append((part_num, size)))
+        self._upload(multipart_threshold=20, chunk_size=10)
+        self.assertEqual([(1, 20), (2, 5)], sorted(parts))
+
+    def test_failed_part_cancels_upload(self):
+        upload = self.bucket.initiate_multipart_upload.return_value
+        upload.upload_part_from_file.side_effect = IOError()
+        self.assertRaises(IOError, self._upload, multipart_threshold=20,
+                          chunk_size=10)
+        upload.cancel_upload.assert_called_once_with()
+        self.assertFalse(upload.complete_upload.called)
+
+
+class TestS3DeleteKeys(base.TestCase):
+
+    def setUp(self):
+        super(TestS3DeleteKeys, self).setUp()
+        self.bucket = mock.Mock()
+        self.bucket.name = 'bucket'
+        self.bucket.list.return_value = [mock.Mock(key='a'),
+                                         mock.Mock(key='b')]
+        self.addCleanup(s3.pop_timings, 'bucket')
+
+    def test_bulk_delete(self):
+        self.bucket.delete_keys.return_value.errors = [mock.Mock(key='b')]
+        self.assertEqual(1, s3.s3_delete_keys(self.bucket))
+        self.bucket.delete_keys.assert_called_once_with(['a', 'b'],
+                                                        quiet=True)
+        self.assertFalse(self.bucket.delete_key.called)
+        self.assertEqual((1, 0), s3.pop_timings('bucket')['delete'][:2])
+
+    def test_fallback_to_single_deletes(self):
+        self.bucket.delete_keys.side_effect = exception.S3ResponseError(
+            501, 'Not Implemented')
+        self.bucket.delete_key.side_effect = [None, IOError()]
+        self.assertEqual(1, s3.s3_delete_keys(self.bucket))
+        self.assertEqual([mock.call('a'), mock.call('b')],
+                         self.bucket.delete_key.call_args_list)
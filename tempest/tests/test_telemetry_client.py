@@ -0,0 +1,101 @@
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import urlparse
+
+import mock
+
+from tempest import config
+from tempest.services.telemetry.json import telemetry_client
+from tempest.tests import base
+from tempest.tests import fake_auth_provider
+from tempest.tests import fake_config
+
+
+class FakeTelemetryClient(telemetry_client.TelemetryClientJSON):
+
+    def get_rest_client(self, auth_provider):
+        return mock.Mock()
+
+
+class TestTelemetryClient(base.TestCase):
+
+    def setUp(self):
+        super(TestTelemetryClient, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.stubs.Set(config, 'TempestConfigPrivate', fake_config.FakePrivate)
+        self.client = FakeTelemetryClient(
+            fake_auth_provider.FakeAuthProvider())
+        self.rest_client = self.client.rest_client
+        self.rest_client.get.return_value = ({}, '[]')
+
+    def _params(self, call):
+        uri = call[0][0]
+        path, _, query = uri.partition('?')
+        return path, urlparse.parse_qsl(query)
+
+    def test_list_samples_single_query(self):
+        self.client.list_samples('cpu', ('resource', 'eq', 'r1'), limit=1)
+        path, params = self._params(self.rest_client.get.call_args)
+        self.assertEqual('v2/meters/cpu', path)
+        self.assertEqual([('q.field', 'resource'), ('q.op', 'eq'),
+                          ('q.value', 'r1'), ('limit', '1')], params)
+
+    def test_list_samples_multiple_queries(self):
+        self.client.list_samples('cpu', [('resource', 'eq', 'r1'),
+                                         ('timestamp', 'gt', 't1')])
+        path, params = self._params(self.rest_client.get.call_args)
+        self.assertEqual([('q.field', 'resource'), ('q.op', 'eq'),
+                          ('q.value', 'r1'), ('q.field', 'timestamp'),
+                          ('q.op', 'gt'), ('q.value', 't1')], params)
+
+    def test_deserialize_iter(self):
+        body = ' [ {"a": 1},\n{"b": [1, 2]} ,{"c": "x\ny"}]\n'
+        self.assertEqual([{'a': 1}, {'b': [1, 2]}, {'c': 'x\ny'}],
+                         list(self.client.deserialize_iter(body)))
+        self.assertEqual([], list(self.client.deserialize_iter('[ ]')))
+        self.assertRaises(ValueError, list,
+                          self.client.deserialize_iter('{"a": 1}'))
+        self.assertRaises(ValueError, list,
+                          self.client.deserialize_iter('[1 2]'))
+
+    def _sample(self, message_id, timestamp):
+        return {'message_id': message_id, 'timestamp': timestamp}
+
+    def test_iter_samples(self):
+        samples = [self._sample('m1', 't5'), self._sample('m2', 't4'),
+                   self._sample('m3', 't4'), self._sample('m4', 't4'),
+                   self._sample('m5', 't3'), self._sample('m6', 't2')]
+
+        def get(uri):
+            path, params = self._params(((uri,),))
+            limit = int(dict(params)['limit'])
+            page = samples
+            if ('q.field', 'timestamp') in params:
+                before = params[-2][1]
+                page = [s for s in samples if s['timestamp'] <= before]
+            return {}, json.dumps(page[:limit])
+
+        self.rest_client.get.side_effect = get
+        actual = list(self.client.iter_samples(
+            'cpu', ('resource', 'eq', 'r1'), page_size=2))
+        self.assertEqual(samples, actual)
+        uris = [call[0][0] for call in self.rest_client.get.call_args_list]
+        self.assertEqual(6, len(uris))
+        # A page only holding samples returned already doubles the limit
+        self.assertEqual(['2', '2', '2', '4', '2', '2'],
+                         [dict(self._params(((uri,),))[1])['limit']
+                          for uri in uris])
@@ -47,3 +47,91 @@ class TestImageWaiters(base.TestCase):
         self.assertRaises(exceptions.AddImageException,
                           waiters.wait_for_image_status,
                           self.client, 'fake_image_id', 'active')
+
+
+class TestStackEventWatcher(base.TestCase):
+
+    def setUp(self):
+        super(TestStackEventWatcher, self).setUp()
+        self.events = []
+        self.markers = []
+        self.sleep = self.patch('time.sleep',
+                                side_effect=self._next_events)
+        self.pending_events = []
+        self.watcher = waiters.StackEventWatcher(self._list_events,
+                                                 'stack/id', 1, 10)
+
+    def _list_events(self, marker):
+        self.markers.append(marker)
+        return list(self.events)
+
+    def _next_events(self, seconds):
+        self.events.extend(self.pending_events.pop(0))
+
+    def _event(self, event_id, name, status, seconds=0):
+        return {'id': event_id, 'resource_name': name,
+                'resource_status': status,
+                'resource_status_reason': 'reason',
+                'event_time': '2014-06-03T20:59:%02dZ' % seconds}
+
+    def test_poll(self):
+        self.events = [self._event('1', 'a', 'CREATE_IN_PROGRESS'),
+                       self._event('2', 'b', 'CREATE_IN_PROGRESS')]
+        self.assertEqual(2, len(self.watcher.poll()))
+        self.events.append(self._event('3', 'a', 'CREATE_COMPLETE', 5))
+        self.assertEqual([self.events[2]], self.watcher.poll())
+        self.assertEqual([], self.watcher.poll())
+        self.assertEqual([None, '2', '3'], self.markers)
+        self.assertEqual('CREATE_COMPLETE',
+                         self.watcher.resources['a']['resource_status'])
+        self.assertEqual([('CREATE_IN_PROGRESS', '2014-06-03T20:59:00Z'),
+                          ('CREATE_COMPLETE', '2014-06-03T20:59:05Z')],
+                         self.watcher.transitions['a'])
+        self.assertEqual({'a': 5, 'b': 0}, self.watcher.durations())
+
+    def test_poll_marker_rejected(self):
+        self.events = [self._event('1', 'a', 'CREATE_IN_PROGRESS')]
+        self.watcher.poll()
+        self.events.append(self._event('2', 'a', 'CREATE_COMPLETE', 5))
+
+        def list_events(marker):
+            self.markers.append(marker)
+            if marker is not None:
+                raise exceptions.NotFound()
+            return list(self.events)
+
+        self.watcher.list_events = list_events
+        self.assertEqual([self.events[1]], self.watcher.poll())
+        self.assertEqual([None, '1', None], self.markers)
+        self.assertEqual([('CREATE_IN_PROGRESS', '2014-06-03T20:59:00Z'),
+                          ('CREATE_COMPLETE', '2014-06-03T20:59:05Z')],
+                         self.watcher.transitions['a'])
+
+    def test_poll_unmarked_failure(self):
+        self.watcher.list_events = mock.Mock(
+            side_effect=exceptions.BadRequest())
+        self.assertRaises(exceptions.BadRequest, self.watcher.poll)
+
+    def test_wait_for(self):
+        self.events = [self._event('1', 'a', 'CREATE_IN_PROGRESS')]
+        self.pending_events = [
+            [self._event('2', 'b', 'CREATE_IN_PROGRESS', 1)],
+            [self._event('3', 'a', 'CREATE_COMPLETE', 2),
+             self._event('4', 'b', 'CREATE_COMPLETE', 3)]]
+        self.watcher.wait_for({'a': 'CREATE_COMPLETE',
+                               'b': 'CREATE_COMPLETE'})
+        self.assertEqual(3, len(self.markers))
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_wait_for_failure(self):
+        self.events = [self._event('1', 'a', 'CREATE_IN_PROGRESS'),
+                       self._event('2', 'a', 'CREATE_FAILED', 1)]
+        self.assertRaises(exceptions.StackResourceBuildErrorException,
+                          self.watcher.wait_for, {'a': 'CREATE_COMPLETE'})
+
+    def test_wait_for_timeout(self):
+        self.patch('time.time', side_effect=[0, 0, 11])
+        self.sleep.side_effect = None
+        self.assertRaises(exceptions.TimeoutException,
+                          self.watcher.wait_for, {'a': 'CREATE_COMPLETE'})
+        self.assertEqual(2, len(self.markers))
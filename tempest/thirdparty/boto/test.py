@@ -32,6 +32,7 @@ from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import log as logging
 import tempest.test
+from tempest.thirdparty.boto.utils import s3 as s3_utils
 from tempest.thirdparty.boto.utils import wait
 
 CONF = config.CONF
@@ -212,6 +213,13 @@ class BotoTestCase(tempest.test.BaseTestCase):
             raise cls.skipException("S3 " + cls.__name__ + ": " +
                                     cls.conclusion['S3_CAN_CONNECT_ERROR'])
 
+    # The destroy methods which leave their waits to tearDownClass, so that
+    # the waits of consecutive ones end together
+    batched_cleanups = set(('destroy_reservation', 'destroy_volume_wait',
+                            'destroy_snapshot_wait'))
+    # (kind, connection) -> BatchWaiter while tearDownClass runs
+    _teardown_waiters = None
+
     @classmethod
     def addResourceCleanUp(cls, function, *args, **kwargs):
         """Adds CleanUp callable, used by tearDownClass.
@@ -250,9 +258,13 @@ class BotoTestCase(tempest.test.BaseTestCase):
         when you overwrite this function don't forget to call this too.
         """
         fail_count = 0
+        cls._teardown_waiters = {}
         trash_keys = sorted(cls._resource_trash_bin, reverse=True)
         for key in trash_keys:
             (function, pos_args, kw_args) = cls._resource_trash_bin[key]
+            # The resources still being destroyed may be needed gone first
+            if getattr(function, '__name__', None) not in cls.batched_cleanups:
+                fail_count += cls._finish_teardown_waits()
             try:
                 func_name = friendly_function_call_str(function, *pos_args,
                                                        **kw_args)
@@ -263,6 +275,8 @@ class BotoTestCase(tempest.test.BaseTestCase):
                 LOG.exception("Cleanup failed %s" % func_name)
             finally:
                 del cls._resource_trash_bin[key]
+        fail_count += cls._finish_teardown_waits()
+        cls._teardown_waiters = None
         cls.clear_isolated_creds()
         super(BotoTestCase, cls).tearDownClass()
         # NOTE(afazekas): let the super called even on exceptions
@@ -427,48 +441,79 @@ class BotoTestCase(tempest.test.BaseTestCase):
                 if isinstance(bucket, basestring):
                     bucket = conn.lookup(bucket)
                     assert isinstance(bucket, s3.bucket.Bucket)
-                for obj in bucket.list():
-                    try:
-                        bucket.delete_key(obj.key)
-                        obj.close()
-                    except BaseException:
-                        LOG.exception("Failed to delete key %s " % obj.key)
-                        exc_num += 1
+                exc_num += s3_utils.s3_delete_keys(bucket)
             conn.delete_bucket(bucket)
         except BaseException:
             LOG.exception("Failed to destroy bucket %s " % bucket)
             exc_num += 1
+        name = getattr(bucket, 'name', bucket)
+        for operation, (objects, size, seconds) in sorted(
+                s3_utils.pop_timings(name).items()):
+            LOG.info("Bucket %s: %s of %d objects, %d bytes, took %.2fs",
+                     name, operation, objects, size, seconds)
         if exc_num:
             raise exceptions.TearDownException(num=exc_num)
 
     @classmethod
-    def destroy_reservation(cls, reservation):
-        """Terminate instances in a reservation, just for teardown."""
-        exc_num = 0
+    def _batch_waiter(cls, kind, connection):
+        """Return a (waiter, deferred) tuple for a kind of resources.
 
-        def _instance_state():
-            try:
-                instance.update(validate=True)
-            except ValueError:
-                return "_GONE"
-            except exception.EC2ResponseError as exc:
-                if cls.ec2_error_code.\
-                        client.InvalidInstanceID.NotFound.match(exc) is None:
-                    return "_GONE"
-                # NOTE(afazekas): incorrect code,
-                # but the resource must be destoreyd
-                if exc.error_code == "InstanceNotFound":
-                    return "_GONE"
+        In tearDownClass the destroy methods share a waiter per kind and
+        connection, deferred is True and tearDownClass does the waiting.
+        Otherwise the caller has to wait itself.
+        """
+        deferred = cls._teardown_waiters is not None
+        if deferred and (kind, connection) in cls._teardown_waiters:
+            return cls._teardown_waiters[(kind, connection)], True
+        if kind == 'instance':
+            def list_instances():
+                return [instance
+                        for reservation in connection.get_all_instances()
+                        for instance in reservation.instances]
+            waiter = wait.BatchWaiter(list_instances, 'state')
+        elif kind == 'volume':
+            waiter = wait.BatchWaiter(connection.get_all_volumes, 'status')
+        else:
+            waiter = wait.BatchWaiter(
+                lambda: connection.get_all_snapshots(owner='self'), 'status')
+        if deferred:
+            cls._teardown_waiters[(kind, connection)] = waiter
+        return waiter, deferred
+
+    @staticmethod
+    def _finish_waits(waiters):
+        """Wait for BatchWaiters, return the number of failed waits."""
+        try:
+            wait.batch_wait(waiters)
+        except BaseException:
+            LOG.exception("Failed to wait for the destroyed resources")
+        return sum(len(waiter.waits) + len(waiter.failed)
+                   for waiter in waiters)
 
-            return instance.state
+    @classmethod
+    def _finish_teardown_waits(cls):
+        waiters = cls._teardown_waiters.values()
+        cls._teardown_waiters.clear()
+        if not waiters:
+            return 0
+        return cls._finish_waits(waiters)
 
+    @classmethod
+    def destroy_reservation(cls, reservation):
+        """Terminate instances in a reservation, just for teardown."""
+        exc_num = 0
+        waiter, deferred = cls._batch_waiter('instance',
+                                             reservation.connection)
         for instance in reservation.instances:
             try:
                 instance.terminate()
-                wait.re_search_wait(_instance_state, "_GONE")
             except BaseException:
                 LOG.exception("Failed to terminate instance %s " % instance)
                 exc_num += 1
+            else:
+                waiter.add(instance.id, waiter.GONE)
+        if not deferred:
+            exc_num += cls._finish_waits([waiter])
         if exc_num:
             raise exceptions.TearDownException(num=exc_num)
 
@@ -488,44 +533,55 @@ class BotoTestCase(tempest.test.BaseTestCase):
         """Delete volume, tryies to detach first.
            Use just for teardown!
         """
-        exc_num = 0
         snaps = volume.snapshots()
         if len(snaps):
             LOG.critical("%s Volume has %s snapshot(s)", volume.id,
-                         map(snaps.id, snaps))
+                         [snap.id for snap in snaps])
 
         # NOTE(afazekas): detaching/attching not valid EC2 status
-        def _volume_state():
-            volume.update(validate=True)
-            try:
-                if volume.status != "available":
-                    volume.detach(force=True)
-            except BaseException:
-                LOG.exception("Failed to detach volume %s" % volume)
-                # exc_num += 1 "nonlocal" not in python2
-            return volume.status
-
         try:
-            wait.re_search_wait(_volume_state, "available")
-            # not validates status
-            LOG.info(_volume_state())
-            volume.delete()
+            volume.update(validate=True)
+            if volume.status != "available":
+                volume.detach(force=True)
         except BaseException:
-            LOG.exception("Failed to delete volume %s" % volume)
-            exc_num += 1
-        if exc_num:
-            raise exceptions.TearDownException(num=exc_num)
+            LOG.exception("Failed to detach volume %s" % volume)
+
+        waiter, deferred = cls._batch_waiter('volume', volume.connection)
+        ready = None
+        if deferred:
+            # The snapshots destroyed in the same batch must be gone first
+            snap_waiter = cls._teardown_waiters.get(('snapshot',
+                                                     volume.connection))
+            if snap_waiter is not None:
+                def ready():
+                    return not any(snap.id in snap_waiter.waits
+                                   for snap in snaps)
+
+        def _delete(status):
+            if status == "available":
+                volume.delete()
+
+        def _detach(status):
+            # The detach is sent again until the volume gets available
+            volume.detach(force=True)
+
+        waiter.add(volume.id, set(("available", waiter.GONE)), _delete,
+                   ready, _detach)
+        if not deferred:
+            exc_num = cls._finish_waits([waiter])
+            if exc_num:
+                raise exceptions.TearDownException(num=exc_num)
 
     @classmethod
     def destroy_snapshot_wait(cls, snapshot):
         """delete snaphot, wait until not exists."""
         snapshot.delete()
-
-        def _update():
-            snapshot.update(validate=True)
-
-        wait.wait_exception(_update)
-
+        waiter, deferred = cls._batch_waiter('snapshot', snapshot.connection)
+        waiter.add(snapshot.id, waiter.GONE)
+        if not deferred:
+            exc_num = cls._finish_waits([waiter])
+            if exc_num:
+                raise exceptions.TearDownException(num=exc_num)
 
 # you can specify tuples if you want to specify the status pattern
 for code in ('AddressLimitExceeded', 'AttachmentLimitExceeded', 'AuthFailure',
@@ -15,6 +15,7 @@
 
 from boto import exception
 
+from tempest.common import console
 from tempest.common.utils import data_utils
 from tempest.common.utils.linux import remote_client
 from tempest import config
@@ -275,9 +276,16 @@ class InstanceRunTest(boto_test.BotoTestCase):
         resp = ssh.write_to_console(text)
         self.assertFalse(resp)
 
+        # EC2 has no way to ask for the tail of the console output, it is
+        # always fetched whole, but only the lines added since the previous
+        # poll are searched. max_lines=0 keeps ConsoleLog from fetching it
+        # again with a longer tail.
+        console_log = console.ConsoleLog(
+            lambda length: instance.get_console_output().output,
+            max_lines=0)
+
         def _output():
-            output = instance.get_console_output()
-            return output.output
+            return '\n'.join(console_log.read())
 
         wait.re_search_wait(_output, text)
         part_lines = ssh.get_partitions().split('\n')
@@ -14,28 +14,188 @@
 #    under the License.
 
 import contextlib
+import functools
+from multiprocessing import pool
 import os
 import re
+import sys
+import threading
+import time
 
 import boto
+import boto.exception
 import boto.s3.key
+import six
 
+from tempest import config
 from tempest.openstack.common import log as logging
 
+CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
+# S3 rejects multipart uploads having a part smaller than this, but the last
+MIN_PART_SIZE = 5 * 1024 * 1024
 
-def s3_upload_dir(bucket, path, prefix="", connection_data=None):
-    if isinstance(bucket, basestring):
-        with contextlib.closing(boto.connect_s3(**connection_data)) as conn:
-            bucket = conn.lookup(bucket)
-    for root, dirs, files in os.walk(path):
-        for fil in files:
-            with contextlib.closing(boto.s3.key.Key(bucket)) as key:
+# bucket name -> operation -> [objects, bytes, seconds]
+_TIMINGS = {}
+_TIMINGS_LOCK = threading.Lock()
+
+
+def _add_timing(bucket_name, operation, objects, size, seconds):
+    with _TIMINGS_LOCK:
+        counters = _TIMINGS.setdefault(bucket_name, {}).setdefault(
+            operation, [0, 0, 0.0])
+        counters[0] += objects
+        counters[1] += size
+        counters[2] += seconds
+
+
+def pop_timings(bucket_name):
+    """Return and reset the upload and delete counters of a bucket.
+
+    :return: dict mapping 'upload' and 'delete' to the number of objects,
+        the number of bytes and the seconds spent
+    """
+    with _TIMINGS_LOCK:
+        timings = _TIMINGS.pop(bucket_name, {})
+    return dict((operation, tuple(counters))
+                for operation, counters in timings.items())
+
+
+def _run_concurrently(tasks, concurrency):
+    def run(task):
+        try:
+            task()
+        except Exception:
+            return sys.exc_info()
+
+    workers = pool.ThreadPool(max(1, min(concurrency, len(tasks))))
+    try:
+        errors = [error for error in workers.map(run, tasks) if error]
+    finally:
+        workers.close()
+        workers.join()
+    if errors:
+        six.reraise(*errors[0])
+
+
+def _upload_file(bucket, source, target):
+    with contextlib.closing(boto.s3.key.Key(bucket)) as key:
+        key.key = target
+        LOG.info("Uploading %s to %s/%s", source, bucket.name, target)
+        key.set_contents_from_filename(source)
+
+
+def _upload_part(upload, source, part_num, offset, size):
+    with open(source, 'rb') as part_file:
+        part_file.seek(offset)
+        upload.upload_part_from_file(part_file, part_num, size=size)
+
+
+def _upload_dir(bucket, path, prefix, concurrency, multipart_threshold,
+                chunk_size):
+    start = time.time()
+    tasks = []
+    uploads = []
+    objects = 0
+    total_size = 0
+    try:
+        for root, dirs, files in os.walk(path):
+            for fil in files:
                 source = root + os.sep + fil
                 target = re.sub("^" + re.escape(path) + "?/", prefix, source)
                 if os.sep != '/':
                     target = re.sub(re.escape(os.sep), '/', target)
-                key.key = target
-                LOG.info("Uploading %s to %s/%s", source, bucket.name, target)
-                key.set_contents_from_filename(source)
+                size = os.path.getsize(source)
+                objects += 1
+                total_size += size
+                if not multipart_threshold or size < multipart_threshold:
+                    tasks.append(functools.partial(_upload_file, bucket,
+                                                   source, target))
+                    continue
+                LOG.info("Uploading %s to %s/%s in parts of %d bytes",
+                         source, bucket.name, target, chunk_size)
+                upload = bucket.initiate_multipart_upload(target)
+                uploads.append(upload)
+                for part_num, offset in enumerate(
+                        range(0, size, chunk_size), 1):
+                    tasks.append(functools.partial(
+                        _upload_part, upload, source, part_num, offset,
+                        min(chunk_size, size - offset)))
+        _run_concurrently(tasks, concurrency)
+        # Only the uploads which are not complete are cancelled on failure
+        while uploads:
+            uploads[0].complete_upload()
+            uploads.pop(0)
+    except BaseException:
+        for upload in uploads:
+            try:
+                upload.cancel_upload()
+            except BaseException:
+                LOG.exception("Failed to cancel the upload of %s",
+                              upload.key_name)
+        raise
+    _add_timing(bucket.name, 'upload', objects, total_size,
+                time.time() - start)
+
+
+def s3_upload_dir(bucket, path, prefix="", connection_data=None,
+                  concurrency=None, multipart_threshold=None,
+                  chunk_size=None):
+    """Upload the files of a directory tree to a bucket.
+
+    The files are uploaded concurrently over the connection of the bucket,
+    and the ones larger than multipart_threshold in parts of chunk_size
+    bytes. concurrency, multipart_threshold and chunk_size default to the
+    s3_upload_concurrency, s3_multipart_threshold and
+    s3_multipart_chunk_size options of the boto group. A chunk_size
+    smaller than the minimum part size of S3 is raised to it.
+    """
+    if concurrency is None:
+        concurrency = CONF.boto.s3_upload_concurrency
+    if multipart_threshold is None:
+        multipart_threshold = CONF.boto.s3_multipart_threshold
+    if chunk_size is None:
+        chunk_size = CONF.boto.s3_multipart_chunk_size
+    if chunk_size < MIN_PART_SIZE:
+        LOG.warning("S3 multipart chunk size %d is below the %d bytes "
+                    "minimum part size, using the minimum", chunk_size,
+                    MIN_PART_SIZE)
+        chunk_size = MIN_PART_SIZE
+    args = (path, prefix, concurrency, multipart_threshold, chunk_size)
+    if not isinstance(bucket, basestring):
+        return _upload_dir(bucket, *args)
+    with contextlib.closing(boto.connect_s3(**connection_data)) as conn:
+        _upload_dir(conn.lookup(bucket), *args)
+
+
+def s3_delete_keys(bucket):
+    """Delete every key of a bucket.
+
+    The keys are deleted with multi-object delete requests, or one by one
+    when the server doesn't implement those.
+
+    :return: the number of keys which could not be deleted
+    """
+    start = time.time()
+    keys = [key.key for key in bucket.list()]
+    try:
+        result = bucket.delete_keys(keys, quiet=True)
+    except boto.exception.S3ResponseError as exc:
+        LOG.info("Multi-object delete failed on %s (%s), deleting the keys "
+                 "one by one", bucket.name, exc.status)
+        failed = 0
+        for key in keys:
+            try:
+                bucket.delete_key(key)
+            except BaseException:
+                LOG.exception("Failed to delete key %s " % key)
+                failed += 1
+    else:
+        for error in result.errors:
+            LOG.error("Failed to delete key %s: %s", error.key,
+                      error.message)
+        failed = len(result.errors)
+    _add_timing(bucket.name, 'delete', len(keys) - failed, 0,
+                time.time() - start)
+    return failed
@@ -123,3 +123,98 @@ def wait_exception(lfunction):
         time.sleep(CONF.boto.build_interval)
 
 # TODO(afazekas): consider strategy design pattern..
+
+
+class BatchWaiter(object):
+    """Wait for the states of many resources of the same kind.
+
+    Every poll lists the resources once, instead of updating every resource
+    on its own. A resource missing from the listing is in the GONE state.
+
+    :param list_resources: function returning the existing resources, which
+        have an id attribute
+    :param status_attr: name of the attribute holding the resource state
+    """
+
+    GONE = '_GONE'
+
+    def __init__(self, list_resources, status_attr):
+        self.list_resources = list_resources
+        self.status_attr = status_attr
+        # resource id -> (final_set, callback, ready, waiting)
+        self.waits = {}
+        self.states = {}
+        self.failed = []
+
+    def add(self, resource_id, final_set, callback=None, ready=None,
+            waiting=None):
+        """Wait for a resource to reach one of the final states.
+
+        :param callback: called with the final state when it is reached,
+            its failures are logged and recorded in failed
+        :param ready: function telling whether the wait may end, the final
+            state is not accepted until it returns True
+        :param waiting: called with the state on every poll finding the
+            resource in another state than the final ones, its failures are
+            only logged
+        """
+        if not isinstance(final_set, set):
+            final_set = set((final_set,))
+        self.waits[resource_id] = (final_set, callback, ready, waiting)
+
+    def poll(self):
+        """List the resources once and end the waits which are over."""
+        found = dict((resource.id, getattr(resource, self.status_attr))
+                     for resource in self.list_resources())
+        for resource_id, (final_set, callback, ready,
+                          waiting) in self.waits.items():
+            status = found.get(resource_id, self.GONE)
+            if status != self.states.get(resource_id):
+                LOG.info('State of %s: "%s"', resource_id, status)
+                self.states[resource_id] = status
+            if status not in final_set:
+                if waiting is not None:
+                    try:
+                        waiting(status)
+                    except BaseException:
+                        LOG.exception("Failed to handle %s at \"%s\"",
+                                      resource_id, status)
+                continue
+            if ready is not None and not ready():
+                continue
+            del self.waits[resource_id]
+            if callback is not None:
+                try:
+                    callback(status)
+                except BaseException:
+                    LOG.exception("Failed to handle %s at \"%s\"",
+                                  resource_id, status)
+                    self.failed.append(resource_id)
+
+
+def batch_wait(waiters, build_interval=None, build_timeout=None):
+    """Poll BatchWaiters in turn until all their waits are over.
+
+    The waiters share one deadline and sleep once per round.
+    """
+    if build_interval is None:
+        build_interval = CONF.boto.build_interval
+    if build_timeout is None:
+        build_timeout = CONF.boto.build_timeout
+    start_time = time.time()
+    while True:
+        for waiter in waiters:
+            if waiter.waits:
+                waiter.poll()
+        pending = ['%s at "%s"' % (resource_id, waiter.states[resource_id])
+                   for waiter in waiters for resource_id in waiter.waits]
+        if not pending:
+            LOG.info('Batch wait over in %d second', time.time() - start_time)
+            return
+        dtime = time.time() - start_time
+        if dtime > build_timeout:
+            raise testtools.TestCase\
+                .failureException("State change timeout exceeded!"
+                                  "(%ds) While waiting for %s" %
+                                  (dtime, ", ".join(sorted(pending))))
+        time.sleep(build_interval)
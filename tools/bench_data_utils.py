@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+Benchmark the generation of random payloads.
+
+Time how many MB per second random_bytes returns, compared to picking the
+bytes one by one, and how fast a RandomPayload is read and checksummed.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from tempest.common.utils import data_utils
+
+MB = 1024 * 1024
+
+
+def byte_by_byte(size):
+    return ''.join([chr(random.randint(0, 255)) for i in range(size)])
+
+
+def throughput(func, size):
+    start = time.time()
+    func()
+    return size / MB / (time.time() - start)
+
+
+def read_all(payload, chunk_size):
+    payload.seek(0)
+    while payload.read(chunk_size):
+        pass
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-s', '--size', type=int, default=1024,
+                        help="Size of the payloads in MB")
+    parser.add_argument('-b', '--bytes-size', type=int, default=16,
+                        help="Size of the random_bytes strings in MB")
+    parser.add_argument('--chunk-size', type=int, default=65536,
+                        help="Size of the reads of the payloads")
+    opts = parser.parse_args(argv)
+
+    small = opts.bytes_size * MB
+    print("byte by byte:         %8.1f MB/s" %
+          throughput(lambda: byte_by_byte(small // 16), small // 16))
+    print("random_bytes:         %8.1f MB/s" %
+          throughput(lambda: data_utils.random_bytes(small), small))
+
+    size = opts.size * MB
+    for compressible in (False, True):
+        payload = data_utils.RandomPayload(size, seed=1,
+                                           compressible=compressible)
+        kind = 'compressible' if compressible else 'incompressible'
+        print("%-14s read:  %8.1f MB/s" %
+              (kind, throughput(lambda: read_all(payload, opts.chunk_size),
+                                size)))
+        print("%-14s md5:   %8.1f MB/s" %
+              (kind, throughput(lambda: payload.checksum, size)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark the generation of the negative test scenarios.
+
+For every json schema in etc/schemas, time how long generating its scenarios
+and its valid template takes without cache and once it is cached.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from tempest import config
+from tempest import test
+
+BASEDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCHEMA_DIR = os.path.join(BASEDIR, 'etc', 'schemas')
+
+
+def find_schemas():
+    schemas = []
+    for dirpath, dirnames, filenames in os.walk(SCHEMA_DIR):
+        for filename in sorted(filenames):
+            if filename.endswith('.json'):
+                path = os.path.join(dirpath, filename)
+                schemas.append(os.path.relpath(path, SCHEMA_DIR))
+    return sorted(schemas)
+
+
+def timed(func, repeat):
+    start = time.time()
+    for i in range(repeat):
+        result = func()
+    return (time.time() - start) / repeat, result
+
+
+def bench_schema(schema_file, repeat):
+    description = test.NegativeAutoTest.load_schema(schema_file)
+    json_schema = description.get('json-schema')
+
+    def cold_scenario():
+        test.NegativeAutoTest._scenarios.clear()
+        return test.NegativeAutoTest.generate_scenario(description)
+
+    def cold_valid():
+        test.NegativeAutoTest._valid_templates.clear()
+        return test.NegativeAutoTest.valid_template(json_schema)
+
+    cold, scenarios = timed(cold_scenario, repeat)
+    warm, _ = timed(
+        lambda: test.NegativeAutoTest.generate_scenario(description), repeat)
+    if json_schema:
+        cold_tpl, _ = timed(cold_valid, repeat)
+        warm_tpl, _ = timed(
+            lambda: test.NegativeAutoTest.valid_template(json_schema), repeat)
+    else:
+        cold_tpl = warm_tpl = 0.0
+    return len(scenarios), cold, warm, cold_tpl, warm_tpl
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=100,
+                        help="Number of times every operation is timed")
+    parser.add_argument('-c', '--config-file',
+                        default=os.path.join(BASEDIR, 'etc',
+                                             'tempest.conf.sample'),
+                        help="Tempest config file to use")
+    opts = parser.parse_args(argv)
+    config.CONF.set_config_path(opts.config_file)
+
+    print("%-40s %9s %12s %12s %12s %12s" %
+          ("schema", "scenarios", "generate", "cached", "valid",
+           "cached"))
+    totals = [0, 0.0, 0.0, 0.0, 0.0]
+    for schema_file in find_schemas():
+        result = bench_schema(schema_file, opts.repeat)
+        totals = [t + r for t, r in zip(totals, result)]
+        print("%-40s %9d %10.3fms %10.3fms %10.3fms %10.3fms" %
+              ((schema_file, result[0]) +
+               tuple(r * 1000 for r in result[1:])))
+    print("%-40s %9d %10.3fms %10.3fms %10.3fms %10.3fms" %
+          (("total", totals[0]) + tuple(t * 1000 for t in totals[1:])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark the dynamic methods of the network client.
+
+Time the calls of the list_/show_/create_/update_/delete_ methods the network
+client builds on the fly, against a rest client answering without any i/o,
+first on a new client for every call and then on the same client.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from tempest import config
+from tempest.services.network import network_client_base
+
+BASEDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class FakeRestClient(object):
+
+    def get(self, uri, headers=None):
+        return {}, '{"resources": []}'
+
+    post = put = lambda self, uri, body, headers=None: ({}, '{}')
+    delete = lambda self, uri, headers=None: ({}, '')
+
+
+class FakeNetworkClient(network_client_base.NetworkClientBase):
+
+    def get_rest_client(self, auth_provider):
+        return FakeRestClient()
+
+    def serialize(self, data):
+        return json.dumps(data)
+
+    def deserialize_single(self, body):
+        return json.loads(body)
+
+    def deserialize_list(self, body):
+        return json.loads(body).values()[0]
+
+
+CALLS = [
+    lambda client: client.list_networks(),
+    lambda client: client.list_pools(name='foo'),
+    lambda client: client.show_health_monitor('id'),
+    lambda client: client.create_ikepolicy(name='foo'),
+    lambda client: client.update_firewall_policy('id', name='foo'),
+    lambda client: client.delete_metering_label('id'),
+]
+
+
+def timed(func, repeat):
+    start = time.time()
+    for i in range(repeat):
+        func()
+    return (time.time() - start) / repeat
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=10000,
+                        help="Number of times every call is timed")
+    parser.add_argument('-c', '--config-file',
+                        default=os.path.join(BASEDIR, 'etc',
+                                             'tempest.conf.sample'),
+                        help="Tempest config file to use")
+    opts = parser.parse_args(argv)
+    config.CONF.set_config_path(opts.config_file)
+
+    client = FakeNetworkClient(None)
+
+    def new_client_calls():
+        new_client = FakeNetworkClient(None)
+        for call in CALLS:
+            call(new_client)
+
+    def same_client_calls():
+        for call in CALLS:
+            call(client)
+
+    print("new client:  %.2fus per call" %
+          (timed(new_client_calls, opts.repeat) * 1e6 / len(CALLS)))
+    print("same client: %.2fus per call" %
+          (timed(same_client_calls, opts.repeat) * 1e6 / len(CALLS)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+Benchmark the parsing of the CLI clients output.
+
+Generate ascii tables like the ones of 'nova list --all-tenants', a single
+long one and several ones in a row, and time how long output_parser takes
+to parse them.
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from tempest.cli import output_parser
+
+HEADERS = ['ID', 'Name', 'Status', 'Task State', 'Power State', 'Networks']
+
+
+def make_table(rows, label=None):
+    values = [['%08x-1f2e-4d3c-8b7a-%012x' % (i, i), 'server-%d' % i,
+               'ACTIVE', '-', 'Running', 'private=10.0.%d.%d' %
+               (i // 256 % 256, i % 256)]
+              for i in range(rows)]
+    widths = [max(len(cell) for cell in column)
+              for column in zip(HEADERS, *values)]
+    delimiter = '+%s+' % '+'.join('-' * (width + 2) for width in widths)
+
+    def line(cells):
+        return '| %s |' % ' | '.join(cell.ljust(width)
+                                     for cell, width in zip(cells, widths))
+
+    lines = [label] if label else []
+    lines.extend([delimiter, line(HEADERS), delimiter])
+    lines.extend(line(row) for row in values)
+    lines.append(delimiter)
+    return '\n'.join(lines) + '\n'
+
+
+def timed(func, repeat):
+    """Return the best duration of repeated calls, the collector disabled."""
+    durations = []
+    func()
+    gc.disable()
+    try:
+        for i in range(repeat):
+            start = time.time()
+            func()
+            durations.append(time.time() - start)
+    finally:
+        gc.enable()
+    return min(durations)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-r', '--rows', type=int, default=50000,
+                        help="Number of rows of the generated tables")
+    parser.add_argument('-t', '--tables', type=int, default=10,
+                        help="Number of tables the multi-table output has")
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help="Number of times every parsing is timed, the "
+                             "best time is reported")
+    opts = parser.parse_args(argv)
+
+    single = make_table(opts.rows)
+    multiple = ''.join(make_table(opts.rows // opts.tables, 'table %d' % i)
+                       for i in range(opts.tables))
+    cases = [
+        ('table', lambda: output_parser.table(single)),
+        ('listing', lambda: output_parser.listing(single)),
+        ('tables', lambda: output_parser.tables(multiple)),
+    ]
+    for name, func in cases:
+        duration = timed(func, opts.repeat)
+        print("%-8s %d rows: %8.1fms, %.2fus per row" %
+              (name, opts.rows, duration * 1000, duration * 1e6 / opts.rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
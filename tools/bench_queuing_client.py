@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+
+# Copyright 2014 Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark a message pipeline built on the queuing client.
+
+Producers post batches of messages to a queue while consumers claim them and
+delete them, every thread with its own QueuingClientJSON. The end to end
+latency of a message runs from the start of its post to the end of its
+delete. By default the pipeline runs against a stand-in server implementing
+the Marconi v1 calls the client makes, started in process; --url points it
+to a Marconi endpoint which doesn't need authentication instead.
+"""
+
+import argparse
+import BaseHTTPServer
+import collections
+import json
+import os
+import SocketServer
+import sys
+import threading
+import time
+import urlparse
+import uuid
+
+from tempest import config
+from tempest.services.queuing.json import queuing_client
+
+BASEDIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class FakeQueue(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # message id -> [created_at, ttl, body, claim_id, claimed_until]
+        self.messages = collections.OrderedDict()
+
+    def post(self, messages):
+        now = time.time()
+        ids = []
+        with self.lock:
+            for message in messages:
+                message_id = uuid.uuid4().hex
+                self.messages[message_id] = [now, message['ttl'],
+                                             message['body'], None, 0]
+                ids.append(message_id)
+        return ids
+
+    def _available(self, now):
+        for message_id, message in self.messages.iteritems():
+            created_at, ttl, body, claim_id, claimed_until = message
+            if created_at + ttl > now and claimed_until <= now:
+                yield message_id, message
+
+    def list(self, limit):
+        now = time.time()
+        with self.lock:
+            available = []
+            for message_id, message in self._available(now):
+                available.append((message_id, message))
+                if len(available) == limit:
+                    break
+        return available
+
+    def claim(self, limit, ttl):
+        now = time.time()
+        claim_id = uuid.uuid4().hex
+        with self.lock:
+            claimed = []
+            for message_id, message in self._available(now):
+                claimed.append((message_id, message))
+                if len(claimed) == limit:
+                    break
+            for message_id, message in claimed:
+                message[3] = claim_id
+                message[4] = now + ttl
+        return claim_id, claimed
+
+    def delete(self, message_ids, claim_id=None):
+        now = time.time()
+        with self.lock:
+            for message_id in message_ids:
+                message = self.messages.get(message_id)
+                if message is None:
+                    continue
+                if (claim_id is not None and message[4] > now and
+                        message[3] != claim_id):
+                    return False
+                del self.messages[message_id]
+        return True
+
+
+class FakeMarconiHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Handle the Marconi v1 calls of a message pipeline."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        data = json.dumps(body) if body is not None else ''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self):
+        url = urlparse.urlparse(self.path)
+        params = dict(urlparse.parse_qsl(url.query))
+        parts = url.path.strip('/').split('/')
+        if parts[:2] != ['v1', 'queues'] or len(parts) < 3:
+            return None, None, parts, params
+        queues = self.server.queues
+        return parts[2], queues.get(parts[2]), parts[3:], params
+
+    def _read_body(self):
+        length = int(self.headers.getheader('content-length', 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _message(self, name, message_id, message, claim_id=None):
+        href = '/v1/queues/%s/messages/%s' % (name, message_id)
+        if claim_id:
+            href += '?claim_id=%s' % claim_id
+        return {'href': href, 'ttl': message[1],
+                'age': int(time.time() - message[0]), 'body': message[2]}
+
+    def do_PUT(self):
+        name, queue, parts, params = self._route()
+        if name is None or parts:
+            return self._reply(404)
+        if queue is not None:
+            return self._reply(204)
+        self.server.queues[name] = FakeQueue()
+        self._reply(201, headers={'Location': '/v1/queues/%s' % name})
+
+    def do_POST(self):
+        name, queue, parts, params = self._route()
+        body = self._read_body()
+        if queue is None:
+            return self._reply(404)
+        limit = int(params.get('limit', 10))
+        if parts == ['messages']:
+            if not self.headers.getheader('client-id'):
+                return self._reply(400, {'title': 'Missing Client-ID'})
+            if len(body) > self.server.max_messages:
+                return self._reply(400, {'title': 'Too many messages'})
+            resources = ['/v1/queues/%s/messages/%s' % (name, message_id)
+                         for message_id in queue.post(body)]
+            return self._reply(201, {'resources': resources,
+                                     'partial': False})
+        if parts == ['claims']:
+            limit = min(limit, self.server.max_messages)
+            claim_id, claimed = queue.claim(limit, body['ttl'])
+            if not claimed:
+                return self._reply(204)
+            messages = [self._message(name, message_id, message, claim_id)
+                        for message_id, message in claimed]
+            location = '/v1/queues/%s/claims/%s' % (name, claim_id)
+            return self._reply(201, messages, {'Location': location})
+        self._reply(404)
+
+    def do_GET(self):
+        name, queue, parts, params = self._route()
+        if queue is None or parts != ['messages']:
+            return self._reply(404)
+        limit = int(params.get('limit', 10))
+        messages = [self._message(name, message_id, message)
+                    for message_id, message in queue.list(limit)]
+        if not messages:
+            return self._reply(204)
+        href = '/v1/queues/%s/messages?limit=%d' % (name, limit)
+        self._reply(200, {'links': [{'rel': 'next', 'href': href}],
+                          'messages': messages})
+
+    def do_DELETE(self):
+        name, queue, parts, params = self._route()
+        if queue is None:
+            return self._reply(404 if name is None else 204)
+        if not parts:
+            del self.server.queues[name]
+            return self._reply(204)
+        if parts == ['messages'] and 'ids' in params:
+            queue.delete(params['ids'].split(','))
+            return self._reply(204)
+        if len(parts) == 2 and parts[0] == 'messages':
+            if not queue.delete([parts[1]], params.get('claim_id')):
+                return self._reply(403, {'title': 'Message is claimed'})
+            return self._reply(204)
+        self._reply(404)
+
+
+class FakeMarconiServer(SocketServer.ThreadingMixIn,
+                        BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address, max_messages):
+        BaseHTTPServer.HTTPServer.__init__(self, address, FakeMarconiHandler)
+        self.queues = {}
+        self.max_messages = max_messages
+
+
+class NoAuthProvider(object):
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def auth_request(self, method, url, headers=None, body=None, filters=None):
+        return '%s/%s' % (self.base_url, url.lstrip('/')), headers, body
+
+
+class Pipeline(object):
+
+    def __init__(self, base_url, queue_name, messages, batch):
+        self.base_url = base_url
+        self.queue_name = queue_name
+        self.messages = messages
+        self.batch = batch
+        self.lock = threading.Lock()
+        self.to_post = messages
+        self.deleted = 0
+        self.latencies = []
+        self.requests = collections.defaultdict(list)
+        self.errors = []
+        self.done = threading.Event()
+
+    def client(self):
+        return queuing_client.QueuingClientJSON(
+            NoAuthProvider(self.base_url))
+
+    def _timed(self, op, func, *args, **kwargs):
+        start = time.time()
+        result = func(*args, **kwargs)
+        self.requests[op].append(time.time() - start)
+        return result
+
+    def _take(self):
+        with self.lock:
+            count = min(self.batch, self.to_post)
+            self.to_post -= count
+        return count
+
+    def produce(self):
+        client = self.client()
+        while not self.done.is_set():
+            count = self._take()
+            if not count:
+                return
+            sent_at = time.time()
+            body = [{'ttl': 300, 'body': {'sent_at': sent_at, 'seq': i}}
+                    for i in range(count)]
+            self._timed('post_messages', client.post_messages,
+                        self.queue_name, body)
+
+    def consume(self, bulk_delete, poll_interval):
+        client = self.client()
+        while not self.done.is_set():
+            resp, claimed = self._timed(
+                'post_claims', client.post_claims, self.queue_name,
+                {'ttl': 60, 'grace': 60}, url_params={'limit': self.batch})
+            if resp['status'] == '204':
+                time.sleep(poll_interval)
+                continue
+            if bulk_delete:
+                ids = [urlparse.urlparse(message['href']).path.split('/')[-1]
+                       for message in claimed]
+                uri = '/v1/queues/%s/messages?ids=%s' % (self.queue_name,
+                                                         ','.join(ids))
+                self._timed('delete_messages', client.delete_messages, uri)
+            else:
+                for message in claimed:
+                    self._timed('delete_messages', client.delete_messages,
+                                message['href'])
+            deleted_at = time.time()
+            self.latencies.extend(deleted_at - message['body']['sent_at']
+                                  for message in claimed)
+            with self.lock:
+                self.deleted += len(claimed)
+                if self.deleted >= self.messages:
+                    self.done.set()
+
+    def _run_thread(self, func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self.errors.append(e)
+            self.done.set()
+
+    def run(self, producers, consumers, bulk_delete, poll_interval):
+        client = self.client()
+        client.create_queue(self.queue_name)
+        threads = [threading.Thread(target=self._run_thread,
+                                    args=(self.produce,))
+                   for i in range(producers)]
+        threads.extend(threading.Thread(target=self._run_thread,
+                                        args=(self.consume, bulk_delete,
+                                              poll_interval))
+                       for i in range(consumers))
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+        resp, body = client.list_messages(self.queue_name)
+        left = 0 if resp['status'] == '204' else len(body['messages'])
+        client.delete_queue(self.queue_name)
+        return elapsed, left
+
+
+def percentile(values, percent):
+    index = int(round(percent / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--messages', type=int, default=5000,
+                        help="Number of messages going through the queue")
+    parser.add_argument('-p', '--producers', type=int, default=4,
+                        help="Number of concurrent producers")
+    parser.add_argument('-m', '--consumers', type=int, default=4,
+                        help="Number of concurrent consumers")
+    parser.add_argument('-b', '--batch', type=int, default=10,
+                        help="Number of messages per post and per claim")
+    parser.add_argument('--bulk-delete', action='store_true',
+                        help="Delete the messages of a claim in one request")
+    parser.add_argument('--poll-interval', type=float, default=0.01,
+                        help="Seconds a consumer waits after an empty claim")
+    parser.add_argument('--url',
+                        help="Marconi endpoint to use instead of a stand-in")
+    parser.add_argument('-c', '--config-file',
+                        default=os.path.join(BASEDIR, 'etc',
+                                             'tempest.conf.sample'),
+                        help="Tempest config file to use")
+    opts = parser.parse_args(argv)
+    config.CONF.set_config_path(opts.config_file)
+
+    server = None
+    url = opts.url
+    if url is None:
+        server = FakeMarconiServer(
+            ('127.0.0.1', 0), config.CONF.queuing.max_messages_per_claim)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        url = 'http://127.0.0.1:%d' % server.server_address[1]
+
+    pipeline = Pipeline(url, 'bench-%s' % uuid.uuid4().hex[:8],
+                        opts.messages, opts.batch)
+    try:
+        elapsed, left = pipeline.run(opts.producers, opts.consumers,
+                                     opts.bulk_delete, opts.poll_interval)
+    finally:
+        if server is not None:
+            server.shutdown()
+    if pipeline.errors:
+        print("pipeline failed: %r" % pipeline.errors[0])
+        return 1
+
+    latencies = sorted(pipeline.latencies)
+    print("%d messages in %.2fs: %.1f msgs/s, %d left in the queue" %
+          (len(latencies), elapsed, len(latencies) / elapsed, left))
+    print("latency      p50 %7.1fms  p95 %7.1fms  p99 %7.1fms  max %7.1fms" %
+          tuple(percentile(latencies, p) * 1000 for p in (50, 95, 99, 100)))
+    for op in sorted(pipeline.requests):
+        times = sorted(pipeline.requests[op])
+        print("%-16s %6d requests, mean %6.2fms, p95 %6.2fms" %
+              (op, len(times), sum(times) / len(times) * 1000,
+               percentile(times, 95) * 1000))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -16,12 +16,13 @@
 #    under the License.
 
 import argparse
-import gzip
+import multiprocessing
 import os
 import re
-import StringIO
 import sys
+import time
 import urllib2
+import zlib
 
 import yaml
 
@@ -56,47 +57,119 @@ allowed_dirty = set([
     'q-vpn',
     's-proxy'])
 
+ERROR_REGEXP = re.compile(r"^.* (ERROR|CRITICAL|TRACE) .*\[.*\-.*\]")
+GZIP_MAGIC = '\x1f\x8b'
+# Size of the chunks read from a log file or url while streaming it
+CHUNK_SIZE = 64 * 1024
 
-def process_files(file_specs, url_specs, whitelists):
-    regexp = re.compile(r"^.* (ERROR|CRITICAL|TRACE) .*\[.*\-.*\]")
+
+def compile_whitelist(whitelist):
+    """Combine all the whitelist entries of a log into a single regexp."""
+    if not whitelist:
+        return None
+    patterns = ["(?:.*%s.*%s.*)" % (w['module'].replace('.', '\\.'),
+                                    w['message'])
+                for w in whitelist]
+    return re.compile("|".join(patterns))
+
+
+def _iter_chunks(stream):
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _gunzip_chunks(chunks):
+    """Decompress the chunks on the fly if they are gzipped."""
+    chunks = iter(chunks)
+    first = next(chunks, '')
+    if first[:2] != GZIP_MAGIC:
+        yield first
+        for chunk in chunks:
+            yield chunk
+        return
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    yield decompressor.decompress(first)
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+    yield decompressor.flush()
+
+
+def _iter_lines(chunks):
+    partial = ''
+    for chunk in chunks:
+        lines = (partial + chunk).split('\n')
+        partial = lines.pop()
+        for line in lines:
+            yield line
+    if partial:
+        yield partial
+
+
+def open_log(location):
+    """Return an iterator over the lines of a local file or of a url."""
+    if re.match(r'^\w+://', location):
+        req = urllib2.Request(location)
+        req.add_header('Accept-Encoding', 'gzip')
+        stream = urllib2.urlopen(req)
+    else:
+        stream = open(location, 'rb')
+    try:
+        for line in _iter_lines(_gunzip_chunks(_iter_chunks(stream))):
+            yield line
+    finally:
+        stream.close()
+
+
+def scan_log(spec):
+    """Scan a single log, suitable to be run in a worker process."""
+    name, location, matcher = spec
+    start = time.time()
+    output = []
+    had_errors = scan_content(name, open_log(location), ERROR_REGEXP,
+                              matcher, output)
+    return name, had_errors, output, time.time() - start
+
+
+def process_files(file_specs, url_specs, whitelists, jobs=None):
+    matchers = dict((name, compile_whitelist(whitelist))
+                    for (name, whitelist) in whitelists.iteritems())
+    specs = [(name, location, matchers.get(name))
+             for (name, location) in list(file_specs) + list(url_specs)]
     logs_with_errors = []
-    for (name, filename) in file_specs:
-        whitelist = whitelists.get(name, [])
-        with open(filename) as content:
-            if scan_content(name, content, regexp, whitelist):
+    start = time.time()
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for (name, had_errors, output, elapsed) in pool.imap(scan_log,
+                                                             specs):
+            for line in output:
+                print(line)
+            print("Scanned %s in %.2fs" % (name, elapsed))
+            if had_errors:
                 logs_with_errors.append(name)
-    for (name, url) in url_specs:
-        whitelist = whitelists.get(name, [])
-        req = urllib2.Request(url)
-        req.add_header('Accept-Encoding', 'gzip')
-        page = urllib2.urlopen(req)
-        buf = StringIO.StringIO(page.read())
-        f = gzip.GzipFile(fileobj=buf)
-        if scan_content(name, f.read().splitlines(), regexp, whitelist):
-            logs_with_errors.append(name)
+    finally:
+        pool.close()
+        pool.join()
+    print("Scanned %d logs in %.2fs" % (len(specs), time.time() - start))
     return logs_with_errors
 
 
-def scan_content(name, content, regexp, whitelist):
+def scan_content(name, content, regexp, whitelist, output):
     had_errors = False
     print_log_name = True
     for line in content:
         if not line.startswith("Stderr:") and regexp.match(line):
-            whitelisted = False
-            for w in whitelist:
-                pat = ".*%s.*%s.*" % (w['module'].replace('.', '\\.'),
-                                      w['message'])
-                if re.match(pat, line):
-                    whitelisted = True
-                    break
+            whitelisted = bool(whitelist and whitelist.match(line))
             if not whitelisted or dump_all_errors:
                 if print_log_name:
-                    print("\nLog File Has Errors: %s" % name)
+                    output.append("\nLog File Has Errors: %s" % name)
                     print_log_name = False
                 if not whitelisted:
                     had_errors = True
-                    print("*** Not Whitelisted ***"),
-                print(line.rstrip())
+                    line = "*** Not Whitelisted *** " + line
+                output.append(line.rstrip())
     return had_errors
 
 
@@ -116,7 +189,7 @@ def main(opts):
         os.path.abspath(os.path.dirname(os.path.dirname(__file__))),
         "etc", "whitelist.yaml")
 
-    file_matcher = re.compile(r".*screen-([\w-]+)\.log")
+    file_matcher = re.compile(r".*screen-([\w-]+)\.(?:log|txt)")
     files = []
     if opts.directory:
         d = opts.directory
@@ -149,7 +222,7 @@ def main(opts):
                     assert 'message' in w, 'no message in %s' % name
             whitelists = loaded
     logs_with_errors = process_files(files_to_process, urls_to_process,
-                                     whitelists)
+                                     whitelists, opts.jobs)
     if logs_with_errors:
         print("Logs have errors")
     if is_grenade:
@@ -171,7 +244,8 @@ Log files will be searched for ERROR or CRITICAL messages. If any
 error messages do not match any of the whitelist entries contained in
 etc/whitelist.yaml, those messages will be printed to the console and
 failure will be returned. A file directory containing logs or a url to the
-log files of an OpenStack gate job can be provided.
+log files of an OpenStack gate job can be provided. Logs may be plain text
+or gzipped, and are scanned in parallel.
 
 The whitelist yaml looks like:
 
@@ -189,6 +263,9 @@ parser.add_argument('-d', '--directory',
                     help="Directory containing log files")
 parser.add_argument('-u', '--url',
                     help="url containing logs from an OpenStack gate job")
+parser.add_argument('-j', '--jobs', type=int,
+                    help="Number of logs to scan in parallel, defaults to "
+                         "the number of CPUs")
 
 if __name__ == "__main__":
     try: